@@ -0,0 +1,104 @@
+'''Connection Profile Benchmark
+
+Measures the time spent by ``Manager.setup`` connecting to a testbed and the
+amount of session log written to disk, for each genie telemetry connection
+profile. Devices are simulated using the unicon mock device.
+
+Usage
+-----
+    python benchmarks/bench_connect.py [-devices 5] [-os iosxe] [-repeat 3]
+'''
+
+import os
+import sys
+import glob
+import time
+import logging
+import argparse
+import tempfile
+import contextlib
+
+from pyats.topology import loader
+
+from genie.telemetry import Manager
+from genie.telemetry.config.connections import CONNECTION_PROFILES
+
+STATES = {'iosxe': 'general_enable',
+          'nxos': 'exec',
+          'iosxr': 'enable'}
+
+
+def build_testbed(devices, os_):
+    testbed = {'testbed': {'name': 'benchmark'}, 'devices': {}}
+    for i in range(devices):
+        name = 'bench{}'.format(i)
+        command = 'mock_device_cli --os {} --state {} --hostname {}'.format(
+                                                    os_, STATES[os_], name)
+        testbed['devices'][name] = {
+            'os': os_,
+            'type': 'router',
+            'credentials': {'default': {'username': 'cisco',
+                                        'password': 'cisco'}},
+            'connections': {'cli': {'command': command}},
+            'custom': {'abstraction': {'order': ['os']}},
+        }
+    return loader.load(testbed)
+
+
+def session_logs(testbed):
+    files = []
+    for name in testbed.devices:
+        pattern = os.path.join(tempfile.gettempdir(), '{}-*.log'.format(name))
+        files.extend(glob.glob(pattern))
+    return set(files)
+
+
+def run(profile, devices, os_):
+    testbed = build_testbed(devices, os_)
+    configuration = {'connections': {'defaults': {'profile': profile}}}
+    manager = Manager(testbed, configuration=configuration)
+
+    before = session_logs(testbed)
+    with open(os.devnull, 'w') as devnull, \
+         contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        manager.setup()
+        elapsed = time.perf_counter() - start
+        manager.takedown()
+
+    written = session_logs(testbed) - before
+    size = sum(os.path.getsize(f) for f in written)
+    for f in written:
+        os.remove(f)
+
+    return elapsed, len(written), size
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__,
+                             formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('-devices', type=int, default=5)
+    parser.add_argument('-os', dest='os_', default='iosxe',
+                        choices=sorted(STATES))
+    parser.add_argument('-repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    # keep the benchmark output readable
+    logging.getLogger('genie.telemetry').setLevel(logging.ERROR)
+
+    print('{:<10} {:>14} {:>14} {:>12} {:>14}'.format('profile', 'setup (s)',
+                                                      'per device (s)',
+                                                      'log files',
+                                                      'log bytes'))
+    for profile in CONNECTION_PROFILES:
+        samples = [run(profile, args.devices, args.os_)
+                   for _ in range(args.repeat)]
+        elapsed = min(s[0] for s in samples)
+        files = max(s[1] for s in samples)
+        size = max(s[2] for s in samples)
+        print('{:<10} {:>14.3f} {:>14.3f} {:>12} {:>14}'.format(
+                    profile, elapsed, elapsed / args.devices, files, size))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,106 @@
+'''Listing Parser Benchmark
+
+Measures the lines per second parsed by the core dump and crashinfo listing
+parser, against the recorded listings of the test corpus scaled up to file
+systems of the given number of files. The former per-call parsing (patterns
+compiled on each call, searched with pattern strings) is measured as baseline.
+
+Usage
+-----
+    python benchmarks/bench_listing.py [-files 5000] [-repeat 5]
+'''
+
+import os
+import re
+import sys
+import timeit
+import argparse
+
+from genie.libs.telemetry.plugins.libs import listing
+
+CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir,
+                      'src', 'genie', 'telemetry', 'tests', 'scripts',
+                      'listings')
+
+
+def baseline_iosxe(output):
+    core_pattern = re.compile(r'(?P<number>\d+) '
+        r'+(?P<permissions>[rw\-]+) +(?P<filesize>\d+) '
+        r'+(?P<month>\w+) +(?P<date>\d+) +(?P<year>\d+) '
+        r'+(?P<time>[\w\:]+) +(?P<timezone>(\S+)) +(?P<core>((.*\.core\.gz)|(.*\.core\.flat\.gz)|(.*\.txt)))$', re.IGNORECASE)
+    crashinfo_pattern = re.compile(r'(?P<number>\d+) '
+        r'+(?P<permissions>[rw\-]+) +(?P<filesize>\d+) '
+        r'+(?P<month>\w+) +(?P<date>\d+) +(?P<year>\d+) '
+        r'+(?P<time>[\w\:]+) +(?P<timezone>(\S+)) '
+        r'+(?P<core>(crashinfo.*))$', re.IGNORECASE)
+
+    found = []
+    for line in output.splitlines():
+        line = line.strip()
+        m = core_pattern.match(line) or crashinfo_pattern.match(line)
+        if m:
+            found.append(m.groupdict()['core'])
+    return found
+
+
+def baseline_iosxr(output):
+    pattern1 = r'(?P<number>(\d+)) +(?P<permissions>(\S+)) +(?P<other_number>(\d+)) +(?P<filesize>(\d+)) +(?P<month>(\S+)) +(?P<date>(\d+)) +(?P<time>(\S+)) +(?P<core>(.*core\.gz))'
+    pattern2 = r'(?P<number>(\d+)) +(?P<permissions>(\S+)) +(?P<filesize>(\d+)) +(?P<day>(\S+)) +(?P<month>(\S+)) +(?P<date>(\d+)) +(?P<time>(\S+)) +(?P<year>(\d+)) +(?P<core>(.*core\.gz))'
+
+    found = []
+    for line in output.splitlines():
+        match = re.search(pattern1, line, re.IGNORECASE) or \
+                re.search(pattern2, line, re.IGNORECASE)
+        if match:
+            found.append(match.groupdict()['core'])
+    return found
+
+
+def load(name, files):
+    with open(os.path.join(CORPUS, name)) as f:
+        lines = f.read().splitlines()
+
+    # scale the listing up, keeping its header and footer
+    index = [i for i, line in enumerate(lines) if re.match(r'^\s*\d', line)]
+    first, last = index[0], index[-1] + 1
+    body = lines[first:last]
+    body = (body * (files // len(body) + 1))[:files]
+    return '\n'.join(lines[:first] + body + lines[last:])
+
+
+def measure(func, output, repeat):
+    lines = output.count('\n') + 1
+    elapsed = min(timeit.repeat(lambda: func(output), number=1,
+                                repeat=repeat))
+    return lines / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__,
+                             formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('-files', type=int, default=5000)
+    parser.add_argument('-repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        ('iosxe', 'iosxe_dir.txt', baseline_iosxe,
+         lambda o: listing.parse_cores(o, 'bootflash:/core', 'iosxe')),
+        ('iosxr', 'iosxr_dir.txt', baseline_iosxr,
+         lambda o: listing.parse_cores(o, 'disk0:', 'iosxr')),
+        ('nxos', 'nxos_show_cores.txt', None, listing.parse_show_cores),
+    ]
+
+    print('{:<8} {:>10} {:>18} {:>18}'.format('os', 'lines',
+                                              'baseline (lines/s)',
+                                              'parser (lines/s)'))
+    for os_, name, baseline, parse in cases:
+        output = load(name, args.files)
+        before = measure(baseline, output, args.repeat) if baseline else None
+        after = measure(parse, output, args.repeat)
+        print('{:<8} {:>10} {:>18} {:>18.0f}'.format(
+                    os_, output.count('\n') + 1,
+                    '{:.0f}'.format(before) if before else '-', after))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -112,6 +112,9 @@ setup(
     # console entry point
     entry_points = { 
         'console_scripts': ['genietelemetry = genie.telemetry:main'],
+        'pyats.cli.commands': [
+            'telemetry = genie.telemetry.commands:TelemetryCommand',
+        ],
     },
 
     # package dependencies
@@ -18,6 +18,7 @@ from pyats.datastructures import classproperty
 # GenieTelemetry
 from genie.telemetry.plugin import BasePlugin
 from genie.telemetry.status import OK, WARNING, ERRORED, PARTIAL, CRITICAL
+from genie.libs.telemetry.plugins.libs.batch import execute_batch
 
 # module logger
 logger = logging.getLogger(__name__)
@@ -70,11 +71,13 @@ class Plugin(BasePlugin):
         message = ''
 
         # Execute command to check for tracebacks - timeout set to 5 mins
-        try:
-            output = device.execute(self.show_cmd,
-                                    timeout=self.args.alignmentcheck_timeout)
-        except Exception as e:
-            status += CRITICAL(str(e))
+        outputs = execute_batch(device, [self.show_cmd],
+                                timeout=self.args.alignmentcheck_timeout)
+        output = outputs[self.show_cmd]
+        # command failures (exception or rejected command) are critical
+        error = outputs.errors.get(self.show_cmd)
+        if error:
+            status += CRITICAL(str(error))
             return status
             
         if not output:
@@ -3,6 +3,7 @@ GenieTelemetry CpuUtilizationCheck Plugin
 '''
 # Python
 import copy
+import time
 import logging
 
 # argparse
@@ -79,6 +80,67 @@ class Plugin(BasePlugin):
 
     def execution(self, device, **kwargs):
 
+        if not hasattr(self, 'PARSER_MODULE'):
+            return WARNING('Does not have CPU related parsers to check')
+
+        # re-check through follow-up executions when the manager schedules
+        # them, rather than waiting within this execution
+        if not self.follow_ups:
+            return self._blocking_execution(device)
+
+        # first sample of a check, or follow-up sample of an ongoing check
+        context = self.context or \
+                  dict(deadline = time.time() + int(self.args.cpucheck_timeout))
+
+        try:
+            ok, message = self._sample(device)
+        except Exception as e:
+            return ERRORED('No output from show processes cpu\n{}'.format(e))
+
+        if ok:
+            logger.info(banner(message))
+            return OK(message)
+
+        # CPU still above threshold after cpucheck_timeout
+        interval = int(self.args.cpucheck_interval)
+        if time.time() + interval > context['deadline']:
+            logger.error(banner(message))
+            return CRITICAL(message)
+
+        # provisional status, final verdict from the next samples
+        message += "\nRe-checking in {i} seconds".format(i=interval)
+        logger.warning(banner(message))
+        self.follow_up(interval, context)
+        return WARNING(message)
+
+    def _sample(self, device):
+        '''_sample
+
+        samples the five minutes CPU usage, returns whether it's below the
+        threshold along with the message to report.
+        '''
+        # Execute command to get five minutes usage percentage
+        cpu_dict = self.PARSER_MODULE(device).parse(sort_time='5min',
+                                                    key_word='CPU')
+        self.emit('five_min_cpu', cpu_dict['five_min_cpu'])
+
+        # Check 5 minutes percentage smaller than cpucheck_fivemin_pcnt
+        if int(cpu_dict['five_min_cpu']) >= int(self.args.cpucheck_fivemin_pcnt):
+            message = "****** Device {d} *****\n".format(d=device.name)
+            message += "Excessive CPU utilization detected for 5 min interval\n"
+            message += "Allowed: {e}%\n".format(e=self.args.cpucheck_fivemin_pcnt)
+            message += "Measured: FiveMin: {r}%".format(r=cpu_dict['five_min_cpu'])
+            return False, message
+
+        message = "***** CPU usage is Expected ***** \n"
+        message += "Allowed threashold: {e} \n"\
+                        .format(e=self.args.cpucheck_fivemin_pcnt)
+        message += "Measured from device: {r}"\
+                        .format(r=cpu_dict['five_min_cpu'])
+        return True, message
+
+    def _blocking_execution(self, device):
+
         # Init
         status = OK
         
@@ -89,31 +151,16 @@ class Plugin(BasePlugin):
         # loop status
         loop_stat_ok = True
 
-        if not hasattr(self, 'PARSER_MODULE'):
-            return WARNING('Does not have CPU related parsers to check')
-
         while timeout.iterate():
-            # Execute command to get five minutes usage percentage
             try:
-                cpu_dict = self.PARSER_MODULE(device).parse(
-                    sort_time='5min', key_word='CPU')
+                ok, message = self._sample(device)
             except Exception as e:
                 return ERRORED('No output from show processes cpu\n{}'.format(e))
 
-            # Check 5 minutes percentage smaller than cpucheck_fivemin_pcnt
-            if int(cpu_dict['five_min_cpu']) >= int(self.args.cpucheck_fivemin_pcnt):
-                message = "****** Device {d} *****\n".format(d=device.name)
-                message += "Excessive CPU utilization detected for 5 min interval\n"
-                message += "Allowed: {e}%\n".format(e=self.args.cpucheck_fivemin_pcnt)
-                message += "Measured: FiveMin: {r}%".format(r=cpu_dict['five_min_cpu'])
+            if not ok:
                 loop_stat_ok = False
                 timeout.sleep()
             else:
-                message = "***** CPU usage is Expected ***** \n"
-                message += "Allowed threashold: {e} \n"\
-                                .format(e=self.args.cpucheck_fivemin_pcnt)
-                message += "Measured from device: {r}"\
-                                .format(r=cpu_dict['five_min_cpu'])
                 loop_stat_ok = True
                 status += OK(message)
                 logger.info(banner(message))
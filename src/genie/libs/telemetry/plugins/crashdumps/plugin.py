@@ -3,7 +3,9 @@ GenieTelemetry Crashdumps Plugin
 '''
 
 # Python
+import os
 import copy
+import logging
 
 # argparse
 from argparse import ArgumentParser
@@ -15,11 +17,16 @@ from pyats.datastructures import classproperty
 # GenieTelemetry
 from genie.telemetry.plugin import BasePlugin
 from genie.telemetry.status import OK, CRITICAL
+from genie.telemetry.utils import str_to_bool
 from genie.libs.telemetry.plugins import libs
+from genie.libs.telemetry.plugins.libs.artifacts import KnownArtifacts
 
 # Abstract
 from genie.abstract import Lookup
 
+# module logger
+logger = logging.getLogger(__name__)
+
 
 class Plugin(BasePlugin):
 
@@ -27,6 +34,12 @@ class Plugin(BasePlugin):
     __version__ = '1.0.0'
     __supported_os__ = ['nxos', 'iosxr', 'iosxe']
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # artifacts already reported, by device
+        self._known = {}
+
     @classproperty
     def parser(cls):
         parser = argparse.ArgsPropagationParser(add_help = False)
@@ -100,6 +113,25 @@ class Plugin(BasePlugin):
                             action="store",
                             default=None,
                             help='Specify list of crash type file checking under flash:')
+        # device_filter
+        # -------------
+        parser.add_argument('--crashdumps_device_filter',
+                            action="store",
+                            type=str_to_bool,
+                            default=False,
+                            help='Specify whether to filter file system '
+                                 'listings on the device to only transfer core '
+                                 'and crashinfo entries\ndefault to False')
+        # track_known
+        # -----------
+        parser.add_argument('--crashdumps_track_known',
+                            action="store",
+                            type=str_to_bool,
+                            default=True,
+                            help='Specify whether to only report, upload and '
+                                 'clear cores and crashinfo reports not seen '
+                                 'before (requires a runinfo directory)'
+                                 '\ndefault to True')
         return parser
 
     def parse_args(self, argv):
@@ -133,15 +165,31 @@ class Plugin(BasePlugin):
 
         crash_type = getattr(self.args, 'crashdumps_flash_crash_file', None)
 
+        # Artifacts already reported on previous executions
+        known = None
+        if self.args.crashdumps_track_known:
+            known = self.known_artifacts(device)
+
         # Execute command to check for cores
         status += lookup.libs.utils.check_cores(device, self.core_list,
                                                 crashreport_list=self.crashreport_list,
                                                 timeout=self.args.crashdumps_timeout,
-                                                crash_type=crash_type)
+                                                crash_type=crash_type,
+                                                device_filter=self.args.crashdumps_device_filter,
+                                                known=known)
+
+        # Only react to these artifacts once, once uploaded when requested
+        # (uploaded again otherwise)
+        upload = self.args.crashdumps_upload and status == CRITICAL
+        if known and not upload:
+            known.update(self.core_list + self.crashreport_list)
 
         # User requested upload cores to server
-        if self.args.crashdumps_upload and status == CRITICAL:
-            kwargs = {'protocol': self.args.crashdumps_protocol,
+        uploaded = False
+        if upload:
+            kwargs = {'clean_up': bool(self.args.crashdumps_clean_up),
+                      'known': known,
+                      'protocol': self.args.crashdumps_protocol,
                       'server': self.args.crashdumps_server,
                       'port': self.args.crashdumps_port,
                       'username': self.args.crashdumps_username,
@@ -183,6 +231,7 @@ class Plugin(BasePlugin):
             if kwargs['protocol'] and kwargs['protocol'] in valid_protocols_list:
                 status += lookup.libs.utils.upload_to_server(device,
                     self.core_list, self.crashreport_list, **kwargs)
+                uploaded = True
             else:
                 raise Exception("Unable to upload to server: file transfer "
                                 "'protocol' is missing or invalid. "
@@ -190,10 +239,34 @@ class Plugin(BasePlugin):
                                 "Check the testbed/genietelemetry yaml file "
                                 "and the provided arguments.")
 
-        # User requested clean up of cores
-        if self.args.crashdumps_clean_up and status == CRITICAL:
+        # User requested clean up of cores, deleted once uploaded otherwise
+        if self.args.crashdumps_clean_up and status == CRITICAL and \
+           not uploaded:
             status += lookup.libs.utils.clear_cores(device, self.core_list,
                 self.crashreport_list)
 
         # Final status
         return status
+
+    def known_artifacts(self, device):
+        '''known_artifacts
+
+        returns the index of the artifacts already reported for the device,
+        persisted to the runinfo directory. Plugins execute in a new worker
+        process every time, the index is not tracked (None returned) without
+        a runinfo directory to keep it in.
+        '''
+        if not self.runinfo_dir:
+            logger.warning('No runinfo directory to keep the artifacts already '
+                           'reported for device {} in, reporting all of them '
+                           '(--crashdumps_track_known ignored)'.format(
+                                                                device.name))
+            return None
+
+        known = self._known.get(device.name)
+        if known is None:
+            known = self._known[device.name] = KnownArtifacts(
+                                device.name,
+                                directory=os.path.join(self.runinfo_dir,
+                                                       'crashdumps'))
+        return known
@@ -0,0 +1,52 @@
+'''
+Known artifacts index
+
+Remembers the artifacts (core dumps, crashinfo reports) already reported for a
+device, keyed by their location, name, size and timestamp, so that they only
+raise statuses, uploads and notifications once, when they first show up.
+
+The index is persisted like the device facts: one json file per device, under
+the given directory, reloaded whenever that file changes.
+'''
+
+# GenieTelemetry
+from genie.telemetry.facts import DeviceFacts
+
+
+class KnownArtifacts(DeviceFacts):
+    '''KnownArtifacts class
+
+    Index of the artifacts already reported for a single device. Unlike device
+    facts, it is kept when reconnecting to the device: a reload doesn't remove
+    the artifacts from the device file systems.
+
+    Arguments
+    ---------
+        name (str): device name
+        directory (str): directory to persist the index to. The index is only
+                         kept in memory if not provided.
+    '''
+
+    @staticmethod
+    def key(artifact):
+        '''key
+
+        identifies the artifact by all its attributes (eg: location, core,
+        size and timestamp)
+        '''
+        return '|'.join('{}={}'.format(k, artifact[k]) for k in sorted(artifact))
+
+    def is_known(self, artifact):
+        return self.key(artifact) in self.get('known', [])
+
+    def update(self, artifacts):
+        '''update
+
+        adds the artifacts to the index, saved once.
+        '''
+        self._load()
+        known = self._facts.setdefault('known', [])
+        new = [k for k in map(self.key, artifacts) if k not in known]
+        if new:
+            known.extend(new)
+            self._save()
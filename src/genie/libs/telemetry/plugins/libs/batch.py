@@ -0,0 +1,116 @@
+'''
+Batched command execution
+
+Issues a list of commands to a device within a single dispatch (one execute
+service call, one prompt/state handling) instead of one dispatch per command,
+and returns the output of each command along with per-command error detection.
+
+Available to any plugin:
+
+    from genie.libs.telemetry.plugins.libs.batch import execute_batch
+
+    outputs = execute_batch(device, ['dir flash:', 'dir bootflash:'],
+                            timeout=300)
+    for command, output in outputs.items():
+        if command in outputs.errors:
+            ...
+'''
+
+# Python
+import logging
+from collections import OrderedDict
+
+# module logger
+logger = logging.getLogger(__name__)
+
+# device replies when a command is rejected
+ERROR_PATTERNS = ('Invalid input detected',
+                  'Invalid command',
+                  'Incomplete command',
+                  'Syntax error')
+
+
+def has_error(output):
+    '''has_error
+
+    checks whether the device rejected the command
+    '''
+    return any(error in output for error in ERROR_PATTERNS)
+
+
+class BatchOutput(OrderedDict):
+    '''BatchOutput class
+
+    Ordered command to output map of a batch execution. Commands which raised
+    an exception or were rejected by the device are also recorded in `errors`,
+    mapped to the exception or the device error line.
+    '''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.errors = dict()
+
+    def add(self, command, output):
+        if isinstance(output, Exception):
+            self[command] = ''
+            self.errors[command] = output
+            return
+
+        self[command] = output = output or ''
+        for line in output.splitlines():
+            if any(error in line for error in ERROR_PATTERNS):
+                self.errors[command] = line.strip()
+                break
+
+
+def execute_batch(device, commands, timeout, **kwargs):
+    '''execute_batch
+
+    executes the list of commands within a single dispatch. Falls back to one
+    dispatch per command when the connection doesn't support batches or the
+    batch failed as a whole, so the failure can be pinned on a command.
+
+    Arguments
+    ---------
+        device (Device): device to execute the commands on
+        commands (list): commands to execute, in order
+        timeout (int): execution timeout
+        kwargs (dict): any other execute service arguments
+
+    Returns
+    -------
+        BatchOutput of each command output and errors
+    '''
+    # unicon returns the outputs keyed by command, execute each once
+    commands = list(OrderedDict.fromkeys(commands))
+
+    result = BatchOutput()
+    if not commands:
+        return result
+
+    # errors are detected per command instead of aborting the whole batch
+    kwargs.setdefault('error_pattern', [])
+
+    # unicon returns the output itself for a single command list, a single
+    # command is dispatched as is
+    outputs = None
+    if len(commands) > 1:
+        try:
+            outputs = device.execute(commands, timeout=timeout, **kwargs)
+        except Exception as e:
+            logger.warning('Batch execution failed on device {}, executing '
+                           'one command at a time: {}'.format(device.name, e))
+
+    if isinstance(outputs, dict) and all(c in outputs for c in commands):
+        for command in commands:
+            result.add(command, outputs[command])
+        return result
+
+    for command in commands:
+        try:
+            output = device.execute(command, timeout=timeout, **kwargs)
+        except Exception as e:
+            output = e
+        result.add(command, output)
+
+    return result
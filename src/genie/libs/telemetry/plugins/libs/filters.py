@@ -0,0 +1,102 @@
+'''
+Device-side output filtering helpers
+
+Pushes the patterns plugins look for down to the device as output modifiers
+(eg: '| include ...'), so only the relevant lines are transferred back. Plugins
+still match the returned lines client-side: filtering on the device only reduces
+the output, it never changes the verdict.
+'''
+
+# Python
+import re
+import logging
+
+# GenieTelemetry
+from genie.telemetry.facts import get_facts
+
+# batched execution
+from .batch import has_error
+
+# module logger
+logger = logging.getLogger(__name__)
+
+# keywords made of these characters only mean the same thing to the device
+# regular expression engines as they do to python
+PLAIN_KEYWORD = re.compile(r'^[\w\-:%/ ]+$')
+
+
+def is_expressible(keywords):
+    '''is_expressible
+
+    checks whether the keywords can be pushed to the device as output modifier
+    '''
+    return bool(keywords) and all(PLAIN_KEYWORD.match(k) for k in keywords)
+
+
+def filter_command(device, command, keywords, modifier):
+    '''filter_command
+
+    returns the command filtering its output on the device for lines matching
+    any of the keywords, if they can be expressed as an output modifier that
+    the device didn't reject before. Returns the command as is otherwise.
+
+    Arguments
+    ---------
+        device (Device): device to execute the command on
+        command (str): command to execute
+        keywords (list): keywords the lines of interest contain
+        modifier (callable): returns the os specific output modifier for the
+                             given list of keywords
+    '''
+    if not is_expressible(keywords):
+        return command
+
+    filtered = '{} {}'.format(command, modifier(keywords))
+    if get_facts(device).is_unsupported(filtered):
+        return command
+
+    return filtered
+
+
+def check_filtered(device, command, filtered, output, timeout):
+    '''check_filtered
+
+    verifies the output of a filtered command. If the device rejected it, the
+    command is executed again unfiltered, and the modifier is remembered as
+    unsupported when the command itself works.
+
+    Returns
+    -------
+        tuple of the command output and whether it was filtered on the device
+    '''
+    # some connections return None for commands without output
+    output = output or ''
+    if filtered == command:
+        return output, False
+
+    facts = get_facts(device)
+    if not has_error(output):
+        facts.set_supported(filtered)
+        return output, True
+
+    output = device.execute(command, timeout=timeout) or ''
+    # the modifier is the culprit only if the command itself works
+    if not has_error(output):
+        facts.set_unsupported(filtered)
+    return output, False
+
+
+def execute_filtered(device, command, keywords, modifier, timeout):
+    '''execute_filtered
+
+    executes command with its output filtered on the device when possible,
+    falling back to the unfiltered command otherwise (see filter_command).
+
+    Returns
+    -------
+        tuple of the command output and whether it was filtered on the device
+    '''
+    filtered = filter_command(device, command, keywords, modifier)
+    output = device.execute(filtered, timeout=timeout)
+
+    return check_filtered(device, command, filtered, output, timeout)
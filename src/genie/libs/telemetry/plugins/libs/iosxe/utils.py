@@ -7,56 +7,85 @@ import logging
 from pyats.log.utils import banner
 
 # GenieMonitor
+from genie.telemetry.facts import get_facts
 from genie.telemetry.status import OK, WARNING, ERRORED, PARTIAL, CRITICAL
 
 # abstract
 from genie.abstract import Lookup
 
-# Import FileUtils core utilities
-from pyats.utils.fileutils import FileUtils
-
 # Unicon
 from unicon.eal.dialogs import Statement, Dialog
 from unicon.eal.utils import expect_log
 
+# Device-side output filtering
+from genie.libs.telemetry.plugins.libs.filters import execute_filtered, \
+                                                    filter_command, \
+                                                    check_filtered
+
+# Batched execution
+from genie.libs.telemetry.plugins.libs.batch import execute_batch
+
+# Uploads
+from genie.libs.telemetry.plugins.libs.upload import upload_files
+
+# Listing parser
+from genie.libs.telemetry.plugins.libs.listing import parse_cores
+
 # module logger
 logger = logging.getLogger(__name__)
 
+# keywords of the 'dir' lines listing core and crashinfo files
+CORE_KEYWORDS = ['core', 'crashinfo', 'txt']
 
-def check_cores(device, core_list, crashreport_list, timeout, crash_type=None):
+
+def output_filter(keywords):
+    # IOS regular expressions support alternation within a single include
+    return '| include {}'.format('|'.join(keywords))
+
+
+def check_cores(device, core_list, crashreport_list, timeout, crash_type=None,
+                device_filter=False, known=None):
 
     # Init
     status = OK
 
-    # Construct the core pattern to be parsed later
-    # 1613827  -rw-         56487348  Oct 17 2017 15:56:59 +17:00  PE1_RP_0_x86_64_crb_linux_iosd-universalk9-ms_15866_20171016-155604-PDT.core.gz
-    # 7763     -rw-        107847329   Jul 5 2018 12:53:55 +00:00  kernel.rp_RP-EDISON_0_20180705125020.core.flat.gz
-    # 7761     -rw-            36003   Jul 5 2018 12:50:20 +00:00  kernel.rp_RP-EDISON_0_20180705125020.txt
-    core_pattern = re.compile(r'(?P<number>\d+) '
-        '+(?P<permissions>[rw\-]+) +(?P<filesize>\d+) '
-        '+(?P<month>\w+) +(?P<date>\d+) +(?P<year>\d+) '
-        '+(?P<time>[\w\:]+) +(?P<timezone>(\S+)) +(?P<core>((.*\.core\.gz)|(.*\.core\.flat\.gz)|(.*\.txt)))$', re.IGNORECASE)
-
-    # Construct the crashreport pattern to be parsed later
-    # 62  -rw-           125746  Jul 30 2016 05:47:28 +00:00  crashinfo_RP_00_00_20160730-054724-UTC
-    crashinfo_pattern = re.compile(r'(?P<number>\d+) '
-        '+(?P<permissions>[rw\-]+) +(?P<filesize>\d+) '
-        '+(?P<month>\w+) +(?P<date>\d+) +(?P<year>\d+) '
-        '+(?P<time>[\w\:]+) +(?P<timezone>(\S+)) '
-        '+(?P<core>(crashinfo.*))$', re.IGNORECASE)
-
     # define default checking dir
     locations = ['flash:/core', 'bootflash:/core', 'harddisk:/core', 'crashinfo:']
+    default_locations = list(locations)
 
     # if provided 
     if crash_type:
         for crash_string in crash_type.split(','):
             locations.append('flash:{}*'.format(crash_string.strip())) if crash_string else None
 
-    # Execute command to check for cores and crashinfo reports
+    # file systems that do not exist on the device, learned on previous runs
+    facts = get_facts(device)
+    missing_locations = facts.get('missing_locations', [])
+
+    # Commands to check for cores and crashinfo reports, per location
+    commands = {}
     for location in locations:
+        if location in missing_locations:
+            logger.debug("Location '{}' does not exist on device, skipping".format(location))
+            continue
+
+        # only list core and crashinfo files if filtering on device
+        keywords = CORE_KEYWORDS if device_filter and \
+                                    location in default_locations else None
+        command = 'dir {}'.format(location)
+        commands[location] = (command, filter_command(device, command,
+                                                      keywords, output_filter))
+
+    # List all locations within a single dispatch
+    outputs = execute_batch(device, [filtered for _, filtered in
+                                     commands.values()], timeout=timeout)
+
+    for location, (command, filtered) in commands.items():
         try:
-            output = device.execute('dir {}'.format(location), timeout=timeout)
+            if isinstance(outputs.errors.get(filtered), Exception):
+                raise outputs.errors[filtered]
+            output, filtered = check_filtered(device, command, filtered,
+                                              outputs[filtered], timeout)
         except Exception as e:
             if any(isinstance(item, TimeoutError) for item in e.args):
                 # Handle exception
@@ -69,63 +98,79 @@ def check_cores(device, core_list, crashreport_list, timeout, crash_type=None):
 
             continue
         
-        if 'Invalid input detected' in output or \
-           'No such file' in output :
+        if 'Invalid input detected' in output:
+            logger.warning("Location '{}' does not exist on device".format(location))
+            facts.add('missing_locations', location)
+            continue
+        elif 'No such file' in output:
             logger.warning("Location '{}' does not exist on device".format(location))
             continue
-        elif not output:
+        elif not output and not filtered:
             meta_info = "Unable to check for cores"
             logger.error(meta_info)
             return ERRORED(meta_info)
 
-        for line in output.splitlines():
-            line = line.strip()
-
-            m = core_pattern.match(line)
-            if m:
-                core = m.groupdict()['core']
-                meta_info = "Core dump generated:\n'{}'".format(core)
-                logger.error(meta_info)
-                status += CRITICAL(meta_info)
-                core_info = dict(location = location,
-                                 core = core)
-                core_list.append(core_info)
+        # crashinfo reports named after the user provided crash type
+        pattern = location.split(':')[1]
+        crash_name = re.compile(pattern) if pattern and '/' not in pattern \
+                                         else None
+
+        cores, crashreports = parse_cores(output, location, 'iosxe',
+                                          crash_name=crash_name)
+
+        # artifacts already reported on previous executions
+        known_cores = known_crashreports = 0
+
+        for entry in cores:
+            core = entry['name']
+            core_info = dict(location = location,
+                             core = core,
+                             size = entry['size'],
+                             timestamp = entry['timestamp'])
+            if known and known.is_known(core_info):
+                logger.debug("Core dump already reported: '{}'".format(core))
+                known_cores += 1
                 continue
-
-            m = crashinfo_pattern.match(line)
-            if m:
-                crashreport = m.groupdict()['core']
-                meta_info = "Crashinfo report generated:\n'{}'".\
-                    format(crashreport)
-                logger.error(meta_info)
-                status += CRITICAL(meta_info)
-                crashreport_info = dict(location = location,
-                    core = crashreport)
-                crashreport_list.append(crashreport_info)
+            meta_info = "Core dump generated:\n'{}'".format(core)
+            logger.error(meta_info)
+            status += CRITICAL(meta_info)
+            core_list.append(core_info)
+
+        for entry in crashreports:
+            crashreport = entry['name']
+            crashreport_info = dict(location = location,
+                                    core = crashreport,
+                                    size = entry['size'],
+                                    timestamp = entry['timestamp'])
+            if known and known.is_known(crashreport_info):
+                logger.debug("Crashinfo report already reported: '{}'".\
+                    format(crashreport))
+                known_crashreports += 1
                 continue
+            meta_info = "Crashinfo report generated:\n'{}' on device {}".\
+                format(crashreport, device.name)
+            logger.error(meta_info)
+            status += CRITICAL(meta_info)
+            crashreport_list.append(crashreport_info)
 
-            # find user defined crashed files other than crashinfo
-            pattern = location.split(':')[1]
-            if pattern and '/' not in pattern:
-                m = re.compile(r'{}'.format(pattern)).match(line)
-                if m:
-                    crashreport = line
-                    meta_info = "Crashinfo report generated:\n'{}' on device {}".\
-                        format(line, device.name)
-                    logger.error(meta_info)
-                    status += CRITICAL(meta_info)
-                    crashreport_info = dict(location = location,
-                        core = crashreport)
-                    crashreport_list.append(crashreport_info)
-                    continue
-
-        if not core_list:
+        if not core_list and known_cores:
+            meta_info = "No new cores found at location: {} ({} already "\
+                        "reported)".format(location, known_cores)
+            logger.info(meta_info)
+            status += OK(meta_info)
+        elif not core_list:
             meta_info = "No cores found at location: {}".format(
                 location)
             logger.info(meta_info)
             status += OK(meta_info)
 
-        if not crashreport_list:
+        if not crashreport_list and known_crashreports:
+            meta_info = "No new crashreports found at location: {} ({} "\
+                        "already reported)".format(location,
+                                                   known_crashreports)
+            logger.info(meta_info)
+            status += OK(meta_info)
+        elif not crashreport_list:
             meta_info = "No crashreports found at location: {}".\
                 format(location)
             logger.info(meta_info)
@@ -139,6 +184,12 @@ def upload_to_server(device, core_list, crashreport_list, **kwargs):
     # Init
     status= OK
 
+    # Delete the files once uploaded (if user specified)
+    clean_up = kwargs.pop('clean_up', False)
+
+    # Artifacts known once uploaded (if tracked)
+    known = kwargs.pop('known', None)
+
     # Get info
     port = kwargs['port']
     server = kwargs['server']
@@ -164,6 +215,7 @@ def upload_to_server(device, core_list, crashreport_list, **kwargs):
         server = '{server}:{port}'.format(server=server, port=port)
 
     # Upload each core/crashinfo report found
+    uploads = []
     for item in full_list:
 
         if 'crashinfo' in item['core']:
@@ -174,38 +226,25 @@ def upload_to_server(device, core_list, crashreport_list, **kwargs):
         message = "{} upload attempt from {} to {} via server {}".format(
             file_type, item['location'], destination, server)
 
-        try:
-            # Check if filetransfer has been added to device before or not
-            if not hasattr(device, 'filetransfer'):
-                device.filetransfer = FileUtils.from_device(device)
+        to_URL = '{protocol}://{address}/{path}'.format(
+            protocol=protocol,
+            address=server,
+            path=destination)
 
-            to_URL = '{protocol}://{address}/{path}'.format(
-                protocol=protocol,
-                address=server,
-                path=destination)
+        from_URL = '{location}//{core_path}'.format(
+            location=item['location'], core_path=item['core'])
 
-            from_URL = '{location}//{core_path}'.format(
-                location=item['location'], core_path=item['core'])
+        uploads.append(dict(source=from_URL,
+                            destination=to_URL,
+                            target='{}/{}'.format(to_URL.rstrip('/'),
+                                                  item['core'].split('/')[-1]),
+                            size=item.get('size'),
+                            message=message))
 
-            device.filetransfer.copyfile(device=device,
-                                         source=from_URL,
-                                         destination=to_URL)
-        except Exception as e:
-            if 'Tftp operation failed' in e:
-                meta_info = "{} upload operation failed: {}".format(file_type,
-                    message)
-                logger.error(meta_info)
-                status += ERRORED(meta_info)
-            else:
-                # Handle exception
-                logger.warning(e)
-                status += ERRORED("Failed: {}".format(message))
-
-        meta_info = "{} upload operation passed: {}".format(file_type, message)
-        logger.info(meta_info)
-        status += OK(meta_info)
-
-    return status
+    return upload_files(device, uploads, timeout,
+                        callback=clear_cores if clean_up else None,
+                        args=(core_list, crashreport_list),
+                        known=known, artifacts=full_list)
 
 
 def clear_cores(device, core_list, crashreport_list):
@@ -222,6 +261,7 @@ def clear_cores(device, core_list, crashreport_list):
     full_list = core_list + crashreport_list
 
     # Delete cores from the device
+    status = OK
     for item in full_list:
         try:
             # Execute delete command for this core
@@ -232,19 +272,22 @@ def clear_cores(device, core_list, crashreport_list):
             meta_info = 'Successfully deleted {location}/{core}'.format(
                 core=item['core'],location=item['location'])
             logger.info(meta_info)
-            return OK(meta_info)
+            status += OK(meta_info)
         except Exception as e:
             # Handle exception
             logger.warning(e)
             meta_info = 'Unable to delete {location}/{core}'.format(
                 core=item['core'],location=item['location'])
             logger.error(meta_info)
-            return ERRORED(meta_info)
+            status += ERRORED(meta_info)
+
+    return status
 
-def check_tracebacks(device, timeout, **kwargs):
+def check_tracebacks(device, timeout, keywords=None, **kwargs):
 
     # Execute command to check for tracebacks
-    output = device.execute('show logging', timeout=timeout)
+    output, _ = execute_filtered(device, 'show logging', keywords,
+                                 output_filter, timeout)
 
     return output
 
@@ -254,3 +297,21 @@ def clear_tracebacks(device, timeout, **kwargs):
     output = device.execute('clear logging', timeout=timeout)
 
     return output
+
+def check_and_clear_tracebacks(device, timeout, keywords=None, **kwargs):
+
+    # Check and clear tracebacks within a single dispatch. A filter the device
+    # may still reject is checked first: its unfiltered fallback has to run
+    # before the logs are cleared
+    show = filter_command(device, 'show logging', keywords, output_filter)
+    if show != 'show logging' and not get_facts(device).is_supported(show):
+        output = check_tracebacks(device, timeout, keywords=keywords)
+        outputs = execute_batch(device, ['clear logging'], timeout=timeout)
+    else:
+        outputs = execute_batch(device, [show, 'clear logging'], timeout=timeout)
+        if isinstance(outputs.errors.get(show), Exception):
+            raise outputs.errors[show]
+        output = outputs[show]
+
+    # error of the clear command, if any
+    return output, outputs.errors.get('clear logging')
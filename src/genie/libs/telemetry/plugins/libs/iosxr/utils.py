@@ -1,9 +1,9 @@
 
 # Python
-import re
 import logging
 
 # GenieMonitor
+from genie.telemetry.facts import get_facts
 from genie.telemetry.status import OK, WARNING, ERRORED, PARTIAL, CRITICAL
 
 # abstract
@@ -12,23 +12,66 @@ from genie.abstract import Lookup
 # Unicon
 from unicon.eal.dialogs import Statement, Dialog
 
-# Import FileUtils core utilities
-from pyats.utils.fileutils import FileUtils
+# Device-side output filtering
+from genie.libs.telemetry.plugins.libs.filters import execute_filtered, \
+                                                    filter_command, \
+                                                    check_filtered
+
+# Batched execution
+from genie.libs.telemetry.plugins.libs.batch import execute_batch
+
+# Uploads
+from genie.libs.telemetry.plugins.libs.upload import upload_files
+
+# Listing parser
+from genie.libs.telemetry.plugins.libs.listing import parse_cores
 
 # module logger
 logger = logging.getLogger(__name__)
 
+# keywords of the 'dir' lines listing core files
+CORE_KEYWORDS = ['core']
+
+
+def output_filter(keywords):
+    return '| include "{}"'.format('|'.join(keywords))
+
 
 def check_cores(device, core_list, **kwargs):
 
     # Init
     status = OK
     timeout = kwargs['timeout']
-    
-    # Execute command to check for cores
+    known = kwargs.get('known')
+
+    # only list core files if filtering on device
+    keywords = CORE_KEYWORDS if kwargs.get('device_filter') else None
+
+    # file systems that do not exist on the device, learned on previous runs
+    facts = get_facts(device)
+    missing_locations = facts.get('missing_locations', [])
+
+    # Commands to check for cores, per location
+    commands = {}
     for location in ['disk0:', 'disk0:core', 'harddisk:']:
+        if location in missing_locations:
+            logger.debug("Location '{}' does not exist on device, skipping".format(location))
+            continue
+
+        command = 'dir {}'.format(location)
+        commands[location] = (command, filter_command(device, command,
+                                                      keywords, output_filter))
+
+    # List all locations within a single dispatch
+    outputs = execute_batch(device, [filtered for _, filtered in
+                                     commands.values()], timeout=timeout)
+
+    for location, (command, filtered) in commands.items():
         try:
-            output = device.execute('dir {}'.format(location), timeout=timeout)
+            if isinstance(outputs.errors.get(filtered), Exception):
+                raise outputs.errors[filtered]
+            output, filtered = check_filtered(device, command, filtered,
+                                              outputs[filtered], timeout)
         except Exception as e:
             # Handle exception
             logger.warning(e)
@@ -37,31 +80,39 @@ def check_cores(device, core_list, **kwargs):
         
         if 'Invalid input detected' in output:
             logger.warning("Location '{}' does not exist on device".format(location))
+            facts.add('missing_locations', location)
             continue
-        elif not output:
+        elif not output and not filtered:
             meta_info = "Unable to check for cores"
             logger.error(meta_info)
             return ERRORED(meta_info)
 
-        # 24 -rwxr--r-- 1 18225345 Oct 23 05:15 ipv6_rib_9498.by.11.20170624-014425.xr-vm_node0_RP0_CPU0.237a0.core.gz
-        pattern1 = '(?P<number>(\d+)) +(?P<permissions>(\S+)) +(?P<other_number>(\d+)) +(?P<filesize>(\d+)) +(?P<month>(\S+)) +(?P<date>(\d+)) +(?P<time>(\S+)) +(?P<core>(.*core\.gz))'
-        # 12089255    -rwx  23596201    Tue Oct 31 05:16:50 2017  ospf_14495.by.6.20171026-060000.xr-vm_node0_RP0_CPU0.328f3.core.gz
-        pattern2 = '(?P<number>(\d+)) +(?P<permissions>(\S+)) +(?P<filesize>(\d+)) +(?P<day>(\S+)) +(?P<month>(\S+)) +(?P<date>(\d+)) +(?P<time>(\S+)) +(?P<year>(\d+)) +(?P<core>(.*core\.gz))'
-
-        for line in output.splitlines():
-            # Parse through output to collect core information (if any)
-            match = re.search(pattern1, line, re.IGNORECASE) or \
-                    re.search(pattern2, line, re.IGNORECASE)
-            if match:
-                core = match.groupdict()['core']
-                meta_info = "Core dump generated:\n'{}'".format(core)
-                logger.error(meta_info)
-                status += CRITICAL(meta_info)
-                core_info = dict(location = location,
-                                 core = core)
-                core_list.append(core_info)
-
-        if not core_list:
+        cores, _ = parse_cores(output, location, 'iosxr')
+
+        # cores already reported on previous executions
+        known_cores = 0
+
+        for entry in cores:
+            core = entry['name']
+            core_info = dict(location = location,
+                             core = core,
+                             size = entry['size'],
+                             timestamp = entry['timestamp'])
+            if known and known.is_known(core_info):
+                logger.debug("Core dump already reported: '{}'".format(core))
+                known_cores += 1
+                continue
+            meta_info = "Core dump generated:\n'{}'".format(core)
+            logger.error(meta_info)
+            status += CRITICAL(meta_info)
+            core_list.append(core_info)
+
+        if not core_list and known_cores:
+            meta_info = "No new cores found at location: {} ({} already "\
+                        "reported)".format(location, known_cores)
+            logger.info(meta_info)
+            status += OK(meta_info)
+        elif not core_list:
             meta_info = "No cores found at location: {}".format(location)
             logger.info(meta_info)
             status += OK(meta_info)
@@ -74,6 +125,12 @@ def upload_to_server(device, core_list, *args, **kwargs):
     # Init
     status= OK
 
+    # Delete the files once uploaded (if user specified)
+    clean_up = kwargs.pop('clean_up', False)
+
+    # Artifacts known once uploaded (if tracked)
+    known = kwargs.pop('known', None)
+
     # Get info
     port = kwargs['port']
     server = kwargs['server']
@@ -93,44 +150,30 @@ def upload_to_server(device, core_list, *args, **kwargs):
             return ERRORED(meta_info)
 
     # Upload each core found
+    uploads = []
     for item in core_list:
 
         message = "Core dump upload attempt from {} to {} via server {}".format(
             item['location'], destination, server)
 
-        try:
-            # Check if filetransfer has been added to device before or not
-            if not hasattr(device, 'filetransfer'):
-                device.filetransfer = FileUtils.from_device(device)
-
-            to_URL = '{protocol}://{address}/{path}/{filename}'.format(
-                protocol=protocol,
-                address=server,
-                path=destination,
-                filename=item['core'])
-
-            from_URL = '{location}//{core_path}'.format(
-                location=item['location'], core_path=item['core'])
-
-            device.filetransfer.copyfile(device=device,
-                                         source=from_URL,
-                                         destination=to_URL)
-        except Exception as e:
-            if 'Tftp operation failed' in e:
-                meta_info = "Core dump upload operation failed: {}".format(
-                    message)
-                logger.error(meta_info)
-                status += ERRORED(meta_info)
-            else:
-                # Handle exception
-                logger.warning(e)
-                status += ERRORED("Failed: {}".format(message))
-
-        meta_info = "Core dump upload operation passed: {}".format(message)
-        logger.info(meta_info)
-        status += OK(meta_info)
+        to_URL = '{protocol}://{address}/{path}/{filename}'.format(
+            protocol=protocol,
+            address=server,
+            path=destination,
+            filename=item['core'])
 
-    return status
+        from_URL = '{location}//{core_path}'.format(
+            location=item['location'], core_path=item['core'])
+
+        uploads.append(dict(source=from_URL,
+                            destination=to_URL,
+                            size=item.get('size'),
+                            message=message))
+
+    return upload_files(device, uploads, timeout,
+                        callback=clear_cores if clean_up else None,
+                        args=(core_list, []),
+                        known=known, artifacts=core_list)
 
 
 def clear_cores(device, core_list, crashreport_list, **kwargs):
@@ -147,6 +190,7 @@ def clear_cores(device, core_list, crashreport_list, **kwargs):
     full_list = core_list + crashreport_list
 
     # Delete cores from the device
+    status = OK
     for item in full_list:
         try:
             # Execute delete command for this core
@@ -157,19 +201,22 @@ def clear_cores(device, core_list, crashreport_list, **kwargs):
             meta_info = 'Successfully deleted {location}/{core}'.format(
                         core=item['core'],location=item['location'])
             logger.info(meta_info)
-            return OK(meta_info)
+            status += OK(meta_info)
         except Exception as e:
             # Handle exception
             logger.warning(e)
             meta_info = 'Unable to delete {location}/{core}'.format(
                         core=item['core'],location=item['location'])
             logger.error(meta_info)
-            return ERRORED(meta_info)
+            status += ERRORED(meta_info)
 
-def check_tracebacks(device, timeout, **kwargs):
+    return status
+
+def check_tracebacks(device, timeout, keywords=None, **kwargs):
 
     # Execute command to check for tracebacks
-    output = device.execute('show logging', timeout=timeout)
+    output, _ = execute_filtered(device, 'show logging', keywords,
+                                 output_filter, timeout)
 
     return output
 
@@ -179,3 +226,21 @@ def clear_tracebacks(device, timeout, **kwargs):
     output = device.execute('clear logging', timeout=timeout)
 
     return output
+
+def check_and_clear_tracebacks(device, timeout, keywords=None, **kwargs):
+
+    # Check and clear tracebacks within a single dispatch. A filter the device
+    # may still reject is checked first: its unfiltered fallback has to run
+    # before the logs are cleared
+    show = filter_command(device, 'show logging', keywords, output_filter)
+    if show != 'show logging' and not get_facts(device).is_supported(show):
+        output = check_tracebacks(device, timeout, keywords=keywords)
+        outputs = execute_batch(device, ['clear logging'], timeout=timeout)
+    else:
+        outputs = execute_batch(device, [show, 'clear logging'], timeout=timeout)
+        if isinstance(outputs.errors.get(show), Exception):
+            raise outputs.errors[show]
+        output = outputs[show]
+
+    # error of the clear command, if any
+    return output, outputs.errors.get('clear logging')
@@ -0,0 +1,143 @@
+'''
+Core dump and crashinfo listing parser
+
+Parses the file system listings ('dir') and core listings ('show cores') core
+dumps and crashinfo reports are searched in, into entries of:
+
+    name (str): file name (process name for 'show cores')
+    size (str): file size, None when not listed
+    timestamp (str): modification time, as listed
+    location (str): location the entry was listed from
+
+Patterns are compiled once, at import. File systems may hold thousands of
+files: lines are only matched against the patterns of their os, and entries
+are only built for the lines of interest.
+'''
+
+# Python
+import re
+
+# 1613827  -rw-         56487348  Oct 17 2017 15:56:59 +17:00  PE1_RP_0_x86_64_crb_linux_iosd-universalk9-ms_15866_20171016-155604-PDT.core.gz
+# 7763     -rw-        107847329   Jul 5 2018 12:53:55 +00:00  kernel.rp_RP-EDISON_0_20180705125020.core.flat.gz
+# 62       -rw-           125746  Jul 30 2016 05:47:28 +00:00  crashinfo_RP_00_00_20160730-054724-UTC
+IOSXE_DIR_ENTRY = re.compile(r'^\s*\d+ +[rw\-]+ +(?P<size>\d+) '
+                             r'+(?P<timestamp>\w+ +\d+ +\d+ +[\w:]+ +\S+) '
+                             r'+(?P<name>.+)$')
+
+# 24 -rwxr--r-- 1 18225345 Oct 23 05:15 ipv6_rib_9498.by.11.20170624-014425.xr-vm_node0_RP0_CPU0.237a0.core.gz
+IOSXR_DIR_ENTRY = re.compile(r'^\s*\d+ +\S+ +\d+ +(?P<size>\d+) '
+                             r'+(?P<timestamp>\S+ +\d+ +\S+) +(?P<name>.+)$')
+
+# 12089255    -rwx  23596201    Tue Oct 31 05:16:50 2017  ospf_14495.by.6.20171026-060000.xr-vm_node0_RP0_CPU0.328f3.core.gz
+IOSXR_DIR_ENTRY_YEAR = re.compile(r'^\s*\d+ +\S+ +(?P<size>\d+) '
+                                  r'+(?P<timestamp>\S+ +\S+ +\d+ +\S+ +\d+) '
+                                  r'+(?P<name>.+)$')
+
+# VDC  Module  Instance  Process-name     PID       Date(Year-Month-Day Time)
+# ---  ------  --------  ---------------  --------  -------------------------
+# 1    5       1         bgp-65000        1233      2018-01-02 03:04:05
+NXOS_CORE_ENTRY = re.compile(r'^\s*(?P<vdc>\d+) +(?P<module>\d+) '
+                             r'+(?P<instance>\d+) +(?P<name>\S+) '
+                             r'+(?P<pid>\d+) '
+                             r'+(?P<timestamp>\d+-\d+-\d+ +\d+:\d+:\d+)\s*$')
+
+DIR_ENTRIES = {
+    'iosxe': (IOSXE_DIR_ENTRY, ),
+    'iosxr': (IOSXR_DIR_ENTRY, IOSXR_DIR_ENTRY_YEAR),
+}
+
+# names of core dumps and crashinfo reports
+CORE_NAMES = {
+    'iosxe': re.compile(r'\.core\.gz$|\.core\.flat\.gz$|\.txt$', re.IGNORECASE),
+    'iosxr': re.compile(r'core\.gz$', re.IGNORECASE),
+}
+CRASHINFO_NAMES = {
+    'iosxe': re.compile(r'^crashinfo', re.IGNORECASE),
+}
+
+
+def _match_dir(output, os):
+    # match objects of the 'dir' lines listing a file
+    patterns = DIR_ENTRIES[os]
+
+    for line in output.splitlines():
+        for pattern in patterns:
+            m = pattern.match(line)
+            if m:
+                yield m
+                break
+
+
+def _entry(m, location):
+    return dict(name = m.group('name').strip(),
+                size = m.group('size'),
+                timestamp = ' '.join(m.group('timestamp').split()),
+                location = location)
+
+
+def parse_dir(output, location, os):
+    '''parse_dir
+
+    parses a 'dir' listing into entries.
+
+    Arguments
+    ---------
+        output (str): 'dir' output
+        location (str): listed location
+        os (str): device os
+    '''
+    return [_entry(m, location) for m in _match_dir(output, os)]
+
+
+def parse_cores(output, location, os, crash_name=None):
+    '''parse_cores
+
+    parses a 'dir' listing into core dump and crashinfo report entries.
+
+    Arguments
+    ---------
+        output (str): 'dir' output
+        location (str): listed location
+        os (str): device os
+        crash_name (re): compiled pattern of other crashinfo report names
+
+    Returns
+    -------
+        tuple of the core dump and crashinfo report entries
+    '''
+    core_name = CORE_NAMES[os]
+    crashinfo_name = CRASHINFO_NAMES.get(os)
+
+    cores, crashinfos = [], []
+    for m in _match_dir(output, os):
+        name = m.group('name').strip()
+        if core_name.search(name):
+            cores.append(_entry(m, location))
+        elif crashinfo_name and crashinfo_name.search(name):
+            crashinfos.append(_entry(m, location))
+        elif crash_name and crash_name.match(name):
+            crashinfos.append(_entry(m, location))
+
+    return cores, crashinfos
+
+
+def parse_show_cores(output):
+    '''parse_show_cores
+
+    parses a 'show cores' listing (nxos) into entries, along with the module,
+    instance and pid of each core dump.
+    '''
+    entries = []
+    for line in output.splitlines():
+        m = NXOS_CORE_ENTRY.match(line)
+        if not m:
+            continue
+
+        entry = m.groupdict()
+        entry['timestamp'] = ' '.join(entry['timestamp'].split())
+        entry['size'] = None
+        entry['location'] = 'core://{}/{}'.format(entry['module'],
+                                                  entry['pid'])
+        entries.append(entry)
+
+    return entries
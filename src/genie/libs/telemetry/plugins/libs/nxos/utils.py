@@ -5,78 +5,105 @@ import logging
 from datetime import datetime
 
 # GenieMonitor
+from genie.telemetry.facts import get_facts
 from genie.telemetry.status import OK, WARNING, ERRORED, PARTIAL, CRITICAL
 
-# Parsergen
-from genie.parsergen import oper_fill_tabular
-
 # abstract
 from genie.abstract import Lookup
 
-# Import FileUtils core utilities
-from pyats.utils.fileutils import FileUtils
-
 # Unicon
 from unicon.eal.dialogs import Statement, Dialog
 
+# Device-side output filtering
+from genie.libs.telemetry.plugins.libs.filters import execute_filtered, \
+                                                    filter_command
+
+# Batched execution
+from genie.libs.telemetry.plugins.libs.batch import execute_batch
+
+# Uploads
+from genie.libs.telemetry.plugins.libs.upload import upload_files
+
+# Listing parser
+from genie.libs.telemetry.plugins.libs.listing import parse_show_cores
+
 # module logger
 logger = logging.getLogger(__name__)
 
 
+def output_filter(keywords):
+    return '| egrep "{}"'.format('|'.join(keywords))
+
+
 def check_cores(device, core_list, **kwargs):
 
     # Init
     status = OK
+    known = kwargs.get('known')
 
-    # Check if device is VDC
-    try:
-        output = device.parse('show vdc current-vdc')
-    except Exception as e:
-        logger.warning(e)
-        meta_info = "Unable to execute 'show vdc current-vdc' to check if device is VDC"
-        logger.error(meta_info)
-        status = ERRORED(meta_info)
-        return status
+    # VDC id doesn't change during the session, only learn it once
+    facts = get_facts(device)
+    vdc_id = facts.get('vdc_id')
+    if vdc_id is None:
+        # Check if device is VDC
+        try:
+            output = device.parse('show vdc current-vdc')
+        except Exception as e:
+            logger.warning(e)
+            meta_info = "Unable to execute 'show vdc current-vdc' to check if device is VDC"
+            logger.error(meta_info)
+            status = ERRORED(meta_info)
+            return status
+
+        vdc_id = output.get('current_vdc', {}).get('id', '1')
+        facts.set('vdc_id', vdc_id)
 
     # Check if device is VDC
-    if 'current_vdc' in output and output['current_vdc']['id'] != '1':
+    if vdc_id != '1':
         cmd = 'show cores'
     else:
         cmd = 'show cores vdc-all'
 
     # Execute command to check for cores
-    header = [ "VDC", "Module", "Instance",
-                "Process\-name", "PID", "Date\(Year\-Month\-Day Time\)" ]
-    output = oper_fill_tabular(device = device, 
-                               show_command = cmd,
-                               header_fields = header, index = [5])
+    output = device.execute(cmd)
+    entries = parse_show_cores(output)
 
-    if not output.entries:
+    if not entries:
         meta_info = "No cores found!"
         logger.info(meta_info)
         return OK(meta_info)
     
+    # cores already reported on previous executions
+    known_cores = 0
+
     # Parse through output to collect core information (if any)
-    for k in sorted(output.entries.keys(), reverse=True):
-        row = output.entries[k]
-        date = row.get("Date\\(Year\\-Month\\-Day Time\\)", None)
-        if not date:
-            continue
+    for entry in sorted(entries, key=lambda e: e['timestamp'], reverse=True):
+        date = entry['timestamp']
         date_ = datetime.strptime(date, '%Y-%m-%d %H:%M:%S')
 
         # Save core info
-        core_info = dict(module = row['Module'],
-                         pid = row['PID'],
-                         instance = row['Instance'],
-                         process = row['Process\\-name'],
+        core_info = dict(module = entry['module'],
+                         pid = entry['pid'],
+                         instance = entry['instance'],
+                         process = entry['name'],
                          date = date.replace(" ", "_"))
+        if known and known.is_known(core_info):
+            logger.debug("Core dump already reported: {}".format(core_info))
+            known_cores += 1
+            continue
         core_list.append(core_info)
 
         meta_info = "Core dump generated for process '{}' at {}".\
-            format(row['Process\\-name'], date_)
+            format(entry['name'], date_)
         logger.error(meta_info)
         status += CRITICAL(meta_info)
 
+    if not core_list and known_cores:
+        meta_info = "No new cores found! ({} already reported)".format(
+                                                                known_cores)
+        logger.info(meta_info)
+        status += OK(meta_info)
+
     return status
 
 
@@ -85,6 +112,13 @@ def upload_to_server(device, core_list, *args, **kwargs):
     # Init
     status= OK
 
+    # Delete the files once uploaded (if user specified)
+    clean_up = kwargs.pop('clean_up', False)
+
+    # Artifacts known once uploaded (if tracked), as reported
+    known = kwargs.pop('known', None)
+    artifacts = [dict(core) for core in core_list]
+
     # Get info
     port = kwargs['port']
     server = kwargs['server']
@@ -104,6 +138,7 @@ def upload_to_server(device, core_list, *args, **kwargs):
             return ERRORED(meta_info)
 
     # Upload each core found
+    uploads = []
     for core in core_list:
         # Sample command:
         # copy core://<module-number>/<process-id>[/instance-num]
@@ -127,37 +162,22 @@ def upload_to_server(device, core_list, *args, **kwargs):
         # construction the module/pid for the copy process
         core['core'] = '{module}/{pid}'.format(module = core['module'],
                                                pid = core['pid'])
-        try:
-            # Check if filetransfer has been added to device before or not
-            if not hasattr(device, 'filetransfer'):
-                device.filetransfer = FileUtils.from_device(device)
 
-            to_URL = '{protocol}://{address}/{path}'.format(
-                protocol=protocol,
-                address=server,
-                path=path)
+        to_URL = '{protocol}://{address}/{path}'.format(
+            protocol=protocol,
+            address=server,
+            path=path)
 
-            from_URL = 'core://{core_path}'.format(core_path=core['core'])
+        from_URL = 'core://{core_path}'.format(core_path=core['core'])
 
-            device.filetransfer.copyfile(device=device,
-                                         source=from_URL,
-                                         destination=to_URL)
-        except Exception as e:
-            if 'Tftp operation failed' in str(e):
-                meta_info = "Core dump upload operation failed: {}".format(
-                    message)
-                logger.error(meta_info)
-                status += ERRORED(meta_info)
-            else:
-                # Handle exception
-                logger.error(e)
-                status += ERRORED("Failed: {}".format(message))
-        else:
-            meta_info = "Core dump upload operation passed: {}".format(message)
-            logger.info(meta_info)
-            status += OK(meta_info)
+        uploads.append(dict(source=from_URL,
+                            destination=to_URL,
+                            message=message))
 
-    return status
+    return upload_files(device, uploads, timeout,
+                        callback=clear_cores if clean_up else None,
+                        args=(core_list, []),
+                        known=known, artifacts=artifacts)
 
 
 def clear_cores(device, core_list, crashreport_list, **kwargs):
@@ -177,10 +197,11 @@ def clear_cores(device, core_list, crashreport_list, **kwargs):
 
     return status
 
-def check_tracebacks(device, timeout, **kwargs):
+def check_tracebacks(device, timeout, keywords=None, **kwargs):
 
     # Execute command to check for tracebacks
-    output = device.execute('show logging logfile', timeout=timeout)
+    output, _ = execute_filtered(device, 'show logging logfile', keywords,
+                                 output_filter, timeout)
 
     return output
 
@@ -190,3 +211,22 @@ def clear_tracebacks(device, timeout, **kwargs):
     output = device.execute('clear logging logfile', timeout=timeout)
 
     return output
+
+def check_and_clear_tracebacks(device, timeout, keywords=None, **kwargs):
+
+    # Check and clear tracebacks within a single dispatch. A filter the device
+    # may still reject is checked first: its unfiltered fallback has to run
+    # before the logs are cleared
+    show = filter_command(device, 'show logging logfile', keywords, output_filter)
+    if show != 'show logging logfile' and \
+       not get_facts(device).is_supported(show):
+        output = check_tracebacks(device, timeout, keywords=keywords)
+        outputs = execute_batch(device, ['clear logging logfile'], timeout=timeout)
+    else:
+        outputs = execute_batch(device, [show, 'clear logging logfile'], timeout=timeout)
+        if isinstance(outputs.errors.get(show), Exception):
+            raise outputs.errors[show]
+        output = outputs[show]
+
+    # error of the clear command, if any
+    return output, outputs.errors.get('clear logging logfile')
@@ -0,0 +1,98 @@
+'''
+Core dump and crashinfo report uploads
+
+Hands uploads over to the transfer queue of the telemetry manager when
+available, so the device plugins aren't blocked for the duration of the
+transfers, or carries them out in place otherwise.
+'''
+
+# Python
+import logging
+
+# Import FileUtils core utilities
+from pyats.utils.fileutils import FileUtils
+
+# GenieTelemetry
+from genie.telemetry.status import OK, ERRORED
+from genie.telemetry.transfer import get_transfer_queue
+
+# module logger
+logger = logging.getLogger(__name__)
+
+
+def upload_files(device, uploads, timeout, callback=None, args=(), known=None,
+                 artifacts=()):
+    '''upload_files
+
+    uploads files from the device to a file server.
+
+    Arguments
+    ---------
+        device (Device): device to upload the files from
+        uploads (list): dicts of 'source' and 'destination' urls, the
+                        'message' describing the upload and optionally the
+                        'size' of the file and its 'target' url on the server
+                        (defaults to the destination)
+        timeout (int): timeout of each upload
+        callback (function): module-level function called with the device and
+                             args once all files were uploaded (eg: to delete
+                             them from the device)
+        args (tuple): callback arguments
+        known (KnownArtifacts): index the artifacts are added to once all
+                                files were uploaded
+        artifacts (list): artifacts the files were uploaded from
+    '''
+    # artifacts only known once uploaded, uploaded again otherwise
+    if known is not None:
+        callback, args = remember_uploaded, (known, list(artifacts),
+                                             callback, args)
+
+    queue = get_transfer_queue(device)
+    if queue:
+        return queue.submit(device, uploads, timeout=timeout,
+                            callback=callback, args=args)
+
+    # Init
+    status = OK
+
+    for upload in uploads:
+        message = upload['message']
+        try:
+            # Check if filetransfer has been added to device before or not
+            if not hasattr(device, 'filetransfer'):
+                device.filetransfer = FileUtils.from_device(device)
+
+            device.filetransfer.copyfile(device=device,
+                                         source=upload['source'],
+                                         destination=upload['destination'],
+                                         timeout_seconds=timeout)
+        except Exception as e:
+            if 'Tftp operation failed' in str(e):
+                meta_info = "Upload operation failed: {}".format(message)
+                logger.error(meta_info)
+                status += ERRORED(meta_info)
+            else:
+                # Handle exception
+                logger.warning(e)
+                status += ERRORED("Failed: {}".format(message))
+        else:
+            meta_info = "Upload operation passed: {}".format(message)
+            logger.info(meta_info)
+            status += OK(meta_info)
+
+    if callback and status == OK:
+        status += callback(device, *args)
+
+    return status
+
+
+def remember_uploaded(device, known, artifacts, callback=None, args=()):
+    '''remember_uploaded
+
+    upload callback adding the uploaded artifacts to the known artifacts
+    index, then calling the callback of the upload (if any).
+    '''
+    known.update(artifacts)
+    if callback:
+        return callback(device, *args)
+    return OK()
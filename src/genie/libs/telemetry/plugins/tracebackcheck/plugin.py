@@ -17,6 +17,7 @@ from pyats.datastructures import classproperty
 # GenieTelemetry
 from genie.telemetry.plugin import BasePlugin
 from genie.telemetry.status import OK, WARNING, ERRORED, PARTIAL, CRITICAL
+from genie.telemetry.utils import str_to_bool
 from genie.libs.telemetry.plugins import libs
 
 # Abstract
@@ -69,6 +70,17 @@ class Plugin(BasePlugin):
                             default=300,
                             help='Specify duration (in seconds) to wait before '
                                  'timing out execution of a command')
+
+        # tracebackcheck_device_filter
+        # ----------------------------
+        parser.add_argument('--tracebackcheck_device_filter',
+                            action="store",
+                            type=str_to_bool,
+                            default=False,
+                            help="Filter the logging output on the device "
+                                 "when the keywords can be expressed as an "
+                                 "output modifier ('| include ...').\n"
+                                 "Default: False")
         return parser
 
     def parse_args(self, argv):
@@ -99,18 +111,14 @@ class Plugin(BasePlugin):
 
         lookup = Lookup.from_device(device)
 
-        # Execute command to check for tracebacks - timeout set to 5 mins
-        output = lookup.libs.utils.check_tracebacks(device,
-            timeout=self.args.tracebackcheck_timeout)
-        if not output:
-            message = "No output found for '{cmd}'".format(cmd=self.show_cmd)
-            status += OK(message)
-            logger.info(message)
-            return status
+        # keywords to filter the logging output with on the device, only
+        # available when matching against a plain list of keywords
+        keywords = None
 
         # Set match pattern to search 'show logging logfile'
         if not self.args.tracebackcheck_logic_pattern:
             match_patterns = logic_str("And('Traceback')")
+            keywords = ['Traceback']
         else:
             # Check if its a pattern or a string
             if 'And' in self.args.tracebackcheck_logic_pattern or\
@@ -123,16 +131,43 @@ class Plugin(BasePlugin):
                     match_patterns = logic_str(self.args.tracebackcheck_logic_pattern)
             else:
                 logic_string = ""
+                keywords = []
                 # Check if user wants to disable 'Traceback' check
                 if not self.args.tracebackcheck_disable_traceback:
                     logic_string = "\'Traceback\', "
+                    keywords.append('Traceback')
                 # Add patterns to create a logic string
                 for item in self.args.tracebackcheck_logic_pattern.split(', '):
                     logic_string += "\'{}\', ".format(item.strip())
+                    keywords.append(item.strip())
                 # Create logic pattern to match in 'show logging logfile' output
                 match_patterns = logic_str("Or({})".\
                                             format(logic_string.rstrip(", ")))
 
+        device_filter = self.args.tracebackcheck_device_filter
+        keywords = keywords if device_filter else None
+        clean_up = self.args.tracebackcheck_clean_up
+
+        # Execute command to check for tracebacks - timeout set to 5 mins,
+        # clearing logging within the same dispatch (if user specified)
+        if clean_up:
+            output, clear_error = lookup.libs.utils.check_and_clear_tracebacks(
+                device, timeout=self.args.tracebackcheck_timeout,
+                keywords=keywords)
+            status += self._clear_status(clear_error)
+        else:
+            output = lookup.libs.utils.check_tracebacks(device,
+                timeout=self.args.tracebackcheck_timeout, keywords=keywords)
+
+        # no output is also expected when filtering on the device and nothing
+        # matched
+        output = output or ''
+        if not output:
+            message = "No output found for '{cmd}'".format(cmd=self.show_cmd)
+            status += OK(message)
+            logger.info(message)
+            return status
+
         # Parse 'show logging logfile' output for keywords
         matched_lines_dict['matched_lines'] = []
         logger.info('Patterns to search for: {}'.format(match_patterns))
@@ -151,20 +186,19 @@ class Plugin(BasePlugin):
             status += OK(message)
             logger.info(message)
 
-        # Clear logging (if user specified)
-        if self.args.tracebackcheck_clean_up:
-            try:
-                output = lookup.libs.utils.clear_tracebacks(device,
-                    timeout=self.args.tracebackcheck_timeout)
-                message = "Successfully cleared logging"
-                status += OK()
-                logger.info(message)
-            except Exception as e:
-                # Handle exception
-                logger.warning(e)
-                message = "Clear logging execution failed"
-                logger.error(message)
-                status += ERRORED()
-
         # Final status
         return status
+
+    def _clear_status(self, error):
+        '''_clear_status
+
+        status of clearing logging, given the error of the clear command
+        '''
+        if error is None:
+            logger.info("Successfully cleared logging")
+            return OK()
+
+        # Handle error
+        logger.warning(error)
+        logger.error("Clear logging execution failed")
+        return ERRORED()
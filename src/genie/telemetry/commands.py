@@ -0,0 +1,196 @@
+'''Genie Telemetry Commands
+
+'telemetry' command of the genie/pyats command line, to look into the results
+of genie telemetry runs.
+
+Examples
+--------
+    # devices which went critical on the traceback check between 02:00 and 03:00
+    $ genie telemetry query /path/to/runinfo --plugin "Traceback Check Plugin"
+            --status critical --start 2018-03-01T02:00 --end 2018-03-01T03:00
+
+    # current status of each plugin on each device of a running monitoring
+    $ genie telemetry status /path/to/runinfo
+'''
+
+import sys
+import json
+import logging
+from datetime import datetime
+
+from pyats.cli.base import CommandWithSubcommands, Subcommand
+
+from genie.telemetry.utils import ordered_yaml_dump
+from genie.telemetry.results.store import query_results
+from genie.telemetry.results.board import read_board
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+# module logger
+logger = logging.getLogger(__name__)
+
+
+class QuerySubcommand(Subcommand):
+    '''QuerySubcommand
+
+    queries the results store of a run (see the 'store' setting of the
+    'results' configuration section).
+    '''
+
+    name = 'query'
+    help = 'query the results store of a genie telemetry run'
+    usage = '{prog} [runinfo] [options]'
+    description = '''
+Queries the results store (telemetry.db) of a genie telemetry run, by device,
+plugin, status and time. Dates and times are in ISO 8601 format, UTC unless
+specified (eg: 2018-03-01T02:00, 2018-03-01T02:00:00-07:00).
+'''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.parser.add_argument('runinfo',
+                                 metavar = '[runinfo]',
+                                 help = 'runinfo directory of the run, or '
+                                        'results store file')
+        self.parser.add_argument('--device', help = 'device name')
+        self.parser.add_argument('--plugin', help = 'plugin name, as reported')
+        self.parser.add_argument('--status',
+                                 help = 'ok, warning, critical, errored or '
+                                        'partial')
+        self.parser.add_argument('--tag', help = 'section or tick')
+        self.parser.add_argument('--start', help = 'from date and time')
+        self.parser.add_argument('--end', help = 'to date and time')
+        self.parser.add_argument('--limit', type = int,
+                                 help = 'maximum number of results')
+        self.parser.add_argument('--format',
+                                 choices = ('table', 'yaml', 'json'),
+                                 default = 'table',
+                                 help = 'output format (default: table)')
+
+    def run(self, args):
+        try:
+            rows = query_results(args.runinfo,
+                                 device = args.device,
+                                 plugin = args.plugin,
+                                 status = args.status,
+                                 start = args.start,
+                                 end = args.end,
+                                 tag = args.tag,
+                                 limit = args.limit)
+        except (OSError, ValueError) as e:
+            logger.error(e)
+            return 1
+
+        for row in rows:
+            row['timestamp'] = datetime.utcfromtimestamp(
+                    row['timestamp']).strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+
+        if args.format == 'json':
+            json.dump(rows, sys.stdout, indent = 2)
+            sys.stdout.write('\n')
+        elif args.format == 'yaml':
+            ordered_yaml_dump(rows, stream = sys.stdout,
+                              default_flow_style = False)
+        else:
+            print(format_table(rows))
+
+
+def format_table(rows, columns = ('timestamp', 'device', 'plugin', 'status',
+                                  'tag', 'message'), summary = 'result(s)'):
+    '''format_table
+
+    formats the results as a table, with the first line of their message.
+    '''
+    lines = [[str(row[c]).strip().splitlines()[0] if str(row[c]).strip()
+              else '' for c in columns] for row in rows]
+
+    widths = [max([len(c)] + [len(line[i]) for line in lines])
+              for i, c in enumerate(columns)]
+
+    output = ['  '.join(c.capitalize().ljust(w)
+                        for c, w in zip(columns, widths)).rstrip(),
+              '  '.join('-' * w for w in widths)]
+    for line in lines:
+        output.append('  '.join(v.ljust(w)
+                                for v, w in zip(line, widths)).rstrip())
+
+    output.append('{} {}'.format(len(rows), summary))
+    return '\n'.join(output)
+
+
+class StatusSubcommand(Subcommand):
+    '''StatusSubcommand
+
+    renders the status board of a run (see the 'status_board' setting of the
+    'results' configuration section).
+    '''
+
+    name = 'status'
+    help = 'show the current status of a genie telemetry run'
+    usage = '{prog} [runinfo] [options]'
+    description = '''
+Shows the current status of each plugin on each device of a genie telemetry
+run, from its status board (telemetry.board), while the run is in progress or
+once it is over. Times are UTC.
+'''
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.parser.add_argument('runinfo',
+                                 metavar = '[runinfo]',
+                                 help = 'runinfo directory of the run, or '
+                                        'status board file')
+        self.parser.add_argument('--device', help = 'device name')
+        self.parser.add_argument('--format',
+                                 choices = ('table', 'yaml', 'json'),
+                                 default = 'table',
+                                 help = 'output format (default: table)')
+
+    def run(self, args):
+        try:
+            rows = read_board(args.runinfo)
+        except (OSError, ValueError) as e:
+            logger.error(e)
+            return 1
+
+        rows = [row for row in rows
+                if args.device is None or row['device'] == args.device]
+        for row in rows:
+            for column in ('since', 'updated'):
+                if row[column] is not None:
+                    row[column] = datetime.utcfromtimestamp(
+                            row[column]).strftime('%Y-%m-%dT%H:%M:%SZ')
+            if row['duration'] is not None:
+                row['duration'] = round(row['duration'], 3)
+
+        if args.format == 'json':
+            json.dump(rows, sys.stdout, indent = 2)
+            sys.stdout.write('\n')
+        elif args.format == 'yaml':
+            ordered_yaml_dump(rows, stream = sys.stdout,
+                              default_flow_style = False)
+        else:
+            for row in rows:
+                for column, value in row.items():
+                    if value is None:
+                        row[column] = '-'
+            print(format_table(rows,
+                               columns = ('device', 'plugin', 'status',
+                                          'since', 'updated', 'duration'),
+                               summary = 'plugin(s)'))
+
+
+class TelemetryCommand(CommandWithSubcommands):
+    '''TelemetryCommand
+
+    genie telemetry command, with its subcommands.
+    '''
+
+    name = 'telemetry'
+    help = 'look into the results of genie telemetry runs'
+
+    SUBCOMMANDS = [QuerySubcommand, StatusSubcommand, ]
+    SUBCMDS_ENTRYPOINT = ''
@@ -0,0 +1,27 @@
+'''Connection Profiles
+
+Pre-defined sets of connection arguments applied to the device connections
+established (and re-established) by genie telemetry managers.
+'''
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+# default profile, connection arguments from the testbed yaml file are used as
+# they are.
+#
+# lean profile, telemetry plugins only execute show commands: configuration
+# init commands are skipped, hostname is not learned and the session log is
+# buffered in memory (only dumped when the connection runs into failures)
+# instead of being written to a log file per session.
+CONNECTION_PROFILES = {
+    'default': {},
+    'lean': {
+        'init_config_commands': [],
+        'learn_hostname': False,
+        'log_buffer': True,
+        'log_stdout': False,
+    },
+}
+
+DEFAULT_PROFILE = 'default'
@@ -0,0 +1,13 @@
+'''Exporter Settings
+
+Defaults of the metrics exporter, see genie.telemetry.exporter.
+'''
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+EXPORTER_DEFAULTS = {
+    'textfile': False,      # write telemetry.prom into the runinfo directory
+    'port': None,           # port of the HTTP endpoint, not served when None
+    'address': '127.0.0.1', # address of the HTTP endpoint
+}
@@ -0,0 +1,17 @@
+'''Liveview Settings
+
+Defaults of the batching of the messages published to liveview, see
+genie.telemetry.liveview.
+'''
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+LIVEVIEW_DEFAULTS = {
+    'batch_interval': 0.5,  # seconds between batches of messages
+    'batch_size': 100,      # messages forwarded per batch, at most
+    'max_pending': 10000,   # messages queued, oldest dropped past this
+    'coalesce': False,      # consecutive console lines coalesced into one
+    'deltas': False,        # results published as deltas, once per tick
+    'snapshot_interval': 10, # ticks between snapshots of all the statuses
+}
@@ -0,0 +1,16 @@
+'''Logging Settings
+
+Defaults of the logging pipeline, see genie.telemetry.logs.
+'''
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+LOGS_DEFAULTS = {
+    'queue': False,         # write the records from a thread of the manager
+    'device_logs': False,   # write the records of each device into its file
+    'max_bytes': 10 * 1024 * 1024, # size the device log files are rotated at
+    'backup_count': 5,      # rotated device log files kept
+    'compress': True,       # gzip the rotated device log files
+    'batch_size': 100,      # records written before the handlers are flushed
+}
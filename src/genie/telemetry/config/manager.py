@@ -1,4 +1,5 @@
 import logging
+from copy import deepcopy
 from io import TextIOBase
 
 # argparse
@@ -8,6 +9,14 @@ from pyats.datastructures import AttrDict, classproperty
 
 from .loader import ConfigLoader
 from .plugins import PluginManager
+from .connections import CONNECTION_PROFILES, DEFAULT_PROFILE
+from .transfers import TRANSFER_DEFAULTS
+from .metrics import METRIC_DEFAULTS
+from .results import RESULTS_DEFAULTS
+from .logs import LOGS_DEFAULTS
+from .liveview import LIVEVIEW_DEFAULTS
+from .exporter import EXPORTER_DEFAULTS
+from .tracing import TRACING_DEFAULTS
 
 # declare module as infra
 __genietelemetry_infra__ = True
@@ -27,6 +36,13 @@ class Configuration(object):
     def __init__(self, plugins = None):
         self._plugins = AttrDict()
         self.connections = AttrDict()
+        self.transfers = AttrDict(TRANSFER_DEFAULTS)
+        self.metrics = AttrDict(deepcopy(METRIC_DEFAULTS))
+        self.results = AttrDict(RESULTS_DEFAULTS)
+        self.logs = AttrDict(LOGS_DEFAULTS)
+        self.liveview = AttrDict(LIVEVIEW_DEFAULTS)
+        self.exporter = AttrDict(EXPORTER_DEFAULTS)
+        self.tracing = AttrDict(TRACING_DEFAULTS)
         self._loader = ConfigLoader()
         self.plugins = (plugins or PluginManager)()
 
@@ -55,6 +71,31 @@ class Configuration(object):
     def update(self, config):
         recursive_update(self._plugins, config.get('plugins', {}))
         recursive_update(self.connections, config.get('connections', {}))
+        recursive_update(self.transfers, config.get('transfers', {}))
+        # tiers are replaced, not merged
+        self.metrics.update(config.get('metrics', {}))
+        recursive_update(self.results, config.get('results', {}))
+        recursive_update(self.logs, config.get('logs', {}))
+        recursive_update(self.liveview, config.get('liveview', {}))
+        recursive_update(self.exporter, config.get('exporter', {}))
+        recursive_update(self.tracing, config.get('tracing', {}))
+
+    def get_connection(self, name):
+        '''get_connection
+
+        returns the connection arguments of the given device, built from the
+        selected connection profile, the connection defaults and the device
+        specific connection settings (in that order of precedence).
+        '''
+        connection = dict(self.connections.get('defaults', {}))
+        connection.update(self.connections.get(name, {}))
+
+        profile = connection.pop('profile', DEFAULT_PROFILE)
+
+        arguments = deepcopy(CONNECTION_PROFILES[profile])
+        arguments.update(connection)
+
+        return arguments
 
     @classproperty
     def parser(cls):
@@ -0,0 +1,17 @@
+'''Metric Settings
+
+Defaults of the storage of the numeric samples emitted by the plugins, see
+genie.telemetry.metrics.
+'''
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+METRIC_DEFAULTS = {
+    'enabled': False,       # keep the samples emitted by the plugins
+    'samples': 360,         # raw samples kept per device metric
+    'tiers': [              # downsampling tiers: [resolution (s), periods]
+        [60, 1440],         # one minute periods over a day
+        [3600, 720],        # one hour periods over 30 days
+    ],
+}
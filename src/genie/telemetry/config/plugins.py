@@ -5,6 +5,7 @@ from operator import attrgetter
 from genie.abstract.magic import Lookup
 
 from genie.telemetry.utils import get_plugin_name
+from genie.telemetry.status.rollup import StatusRollup
 
 # declare module as infra
 __genietelemetry_infra__ = True
@@ -29,6 +30,12 @@ class PluginManager(object):
         # dictionary of plugin-device abstraction cache pair
         self._cache = dict()
 
+        # plugin names, by plugin label
+        self._labels = dict()
+
+        # plugin statuses rolled up by device, and overall
+        self.rollup = StatusRollup()
+
     def has_device_plugins(self, device):
         '''has_device_plugins
 
@@ -55,10 +62,7 @@ class PluginManager(object):
 
         set specific plugin status of given device
         '''
-        for plugin_name, plugin_cache in self._plugins.items():
-            # plugin name doesn't match, skip
-            if plugin != plugin_cache.get('plugin_label'):
-                continue
+        for plugin_name in self._labels.get(plugin, ()):
             # the device isn't cached for the plugin, skip
             device_cache = self._cache.get(plugin_name, {}).get(device, {})
             if not device_cache:
@@ -66,6 +70,7 @@ class PluginManager(object):
             status_label = str(status).upper()
             self._cache[plugin_name][device]['status'] = status
             self._cache[plugin_name][device]['status_label'] = status_label
+            self.rollup.update(device, plugin, status)
 
     def get_device_plugins_status(self, device, label=False):
         '''get_device_plugins_status
@@ -98,6 +103,7 @@ class PluginManager(object):
         initializing plugins for device
         '''
         logger.info('Initializing plugins for %s' % device_name)
+        self.rollup.add_device(device_name)
 
         for plugin_name, plugin_cache in self._plugins.items():
 
@@ -127,6 +133,9 @@ class PluginManager(object):
             self._cache[plugin_name][device_name]['args'] = plugin.args
 
             plugin_cache.setdefault('plugin_label', get_plugin_name(plugin))
+            labels = self._labels.setdefault(plugin_cache['plugin_label'], [])
+            if plugin_name not in labels:
+                labels.append(plugin_name)
 
     def get_plugin_classes(self):
 
@@ -180,6 +189,9 @@ class PluginManager(object):
             try:
                 plugin_module = Lookup.from_device(device,
                                                    packages={ name: module })
+                # resolved lazily by recent genie.abstract releases, raises
+                # here for modules which aren't abstraction packages
+                getattr(plugin_module, name)
             except Exception:
                 logger.error('failed to load abstration on device {} for plugin'
                              ' {}'.format(device_name, name))
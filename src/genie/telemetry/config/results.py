@@ -0,0 +1,30 @@
+'''Results Settings
+
+Defaults of the retention of the plugin results kept in memory by the
+manager, see genie.telemetry.results.
+'''
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+# results recording modes
+RECORD_MODES = ('all', 'transitions')
+
+# per-tick summary logging modes
+SUMMARY_MODES = ('full', 'changes', 'none')
+
+RESULTS_DEFAULTS = {
+    'retain_ticks': None,   # ticks kept in memory, all when None
+    'retain_minutes': None, # minutes of ticks kept in memory, all when None
+    'spill': True,          # spill older ticks to disk, dropped otherwise
+    'journal': False,       # journal the results as they come back
+    'fsync_interval': 5,    # seconds between syncs of the journal to disk
+    'journal_max_bytes': 64 * 1024 * 1024, # size of the journal segments
+    'store': False,         # insert the results into a sqlite store
+    'store_batch': 500,     # rows inserted per transaction
+    'record': 'all',        # record all results, or transitions only
+    'report_json': False,   # write the final report as JSON as well
+    'wire_spill': 65536,    # result meta spilled by the workers past this size
+    'status_board': False,  # keep the status board file in the runinfo dir
+    'summary': 'full',      # log all results, status changes only, or none
+}
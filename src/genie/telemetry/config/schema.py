@@ -16,6 +16,9 @@ from pyats.utils.schemaengine import (
 from pyats.utils.exceptions import SchemaError
 from pyats.utils.import_utils import import_from_name, translate_host
 
+from .connections import CONNECTION_PROFILES
+from .results import RECORD_MODES, SUMMARY_MODES
+
 # declare module as infra
 __genietelemetry_infra__ = True
 
@@ -32,6 +35,75 @@ def str_or_list(value):
     return value
 
 
+def validate_profile(value):
+    '''validate_profile
+
+    checks that the connection profile is one of the supported profiles.
+    '''
+
+    if value not in CONNECTION_PROFILES:
+        raise SchemaError("Invalid connection profile '%s', supported "
+                          "profiles are: %s" % (value,
+                                                ', '.join(CONNECTION_PROFILES)))
+    return value
+
+
+def validate_tiers(value):
+    '''validate_tiers
+
+    checks that the metric downsampling tiers are [resolution, periods] pairs
+    of positive integers.
+    '''
+
+    try:
+        tiers = [[int(resolution), int(periods)]
+                 for resolution, periods in value]
+        assert all(resolution > 0 and periods > 0
+                   for resolution, periods in tiers)
+    except Exception as e:
+        raise SchemaError("Invalid metric tiers '%s', expected a list of "
+                          "[resolution, periods]" % (value, )) from e
+    return tiers
+
+
+def positive_or_none(value):
+    '''positive_or_none
+
+    checks that the value is a positive number, or None (unlimited).
+    '''
+
+    if value is not None and (isinstance(value, bool) or
+                              not isinstance(value, (int, float)) or
+                              value <= 0):
+        raise SchemaError("Invalid value '%s', expected a positive number"
+                          % (value, ))
+    return value
+
+
+def validate_record(value):
+    '''validate_record
+
+    checks that the results recording mode is one of the supported modes.
+    '''
+
+    if value not in RECORD_MODES:
+        raise SchemaError("Invalid results recording mode '%s', supported "
+                          "modes are: %s" % (value, ', '.join(RECORD_MODES)))
+    return value
+
+
+def validate_summary(value):
+    '''validate_summary
+
+    checks that the summary logging mode is one of the supported modes.
+    '''
+
+    if value not in SUMMARY_MODES:
+        raise SchemaError("Invalid summary logging mode '%s', supported "
+                          "modes are: %s" % (value, ', '.join(SUMMARY_MODES)))
+    return value
+
+
 def validate_plugins(data):
     try:
         assert type(data) is dict
@@ -78,11 +150,70 @@ def validate_plugins(data):
 config_schema = {
     Optional("plugins"): Use(validate_plugins),
     Optional('connections'): {
+        Optional('defaults'): {
+            Optional('profile'): Use(validate_profile),
+        },
         Any(): {
             Optional('via'): str,
             Optional('alias'): str,
+            Optional('profile'): Use(validate_profile),
         },
     },
+    Optional('transfers'): {
+        Optional('enabled'): bool,
+        Optional('max_transfers'): int,
+        Optional('max_per_server'): int,
+        Optional('retries'): int,
+        Optional('backoff'): Or(int, float),
+        Optional('alias'): str,
+        Optional('via'): str,
+    },
+    Optional('metrics'): {
+        Optional('enabled'): bool,
+        Optional('samples'): int,
+        Optional('tiers'): Use(validate_tiers),
+    },
+    Optional('results'): {
+        Optional('retain_ticks'): Use(positive_or_none),
+        Optional('retain_minutes'): Use(positive_or_none),
+        Optional('spill'): bool,
+        Optional('journal'): bool,
+        Optional('fsync_interval'): Or(int, float),
+        Optional('journal_max_bytes'): int,
+        Optional('store'): bool,
+        Optional('store_batch'): int,
+        Optional('wire_spill'): int,
+        Optional('status_board'): bool,
+        Optional('summary'): Use(validate_summary),
+        Optional('record'): Use(validate_record),
+        Optional('report_json'): bool,
+    },
+    Optional('logs'): {
+        Optional('queue'): bool,
+        Optional('device_logs'): bool,
+        Optional('max_bytes'): int,
+        Optional('backup_count'): int,
+        Optional('compress'): bool,
+        Optional('batch_size'): int,
+    },
+    Optional('liveview'): {
+        Optional('batch_interval'): Or(int, float),
+        Optional('batch_size'): int,
+        Optional('max_pending'): int,
+        Optional('coalesce'): bool,
+        Optional('deltas'): bool,
+        Optional('snapshot_interval'): int,
+    },
+    Optional('exporter'): {
+        Optional('textfile'): bool,
+        Optional('port'): Use(positive_or_none),
+        Optional('address'): str,
+    },
+    Optional('tracing'): {
+        Optional('enabled'): bool,
+        Optional('commands'): bool,
+        Optional('buffer_size'): int,
+    },
     Any(): Any(),
 }
 
@@ -0,0 +1,13 @@
+'''Tracing Settings
+
+Defaults of the execution tracing, see genie.telemetry.tracing.
+'''
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+TRACING_DEFAULTS = {
+    'enabled': False,       # write telemetry.trace.json into the runinfo dir
+    'commands': True,       # trace the device commands of the plugins
+    'buffer_size': 1000,    # spans buffered before written to the file
+}
@@ -0,0 +1,18 @@
+'''Transfer Settings
+
+Defaults of the transfer queue uploads (eg: core dumps) are handed over to,
+see genie.telemetry.transfer.
+'''
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+TRANSFER_DEFAULTS = {
+    'enabled': False,       # hand uploads over to the transfer queue
+    'max_transfers': 4,     # concurrent transfers, all servers included
+    'max_per_server': 2,    # concurrent transfers to a single server
+    'retries': 3,           # retries of a failed transfer
+    'backoff': 5,           # seconds before the first retry, then doubled
+    'alias': 'transfer',    # alias of the dedicated device connections
+    'via': None,            # testbed connection of the dedicated connections
+}
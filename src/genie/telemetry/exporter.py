@@ -0,0 +1,351 @@
+'''Metrics Exporter
+
+Exposes the internals of a genie telemetry run in the Prometheus text format,
+into a textfile of the runinfo directory (telemetry.prom, eg: for the node
+exporter textfile collector) and/or over a local HTTP endpoint (/metrics):
+
+    - status of each plugin on each device
+    - plugin execution durations, and task (eg: tick) durations
+    - device connections, reconnections and failed reconnections
+    - scheduler lag of the timed manager
+    - queue depths (transfers, logging, liveview) and worker processes
+
+Figures come from the counters maintained by the managers as they run, see
+TelemetryStats. They are rendered by the manager after each task, and the HTTP
+endpoint serves the latest rendering: the counters are never read by the
+server threads while the manager updates them.
+'''
+
+import os
+import bisect
+import logging
+import threading
+import multiprocessing
+from socketserver import ThreadingMixIn
+from http.server import HTTPServer, BaseHTTPRequestHandler
+
+from genie.telemetry.utils import at_fork_reinit
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+# module logger
+logger = logging.getLogger(__name__)
+
+TEXTFILE = 'telemetry.prom'
+
+# upper bounds of the histogram buckets, in seconds
+DURATION_BUCKETS = (0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+# connection counters, by device
+CONNECTION_COUNTERS = ('connects', 'reconnects', 'reconnect_failures')
+
+
+class Histogram(object):
+    '''Histogram class
+
+    counts of the observed values by bucket (upper bound), sum and count.
+    '''
+
+    def __init__(self, buckets = DURATION_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.counts[index] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        '''yields the (upper bound, cumulative count) of each bucket'''
+        total = 0
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            yield bound, total
+
+
+class TelemetryStats(object):
+    '''TelemetryStats class
+
+    counters maintained by the managers. Connection counters are shared with
+    the worker processes (where devices are reconnected): created before they
+    are forked.
+
+    Arguments
+    ---------
+        devices (list): device names
+    '''
+
+    def __init__(self, devices):
+        self.devices = list(devices)
+        self._device_index = {name: i for i, name in enumerate(self.devices)}
+        self._connections = multiprocessing.Array(
+                        'L', len(self.devices) * len(CONNECTION_COUNTERS))
+
+        # plugin execution durations, by plugin
+        self.durations = {}
+        # plugin results, by plugin and status
+        self.results = {}
+        # task durations, tasks and worker processes started
+        self.tasks = Histogram()
+        self.workers = 0
+        # scheduler lag of the latest tick, and all ticks
+        self.lag = 0.0
+        self.lags = Histogram()
+
+    def connection(self, device, counter):
+        '''connection
+
+        counts a connection event of a device (from any process).
+        '''
+        index = self._device_index.get(device)
+        if index is None:
+            return
+        index = index * len(CONNECTION_COUNTERS) + \
+                CONNECTION_COUNTERS.index(counter)
+        with self._connections.get_lock():
+            self._connections[index] += 1
+
+    def connections(self):
+        '''yields the (device, counter, value) of the connection counters'''
+        values = self._connections[:]
+        for i, device in enumerate(self.devices):
+            for j, counter in enumerate(CONNECTION_COUNTERS):
+                yield device, counter, values[i * len(CONNECTION_COUNTERS) + j]
+
+    def result(self, plugin, status, duration = None):
+        key = (plugin, str(status))
+        self.results[key] = self.results.get(key, 0) + 1
+        if duration is not None:
+            if plugin not in self.durations:
+                self.durations[plugin] = Histogram()
+            self.durations[plugin].observe(duration)
+
+    def task(self, duration, workers):
+        self.tasks.observe(duration)
+        self.workers += workers
+
+    def tick(self, lag):
+        self.lag = max(0.0, lag)
+        self.lags.observe(self.lag)
+
+
+def _labels(**labels):
+    return '{' + ','.join('{}="{}"'.format(k, str(v).replace('\\', '\\\\')
+                                                    .replace('"', '\\"')
+                                                    .replace('\n', '\\n'))
+                          for k, v in sorted(labels.items())) + '}'
+
+def _histogram(lines, name, histogram, **labels):
+    for bound, count in histogram.cumulative():
+        lines.append('{}_bucket{} {}'.format(name,
+                                             _labels(le = bound, **labels),
+                                             count))
+    lines.append('{}_bucket{} {}'.format(name, _labels(le = '+Inf', **labels),
+                                         histogram.count))
+    lines.append('{}_sum{} {}'.format(name, _labels(**labels) if labels
+                                      else '', histogram.sum))
+    lines.append('{}_count{} {}'.format(name, _labels(**labels) if labels
+                                        else '', histogram.count))
+
+def render_metrics(manager):
+    '''render_metrics
+
+    returns the metrics of the manager, in the Prometheus text format.
+    '''
+    stats = manager.stats
+    lines = []
+
+    lines += ['# HELP genietelemetry_plugin_status Status code of the plugin '
+              'on the device (0 ok, 1 warning, 2 critical, 3 errored, '
+              '4 partial)',
+              '# TYPE genietelemetry_plugin_status gauge']
+    for device, plugin in manager.timelines:
+        status = manager.timelines.get(device, plugin).status
+        lines.append('genietelemetry_plugin_status{} {}'.format(
+                        _labels(device = device, plugin = plugin),
+                        int(status)))
+
+    lines += ['# HELP genietelemetry_plugin_results_total Plugin results, '
+              'by status',
+              '# TYPE genietelemetry_plugin_results_total counter']
+    for (plugin, status), count in sorted(stats.results.items()):
+        lines.append('genietelemetry_plugin_results_total{} {}'.format(
+                        _labels(plugin = plugin, status = status), count))
+
+    lines += ['# HELP genietelemetry_plugin_duration_seconds Plugin '
+              'execution durations',
+              '# TYPE genietelemetry_plugin_duration_seconds histogram']
+    for plugin, histogram in sorted(stats.durations.items()):
+        _histogram(lines, 'genietelemetry_plugin_duration_seconds',
+                   histogram, plugin = plugin)
+
+    lines += ['# HELP genietelemetry_task_duration_seconds Task (eg: tick) '
+              'durations, all devices included',
+              '# TYPE genietelemetry_task_duration_seconds histogram']
+    _histogram(lines, 'genietelemetry_task_duration_seconds', stats.tasks)
+
+    lines += ['# HELP genietelemetry_connections_total Device connection '
+              'events',
+              '# TYPE genietelemetry_connections_total counter']
+    for device, counter, value in stats.connections():
+        lines.append('genietelemetry_connections_total{} {}'.format(
+                        _labels(device = device, event = counter), value))
+
+    lines += ['# HELP genietelemetry_scheduler_lag_seconds Delay of the '
+              'latest tick past its schedule',
+              '# TYPE genietelemetry_scheduler_lag_seconds gauge',
+              'genietelemetry_scheduler_lag_seconds {}'.format(stats.lag),
+              '# HELP genietelemetry_scheduler_lags_seconds Delays of the '
+              'ticks past their schedule',
+              '# TYPE genietelemetry_scheduler_lags_seconds histogram']
+    _histogram(lines, 'genietelemetry_scheduler_lags_seconds', stats.lags)
+
+    lines += ['# HELP genietelemetry_workers_started_total Worker processes '
+              'started',
+              '# TYPE genietelemetry_workers_started_total counter',
+              'genietelemetry_workers_started_total {}'.format(stats.workers),
+              '# HELP genietelemetry_workers Running worker processes',
+              '# TYPE genietelemetry_workers gauge',
+              'genietelemetry_workers {}'.format(
+                    sum(1 for living in manager.p.livings if living)
+                    if manager.p else 0)]
+
+    lines += ['# HELP genietelemetry_queue_depth Items waiting in the '
+              'queues of the run',
+              '# TYPE genietelemetry_queue_depth gauge']
+    for queue, depth in sorted(queue_depths(manager).items()):
+        lines.append('genietelemetry_queue_depth{} {}'.format(
+                        _labels(queue = queue), depth))
+
+    return '\n'.join(lines) + '\n'
+
+def queue_depths(manager):
+    '''queue_depths
+
+    returns the items waiting in the queues of the run, by queue.
+    '''
+    depths = {}
+    if manager.transfers:
+        progress = manager.transfers.progress
+        depths['transfers'] = max(0, progress['queued'] -
+                                     progress['transferred'] -
+                                     progress['skipped'] - progress['failed'])
+    if manager.log_pipeline and manager.log_pipeline.queue:
+        try:
+            depths['logs'] = manager.log_pipeline.queue.qsize()
+        except NotImplementedError:
+            # eg: macOS
+            pass
+    publisher = getattr(manager.instance, 'publisher', None)
+    if publisher is not None and hasattr(publisher, '_pending'):
+        depths['liveview'] = len(publisher._pending)
+    return depths
+
+
+class _MetricsServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class MetricsExporter(object):
+    '''MetricsExporter class
+
+    Arguments
+    ---------
+        manager (Manager): manager to export the metrics of
+        directory (str): directory of the textfile, not written when None
+        port (int): port of the HTTP endpoint, not served when None
+        address (str): address of the HTTP endpoint
+    '''
+
+    def __init__(self, manager, directory = None, port = None,
+                 address = '127.0.0.1'):
+        self.manager = manager
+        self.path = os.path.join(directory, TEXTFILE) if directory else None
+        self.port = port
+        self.address = address
+        self._server = None
+
+        # latest rendering, served over HTTP
+        self._metrics = ''
+
+        # served by threads of the manager process, started before the
+        # workers are forked
+        at_fork_reinit(self._after_fork)
+
+    def _after_fork(self):
+        '''forked workers don't serve the metrics: the listening socket they
+        inherit is closed, and the server (whose threads only run in the
+        parent) is never shut down from there'''
+        if self._server is not None:
+            self._server.socket.close()
+            self._server = None
+
+    def publish(self):
+        '''publish
+
+        renders the metrics of the manager, served over HTTP until the next
+        rendering. From the thread of the manager.
+        '''
+        self._metrics = render_metrics(self.manager)
+        return self._metrics
+
+    def write(self):
+        '''write
+
+        publishes the metrics, and writes the textfile, atomically (readers
+        never see partial files).
+        '''
+        metrics = self.publish()
+        if not self.path:
+            return
+        temp = '{}.{}'.format(self.path, os.getpid())
+        with open(temp, 'w') as f:
+            f.write(metrics)
+        os.replace(temp, self.path)
+
+    def start(self):
+        '''start
+
+        serves the metrics over HTTP (/metrics), when a port is set.
+        '''
+        if self.port is None or self._server is not None:
+            return
+
+        exporter = self
+        self.publish()
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = exporter._metrics.encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type',
+                                 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug(format % args)
+
+        self._server = _MetricsServer((self.address, self.port), Handler)
+        thread = threading.Thread(target = self._server.serve_forever,
+                                  name = 'MetricsExporter', daemon = True)
+        thread.start()
+        logger.info('Serving telemetry metrics on http://{}:{}/metrics'.format(
+                                            *self._server.server_address[:2]))
+
+    def stop(self):
+        self.write()
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        self._server = None
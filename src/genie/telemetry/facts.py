@@ -0,0 +1,175 @@
+'''Device Facts
+
+Per-device cache of static facts learned by plugins during a telemetry session
+(eg: vdc id, file systems that do not exist, unsupported commands), so that
+commands known to fail or to always return the same answer are only executed
+once.
+
+Plugins are executed in worker processes, facts are hence persisted to a json
+file per device under the runinfo directory (when available) and reloaded
+whenever that file changes.
+'''
+
+import os
+import json
+import logging
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+# module logger
+logger = logging.getLogger(__name__)
+
+
+class DeviceFacts(object):
+    '''DeviceFacts class
+
+    Lazily populated facts cache of a single device. The cache is cleared when
+    the connection to the device is re-established, as the device may have
+    been reloaded in-between.
+
+    Arguments
+    ---------
+        name (str): device name
+        directory (str): directory to persist the facts to. Facts are only
+                         kept in memory if not provided.
+    '''
+
+    def __init__(self, name, directory = None):
+        self.name = name
+        self.directory = directory
+
+        self._facts = {}
+        self._stamp = None
+
+    @property
+    def path(self):
+        if not self.directory:
+            return None
+        return os.path.join(self.directory, '{}.json'.format(self.name))
+
+    def _load(self):
+        '''_load
+
+        reloads the facts from file if it was modified (or removed) since it
+        was last read.
+        '''
+        if not self.path:
+            return
+
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self._facts, self._stamp = {}, None
+            return
+
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+
+        try:
+            with open(self.path) as file:
+                self._facts = json.load(file)
+        except Exception as e:
+            logger.warning('Unable to load facts of device {}: {}'.format(
+                                                                self.name, e))
+            self._facts = {}
+        self._stamp = stamp
+
+    def _save(self):
+        if not self.path:
+            return
+
+        try:
+            os.makedirs(self.directory, exist_ok = True)
+            # write to a temporary file first, readers never see partial facts
+            tmp = '{}.tmp'.format(self.path)
+            with open(tmp, 'w') as file:
+                json.dump(self._facts, file)
+            os.replace(tmp, self.path)
+            stat = os.stat(self.path)
+        except Exception as e:
+            logger.warning('Unable to save facts of device {}: {}'.format(
+                                                                self.name, e))
+        else:
+            self._stamp = (stat.st_mtime_ns, stat.st_size)
+
+    def get(self, key, default = None):
+        self._load()
+        return self._facts.get(key, default)
+
+    def set(self, key, value):
+        self._load()
+        self._facts[key] = value
+        self._save()
+
+    def add(self, key, value):
+        '''add
+
+        adds value to the list of values stored as key.
+        '''
+        self._load()
+        values = self._facts.setdefault(key, [])
+        if value not in values:
+            values.append(value)
+            self._save()
+
+    def __contains__(self, key):
+        self._load()
+        return key in self._facts
+
+    def is_unsupported(self, command):
+        '''is_unsupported
+
+        checks whether command is known to be unsupported by the device.
+        '''
+        return command in self.get('unsupported_commands', [])
+
+    def is_supported(self, command):
+        '''is_supported
+
+        checks whether command is known to be supported by the device.
+        '''
+        return command in self.get('supported_commands', [])
+
+    def set_supported(self, command):
+        '''set_supported
+
+        remembers that command is supported by the device.
+        '''
+        self.add('supported_commands', command)
+
+    def set_unsupported(self, command):
+        '''set_unsupported
+
+        remembers that command is not supported by the device.
+        '''
+        logger.info("Command '{}' is not supported on device {}, skipping it "
+                    "from now on".format(command, self.name))
+        self.add('unsupported_commands', command)
+
+    def clear(self):
+        '''clear
+
+        forgets every fact learned about the device.
+        '''
+        self._facts, self._stamp = {}, None
+
+        if self.path:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+
+def get_facts(device):
+    '''get_facts
+
+    returns the facts cache of the given device. The manager attaches one
+    persisted to the runinfo directory to each device, a memory only cache is
+    created otherwise.
+    '''
+    facts = getattr(device, 'telemetry_facts', None)
+    if facts is None:
+        facts = device.telemetry_facts = DeviceFacts(device.name)
+    return facts
@@ -0,0 +1,253 @@
+'''Liveview Publisher
+
+Batches the messages published to liveview (stdout stream and plugin results)
+on their way to the liveview feed publisher: messages are queued without
+blocking, and forwarded by a background thread in batches, bounded in time
+and size. Consecutive stream messages can be coalesced into one (opt-in, this
+changes the stream messages received by the liveview consumers).
+
+The queue is bounded: when the liveview consumer doesn't keep up, the oldest
+messages are dropped, and counted. Worker processes (eg: the stdout of the
+plugins) queue and batch their messages the same way, with a forwarding
+thread of their own, stopped (flushed) when the worker exits.
+
+Plugin results are published as they come in, or as deltas once per tick
+with a periodic snapshot of all the statuses when enabled (see the liveview
+section of the usage docs for the messages).
+'''
+
+import os
+import time
+import logging
+import threading
+from collections import deque
+from multiprocessing.util import Finalize
+
+from genie.telemetry.utils import at_fork_reinit
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+# module logger
+logger = logging.getLogger(__name__)
+
+
+class LiveviewPublisher(object):
+    '''LiveviewPublisher class
+
+    Arguments
+    ---------
+        publisher (object): liveview feed publisher (queue-like, put())
+        batch_interval (float): seconds between batches
+        batch_size (int): messages forwarded per batch, at most
+        max_pending (int): messages queued, oldest dropped past this
+        coalesce (bool): coalesce consecutive stream messages of a batch
+    '''
+
+    def __init__(self, publisher, batch_interval = 0.5, batch_size = 100,
+                 max_pending = 10000, coalesce = False):
+        self.publisher = publisher
+        self.batch_interval = batch_interval
+        self.batch_size = batch_size
+        self.coalesce = coalesce
+
+        self._pid = None
+        self._pending = deque(maxlen = max_pending)
+        self._start()
+
+        # the forwarding thread may hold the condition when workers are forked
+        at_fork_reinit(self._after_fork)
+
+    def _after_fork(self):
+        '''messages of the parent are not carried over into forked workers,
+        which start forwarding their own once they publish (see _forked)'''
+        self._pending = deque(maxlen = self._pending.maxlen)
+        self._ready = threading.Condition()
+
+    def _start(self):
+        '''starts the forwarding thread of the current process'''
+        self._pid = os.getpid()
+        self._pending = deque(maxlen = self._pending.maxlen)
+        self._ready = threading.Condition()
+        self._stopped = False
+
+        # messages dropped by the queue (oldest), and by the feed publisher
+        self.dropped = 0
+        self.rejected = 0
+        self.published = 0
+
+        self._thread = threading.Thread(target = self._forward,
+                                        name = 'LiveviewPublisher',
+                                        daemon = True)
+        self._thread.start()
+
+    def _forked(self):
+        '''messages of the parent are not carried over into forked workers,
+        which forward their own until they exit'''
+        if os.getpid() != self._pid:
+            self._start()
+            Finalize(self, self.stop, exitpriority = 10)
+
+    def configure(self, batch_interval = None, batch_size = None,
+                  max_pending = None, coalesce = None):
+        '''configure
+
+        applies the liveview settings of the configuration file.
+        '''
+        with self._ready:
+            if coalesce is not None:
+                self.coalesce = coalesce
+            if batch_interval is not None:
+                self.batch_interval = batch_interval
+            if batch_size is not None:
+                self.batch_size = batch_size
+            if max_pending is not None and \
+               max_pending != self._pending.maxlen:
+                pending = list(self._pending)
+                self.dropped += max(0, len(pending) - max_pending)
+                self._pending = deque(pending, maxlen = max_pending)
+
+    def put(self, message):
+        '''put
+
+        queues a message, never blocking.
+        '''
+        self._forked()
+        with self._ready:
+            if len(self._pending) == self._pending.maxlen:
+                self.dropped += 1
+            self._pending.append(message)
+            if len(self._pending) >= self.batch_size:
+                self._ready.notify()
+
+    def _publish(self, message):
+        try:
+            put = getattr(self.publisher, 'put_nowait', self.publisher.put)
+            put(message)
+        except Exception:
+            # eg: queue.Full, the feed doesn't keep up
+            self.rejected += 1
+        else:
+            self.published += 1
+
+    def _batch(self):
+        '''next batch of messages, consecutive streams coalesced if enabled'''
+        batch = []
+        with self._ready:
+            for _ in range(min(self.batch_size, len(self._pending))):
+                message = self._pending.popleft()
+                if self.coalesce and batch and set(message) == {'stream'} and \
+                   set(batch[-1]) == {'stream'}:
+                    batch[-1] = dict(stream = '\n'.join((batch[-1]['stream'],
+                                                         message['stream'])))
+                else:
+                    batch.append(message)
+        return batch
+
+    def _forward(self):
+        while True:
+            with self._ready:
+                if not self._stopped and \
+                   len(self._pending) < self.batch_size:
+                    self._ready.wait(self.batch_interval)
+                stopped = self._stopped
+
+            for message in self._batch():
+                self._publish(message)
+
+            if stopped and not self._pending:
+                return
+
+    def stop(self, timeout = 5):
+        '''stop
+
+        forwards the queued messages, and stops the forwarding thread.
+        '''
+        with self._ready:
+            self._stopped = True
+            self._ready.notify()
+        self._thread.join(timeout)
+
+        if self.dropped or self.rejected:
+            logger.warning('Liveview publisher dropped {} message(s), and the '
+                           'feed rejected {}'.format(self.dropped,
+                                                     self.rejected))
+
+
+def result_message(device, plugin, status, result):
+    '''result_message
+
+    liveview entry of the result of a plugin on a device.
+    '''
+    return dict(status = str(status).upper(),
+                value = int(status),
+                device = device,
+                plugin = plugin,
+                result = result,
+                # to nanoseconds
+                timestamp = int(time.time() * 1000000000))
+
+
+class ResultDeltas(object):
+    '''ResultDeltas class
+
+    plugin results published to liveview as deltas, once per task (eg: tick):
+    only the results changing the status of a plugin on a device, or bringing
+    new messages, with the new messages only. A compact snapshot of all the
+    statuses is published every snapshot_interval tasks, for late joiners.
+
+    Arguments
+    ---------
+        snapshot_interval (int): tasks between snapshots, never when 0
+    '''
+
+    def __init__(self, snapshot_interval = 10):
+        self.snapshot_interval = snapshot_interval
+
+        # status code and messages of the last result, by device and plugin
+        self._last = {}
+        self._deltas = []
+        self._tasks = 0
+
+    def add(self, device, plugin, status, result):
+        '''add
+
+        records the result of a plugin on a device, as a delta when it
+        changed since the previous one.
+        '''
+        code = int(status)
+        result = result or {}
+        messages = set(str(message) for message in result.values())
+
+        previous = self._last.get((device, plugin))
+        self._last[(device, plugin)] = (code, messages)
+        if previous is None:
+            new = result
+        elif previous[0] != code:
+            new = result
+        else:
+            new = {key: message for key, message in result.items()
+                   if str(message) not in previous[1]}
+            if not new:
+                return
+
+        self._deltas.append(result_message(device, plugin, status, new))
+
+    def flush(self):
+        '''flush
+
+        returns the messages to publish at the end of a task: the deltas of
+        the task, and a snapshot when due.
+        '''
+        messages = []
+        if self._deltas:
+            messages.append(dict(results = self._deltas, delta = True))
+        self._deltas = []
+
+        self._tasks += 1
+        if self.snapshot_interval and \
+           self._tasks % self.snapshot_interval == 0:
+            messages.append(dict(snapshot = [[device, plugin, code]
+                                 for (device, plugin), (code, _) in
+                                 sorted(self._last.items())]))
+        return messages
@@ -0,0 +1,304 @@
+'''Logging Pipeline
+
+Takes logging off the plugin executions: records logged by the manager and by
+its worker processes are put on a process-safe queue, and written by a single
+thread of the manager process, in batches, through the handlers the loggers
+had (eg: the task log handler of telemetry.log).
+
+Records of the worker processes carry the name of their device, and may also
+be written into a log file per device (<device>.log), rotated by size into
+gzip-compressed files.
+'''
+
+import os
+import sys
+import gzip
+import copy
+import shutil
+import logging
+import threading
+import traceback
+import multiprocessing
+from logging.handlers import QueueHandler, RotatingFileHandler
+
+from genie.telemetry.utils import at_fork_reinit
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+# module logger
+logger = logging.getLogger(__name__)
+
+DEVICE_LOGS_DIR = 'devices'
+
+# marks the end of the records
+_STOP = None
+
+# arguments sent to the writer thread as is, formatted by the handlers
+_PLAIN_ARGS = (str, bytes, int, float, bool, type(None))
+
+# formats the exceptions of the records, in the worker processes
+_formatter = logging.Formatter()
+
+def _plain(args):
+    if isinstance(args, dict):
+        args = args.values()
+    return all(isinstance(arg, _PLAIN_ARGS) for arg in args)
+
+
+class DeviceQueueHandler(QueueHandler):
+    '''DeviceQueueHandler class
+
+    puts the records of a logger on the pipeline queue, along with the name of
+    the logger and of the device of the process (set in worker processes).
+
+    Records are queued unformatted (message and arguments), and formatted by
+    the handlers of the writer thread. Only arguments that may not be sent as
+    is (eg: LazyStr, objects) are formatted here, and only for records of the
+    levels enabled by these handlers (see LogPipeline.start).
+    '''
+
+    # device of the current process, set after forking
+    device = None
+
+    def __init__(self, queue, target):
+        super().__init__(queue)
+        self.target = target
+
+    def prepare(self, record):
+        # records propagate through several loggers: don't share them
+        record = copy.copy(record)
+        if not isinstance(record.msg, str) or \
+                (record.args and not _plain(record.args)):
+            record.msg = record.getMessage()
+            record.args = None
+        # tracebacks aren't sent
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _formatter.formatException(record.exc_info)
+            record.exc_info = None
+        record.pipeline_logger = self.target
+        if getattr(record, 'device', None) is None:
+            record.device = self.device
+        return record
+
+
+def _gzip_namer(name):
+    return name + '.gz'
+
+def _gzip_rotator(source, dest):
+    with open(source, 'rb') as f_in, gzip.open(dest, 'wb') as f_out:
+        shutil.copyfileobj(f_in, f_out)
+    os.remove(source)
+
+
+class DeviceLogHandler(logging.Handler):
+    '''DeviceLogHandler class
+
+    writes the records of each device into its own log file, rotated by size.
+    Files are flushed once per batch of records.
+
+    Arguments
+    ---------
+        directory (str): directory of the device log files
+        max_bytes (int): size the files are rotated at, never when 0
+        backup_count (int): rotated files kept
+        compress (bool): gzip the rotated files
+    '''
+
+    def __init__(self, directory, max_bytes = 10 * 1024 * 1024,
+                 backup_count = 5, compress = True):
+        super().__init__()
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.compress = compress
+        self.handlers = {}
+
+    def get_handler(self, device):
+        handler = self.handlers.get(device)
+        if handler is None:
+            os.makedirs(self.directory, exist_ok = True)
+            handler = RotatingFileHandler(
+                        os.path.join(self.directory, '{}.log'.format(device)),
+                        maxBytes = self.max_bytes,
+                        backupCount = self.backup_count)
+            handler.setFormatter(self.formatter)
+            if self.compress:
+                handler.namer = _gzip_namer
+                handler.rotator = _gzip_rotator
+            # flushed by batch, see flush()
+            handler.flush = lambda: None
+            self.handlers[device] = handler
+        return handler
+
+    def emit(self, record):
+        device = getattr(record, 'device', None)
+        if device is None:
+            return
+        self.get_handler(device).emit(record)
+
+    def flush(self):
+        for handler in self.handlers.values():
+            if handler.stream:
+                handler.stream.flush()
+
+    def close(self):
+        self.flush()
+        for handler in self.handlers.values():
+            handler.close()
+        self.handlers.clear()
+        super().close()
+
+
+class LogPipeline(object):
+    '''LogPipeline class
+
+    Arguments
+    ---------
+        loggers (list): names of the loggers whose handlers are taken over
+        directory (str): runinfo directory, for the device log files
+        device_logs (bool): write the records of each device into its own file
+        max_bytes (int): size the device log files are rotated at
+        backup_count (int): rotated device log files kept
+        compress (bool): gzip the rotated device log files
+        batch_size (int): records written before the handlers are flushed
+    '''
+
+    def __init__(self, loggers = ('', 'genie.telemetry'), directory = None,
+                 device_logs = False, max_bytes = 10 * 1024 * 1024,
+                 backup_count = 5, compress = True, batch_size = 100):
+        self.loggers = loggers
+        self.batch_size = batch_size
+
+        self.device_handler = None
+        if device_logs and directory:
+            self.device_handler = DeviceLogHandler(
+                                    os.path.join(directory, DEVICE_LOGS_DIR),
+                                    max_bytes = max_bytes,
+                                    backup_count = backup_count,
+                                    compress = compress)
+            self.device_handler.setFormatter(logging.Formatter(
+                        '%(asctime)s: %%%(name)s-%(levelname)s: %(message)s'))
+
+        self.queue = None
+        self._handlers = {}
+        self._queue_handlers = {}
+        self._writer = None
+
+        # the writer thread is started before the workers are forked, and
+        # threads of the manager log meanwhile (eg: transfers)
+        at_fork_reinit(self._after_fork)
+
+    def _after_fork(self):
+        '''records of the forked workers are only queued, and written by the
+        writer thread of the process which started the pipeline'''
+        self._writer = None
+        if self.queue is not None:
+            # locks of the queue, and its feeder thread
+            self.queue._after_fork()
+        for handler in self._queue_handlers.values():
+            handler.createLock()
+
+    @property
+    def started(self):
+        return self._writer is not None
+
+    def start(self):
+        '''start
+
+        takes the handlers of the loggers over, and starts the writer thread.
+        To be called before the worker processes are forked.
+        '''
+        if self.started:
+            return
+
+        self.queue = multiprocessing.Queue()
+        for name in self.loggers:
+            target = logging.getLogger(name)
+            self._handlers[name] = target.handlers[:]
+            for handler in self._handlers[name]:
+                target.removeHandler(handler)
+            self._queue_handlers[name] = DeviceQueueHandler(self.queue, name)
+            # records no handler writes aren't queued (nor formatted)
+            levels = [h.level for h in self._handlers[name]]
+            if self.device_handler and name == self.loggers[0]:
+                levels.append(self.device_handler.level)
+            self._queue_handlers[name].setLevel(
+                            min(levels) if levels else logging.CRITICAL + 1)
+            target.addHandler(self._queue_handlers[name])
+
+        self._writer = threading.Thread(target = self._write,
+                                        name = 'LogPipeline',
+                                        daemon = True)
+        self._writer.start()
+
+    def set_device(self, device):
+        '''set_device
+
+        names the device of the current (worker) process, carried by its
+        records.
+        '''
+        DeviceQueueHandler.device = device
+
+    def _handle(self, record):
+        handlers = self._handlers.get(record.pipeline_logger, [])
+        # device records, once
+        if self.device_handler and record.pipeline_logger == self.loggers[0]:
+            handlers = handlers + [self.device_handler]
+        for handler in handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+    def _flush(self):
+        for handler in set(h for hs in self._handlers.values() for h in hs):
+            handler.flush()
+        if self.device_handler:
+            self.device_handler.flush()
+
+    def _write(self):
+        stop = False
+        while not stop:
+            records = [self.queue.get()]
+            # batch of the records already queued
+            while len(records) < self.batch_size and records[-1] is not _STOP:
+                try:
+                    records.append(self.queue.get_nowait())
+                except Exception:
+                    break
+
+            for record in records:
+                if record is _STOP:
+                    stop = True
+                    continue
+                try:
+                    self._handle(record)
+                except Exception:
+                    # as logging does for failing handlers
+                    traceback.print_exc(file = sys.stderr)
+            self._flush()
+
+    def stop(self):
+        '''stop
+
+        writes the queued records, and gives the handlers back to the loggers.
+        '''
+        if not self.started:
+            return
+
+        self.queue.put(_STOP)
+        self._writer.join()
+        self._writer = None
+
+        for name, handlers in self._handlers.items():
+            target = logging.getLogger(name)
+            target.removeHandler(self._queue_handlers[name])
+            for handler in handlers:
+                target.addHandler(handler)
+        self._handlers.clear()
+        self._queue_handlers.clear()
+
+        if self.device_handler:
+            self.device_handler.close()
+        self.queue.close()
+        self.queue = None
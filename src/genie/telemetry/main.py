@@ -1,6 +1,5 @@
 import os
 import sys
-import time
 import pathlib
 import logging
 import getpass
@@ -16,6 +15,8 @@ from .parser import Parser
 from .manager import TimedManager
 from .config import Configuration
 from .email import MailBot, TextEmailReport
+from .liveview import LiveviewPublisher, ResultDeltas, result_message
+from .status import OK
 from .utils import escape, filter_exception, ordered_yaml_dump
 
 # module logger
@@ -32,15 +33,15 @@ class StreamToLogger(object):
     publisher = None
 
     def write(self, message):
-        # write to screen
+        # write to screen, flushed by flush()
         sys.__stdout__.write(message)
-        # publish to liveview
+        # publish to liveview, batched by the publisher
+        message = message.strip('\n')
         try:
             if self.publisher and message:
-                self.publisher.put(dict(stream=message.strip('\n')))
+                self.publisher.put(dict(stream=message))
         except Exception as e:
             sys.__stdout__.write(str(e))
-        sys.__stdout__.flush()
 
     def flush(self):
         sys.__stdout__.flush()
@@ -75,6 +76,7 @@ class GenieTelemetry(object):
         self.parser = Parser()
         self.manager = None
         self.liveview = None
+        self.deltas = None
 
         self.stream_logger = StreamToLogger()
         sys.stdout = self.stream_logger
@@ -175,6 +177,13 @@ class GenieTelemetry(object):
                                         configuration=configuration,
                                         configuration_file=configuration_file,
                                         timeout=self.timeout)
+                if self.liveview:
+                    settings = dict(self.manager.configuration.liveview)
+                    interval = settings.pop('snapshot_interval')
+                    if settings.pop('deltas'):
+                        self.deltas = ResultDeltas(
+                                            snapshot_interval = interval)
+                    self.publisher.configure(**settings)
 
                 # start genie telemetry
                 # ------------------------------
@@ -188,30 +197,19 @@ class GenieTelemetry(object):
 
             sys.stdout = sys.__stdout__
 
-    def post_call_plugin(self, device, results):
-        '''post_call_plugin
+    def post_task(self, tag):
+        '''post_task
 
-        post task right after each plugin execution. It emits out liveview
-        websocket data if enabled.
+        post task which gets called once the results of a tick are all in.
+        It emits out the liveview websocket data if enabled: result deltas
+        and periodic snapshots.
         '''
-        # skip, if liveview is not enabled
-        if not self.liveview:
+        # skip, if liveview result deltas are not enabled
+        if not self.deltas:
             return
-        # massage the execution result
-        websocket_data = []
-        for p, res in results.items():
-            for device, data in res.items():
-                status = data.get('status')
-                # to nanoseconds
-                timestamp = int(time.time()*1000000000)
-                websocket_data.append(dict(status=str(status).upper(),
-                                           value=status.code,
-                                           device=device,
-                                           plugin=p,
-                                           result=data.get('result'),
-                                           timestamp=timestamp))
-        # push result to websocket publisher queue
-        self.publisher.put(dict(results=websocket_data))
+        # push results to websocket publisher queue
+        for message in self.deltas.flush():
+            self.publisher.put(message)
 
     def post_run(self, device, plugin, result):
         '''post_run
@@ -220,6 +218,17 @@ class GenieTelemetry(object):
         it sends out notification if result is not ok along with snapshot of
         plugin current status.
         '''
+        # liveview results, as deltas published once the task is over when
+        # enabled
+        if self.deltas:
+            self.deltas.add(device, plugin, result.get('status', OK),
+                            result.get('result', {}))
+        elif self.liveview:
+            self.publisher.put(dict(results=[result_message(
+                                            device, plugin,
+                                            result.get('status', OK),
+                                            result.get('result'))]))
+
         status = str(result.get('status', 'Ok')).capitalize()
         # verify whether we should send notify
         if status == 'Ok':
@@ -259,7 +268,9 @@ class GenieTelemetry(object):
                                     'telemetryview-unsubscribe',
                                     'telemetryview-error'))
 
-        self.stream_logger.publisher = self.publisher = telemetryview.publisher
+        # messages batched on their way to the liveview feed
+        self.publisher = LiveviewPublisher(telemetryview.publisher)
+        self.stream_logger.publisher = self.publisher
 
         return telemetryview
 
@@ -293,6 +304,8 @@ class GenieTelemetry(object):
 
         if self.liveview:
             logger.info('Stopping Liveview Manager ... ')
+            self.stream_logger.publisher = None
+            self.publisher.stop()
             self.liveview.stop()
 
     # get testbed name - shortcuts
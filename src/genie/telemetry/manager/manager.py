@@ -1,9 +1,13 @@
 # python
 import os
 import sys
+import time
 import yaml
 import logging
+import threading
 from copy import copy
+from contextlib import ExitStack
+from multiprocessing import SimpleQueue
 from datetime import datetime
 
 # Pcall
@@ -17,12 +21,26 @@ except ImportError:
 from pyats.log.utils import banner
 from pyats.utils import parser as argparse
 from pyats.utils.dicts import recursive_update
-from pyats.datastructures import OrderableDict, classproperty
+from pyats.datastructures import classproperty
 
 # configuration loader
 from genie.telemetry.config.manager import Configuration
+from genie.telemetry.facts import DeviceFacts
+from genie.telemetry.logs import LogPipeline
+from genie.telemetry.exporter import TelemetryStats, MetricsExporter
+from genie.telemetry.metrics import MetricStore
+from genie.telemetry.results import (RetainedResults, ResultsJournal,
+                                    ResultsStore, StatusTimelines,
+                                    TransitionRecorder, ReportText,
+                                    WireNames, WireBlobs, WireResult,
+                                    StatusBoard, encode_results,
+                                    decode_results,
+                                    format_statuses)
+from genie.telemetry.transfer import TransferQueue
+from genie.telemetry.tracing import Tracer
 from genie.telemetry.status import OK, ERRORED
-from genie.telemetry.utils import ordered_yaml_dump, get_plugin_name
+from genie.telemetry.utils import (ordered_yaml_dump, get_plugin_name,
+                                   LazyStr)
 
 # declare module as infra
 __genietelemetry_infra__ = True
@@ -31,9 +49,20 @@ logger = logging.getLogger(__name__)
 
 STATUS_KEYS = ('ok', 'warning', 'critical', 'errored', 'partial')
 
+def _result_yaml(result):
+    # results sent back by the children are decoded when logged
+    if isinstance(result, WireResult):
+        result = result.result
+    return ordered_yaml_dump(result, default_flow_style=False)
+
 class Manager(object):
 
     report_file = 'telemetry.yaml'
+    json_report_file = 'telemetry.json'
+    metrics_file = 'telemetry_metrics.yaml'
+    unchanged_tag = 'unchanged results'
+    # seconds between checks of the result queue
+    poll_interval = 0.05
 
     def __init__(self,
                  testbed,
@@ -69,15 +98,119 @@ class Manager(object):
                 # Set default
                 device.custom.setdefault('abstraction', {})['order'] = ['os']
 
+        # per-device static facts cache, persisted to the runinfo directory to
+        # be shared across plugin worker processes
+        facts_dir = os.path.join(runinfo_dir, 'facts') if runinfo_dir else None
+        for name, device in self.devices.items():
+            device.telemetry_facts = DeviceFacts(name, directory=facts_dir)
+
         # Instantiate configuration loader
         self.configuration = Configuration(plugins=plugins)
         self.configuration.load(config=configuration, devices=self.devices)
 
-        self.results = OrderableDict()
+        for name in self.devices:
+            for plugin in self.plugins.get_device_plugins(name).values():
+                plugin.runinfo_dir = runinfo_dir
+
+        # uploads handed over by the plugins, carried out in the background
+        transfers = dict(self.configuration.transfers)
+        self.transfers = None
+        if transfers.pop('enabled'):
+            self.transfers = TransferQueue(self.devices,
+                                           connection = self.get_connection,
+                                           **transfers)
+            for device in self.devices.values():
+                device.telemetry_transfers = self.transfers
+
+        # numeric samples emitted by the plugins
+        metrics = dict(self.configuration.metrics)
+        self.metrics = None
+        if metrics.pop('enabled'):
+            self.metrics = MetricStore(**metrics)
+
+        # results by tag, older tags spilled to disk past retention
+        results = dict(self.configuration.results)
+        journal = results.pop('journal')
+        journal_kwargs = dict(fsync_interval = results.pop('fsync_interval'),
+                              max_bytes = results.pop('journal_max_bytes'))
+        store = results.pop('store')
+        store_batch = results.pop('store_batch')
+        record = results.pop('record')
+        self.report_json = results.pop('report_json')
+        wire_spill = results.pop('wire_spill')
+        status_board = results.pop('status_board')
+        self.summary = results.pop('summary')
+        self.results = RetainedResults(directory = runinfo_dir, **results)
+
+        # results journaled as they come back, when there's a runinfo dir
+        self.journal = None
+        if journal and runinfo_dir:
+            self.journal = ResultsJournal(runinfo_dir, **journal_kwargs)
+
+        # status history of the plugins, by device
+        self.timelines = StatusTimelines()
+
+        # unchanged healthy results only counted in transitions mode
+        self.recorder = None
+        if record == 'transitions':
+            self.recorder = TransitionRecorder()
+
+        # results inserted into an indexed sqlite store, when enabled
+        self.store = None
+        if store and runinfo_dir:
+            self.store = ResultsStore(runinfo_dir, batch_size = store_batch)
+
+        # results sent back by the children as compact wire records, large
+        # result meta spilled to a blob file when there's a runinfo dir
+        self.wire_names = WireNames()
+        self.wire_blobs = None
+        if runinfo_dir:
+            self.wire_blobs = WireBlobs(runinfo_dir, spill_bytes = wire_spill)
+
+        # current status of each plugin on each device, readable by other
+        # processes from the runinfo dir
+        self.board = None
+        if status_board and runinfo_dir:
+            self.board = StatusBoard(runinfo_dir, [
+                    (name, get_plugin_name(plugin))
+                    for name in self.devices
+                    for plugin in self.plugins.get_device_plugins(name).values()])
+        # records of the manager and of its workers written by a thread of
+        # the manager process, when enabled
+        logs = dict(self.configuration.logs)
+        self.log_pipeline = None
+        if logs.pop('queue'):
+            self.log_pipeline = LogPipeline(directory = runinfo_dir, **logs)
+
+        # counters of the run, shared with the workers, and their exporter
+        self.stats = TelemetryStats(self.devices)
+        exporter = dict(self.configuration.exporter)
+        self.exporter = None
+        if (exporter['textfile'] and runinfo_dir) or exporter['port']:
+            self.exporter = MetricsExporter(
+                    self,
+                    directory = runinfo_dir if exporter['textfile'] else None,
+                    port = exporter['port'],
+                    address = exporter['address'])
+
+        # spans of the run, written as trace events when enabled
+        tracing = dict(self.configuration.tracing)
+        self.tracer = Tracer(
+                        directory = runinfo_dir if tracing.pop('enabled')
+                                    else None,
+                        **tracing)
+
         self.timeout = timeout
         self.runinfo_dir = runinfo_dir
         self.connection_timeout = connection_timeout
         self.p = None
+        self.result_queue = None
+        self._closed = False
+        self._report = None
+
+        # served over HTTP (when a port is set) once, for the whole run
+        if self.exporter:
+            self.exporter.start()
 
     @classproperty
     def parser(cls):
@@ -119,23 +252,53 @@ class Manager(object):
                                                      plugin_name,
                                                      status)
 
+    def get_connection(self, name):
+        '''get_connection
+
+        returns the connection arguments (profile applied) used to connect to
+        the given device.
+        '''
+        connection = self.configuration.get_connection(name)
+        connection.setdefault('timeout', self.connection_timeout)
+        return connection
+
     def setup(self):
+        if self.transfers:
+            self.transfers.start()
+
         for name, device in self.devices.items():
-            connection = self.connections.get(name, {})
-            timeout = connection.pop('timeout', self.connection_timeout)
+            connection = self.get_connection(name)
             logger.info('Setting up connection to device ({})'.format(name))
             if not device.is_connected(alias=connection.get('alias', None)):
                 # best effort, attempt to connect at least once.
                 try:
-                    device.connect(timeout=timeout,
-                                   **connection)
+                    with self.tracer.span('connect', cat = 'connection',
+                                          device = name):
+                        device.connect(**connection)
                 except Exception as e:
                     raise
+                self.stats.connection(name, 'connects')
 
     def is_connected(self, name, device):
-        connection = self.connections.get(name, {})
+        connection = self.configuration.get_connection(name)
         return device.is_connected(alias=connection.get('alias', None))
 
+    def post_task(self, tag):
+        '''post_task
+
+        called once the results of a task are all in, see the post_task of
+        the instance.
+        '''
+        if hasattr(self.instance, 'post_task'):
+            self.instance.post_task(tag)
+
+    def _join(self, errors):
+        '''joins the Pcall children, errors (eg: timeout) are collected'''
+        try:
+            self.p.join()
+        except Exception as e:
+            errors.append(e)
+
     def terminate(self):
 
         if self.p and any(self.p.livings):
@@ -146,8 +309,13 @@ class Manager(object):
 
         self.terminate()
 
+        # complete the pending uploads before disconnecting
+        self.close()
+        # closed along with the report
+        self.tracer.flush()
+
         for name, device in self.devices.items():
-            connection = self.connections.get(name, {})
+            connection = self.configuration.get_connection(name)
             alias = connection.get('alias', None)
             if not device.is_connected(alias=alias):
                 continue
@@ -182,21 +350,19 @@ class Manager(object):
                 continue
             iargs.append((device, device_plugins))
 
+            # names known to the children, sent as ids
+            self.wire_names.intern(name)
+            for plugin in device_plugins:
+                self.wire_names.intern(get_plugin_name(plugin))
+
         if not iargs:
             return
 
-        # Pass device and corresponding plugins to Pcall
-        #   child 1: args=(device1 object, [plugin1, plugin2])
-        #   child 2: args=(device2 object, [plugin2])
-        self.p = Pcall(self.call_plugin,
-                       iargs=iargs,
-                       timeout=self.timeout)
-        try:
-            self.p.start()
-            self.p.join()
-        except Exception as e:
-            logger.error(e)
-            self.terminate()
+        started = time.time()
+
+        # uploads handed over by the plugins are carried out by this process
+        if self.transfers:
+            self.transfers.start()
 
         # Associate testcase name with the plugin results
         # Example
@@ -237,37 +403,180 @@ class Manager(object):
 
         key = getattr(tag, 'uid', tag)
         results = self.results.setdefault(key, {})
-        printed_summary = {}
 
-        for result in getattr(self.p, 'results', []) or []:
-            if not isinstance(result, dict):
+        # results streamed back by the children as each plugin completes
+        self.result_queue = SimpleQueue()
+
+        # records of the children written by this process
+        if self.log_pipeline:
+            self.log_pipeline.start()
+
+        # Pass device and corresponding plugins to Pcall
+        #   child 1: args=(device1 object, [plugin1, plugin2])
+        #   child 2: args=(device2 object, [plugin2])
+        self.p = Pcall(self.wire_call_plugin,
+                       iargs=iargs,
+                       timeout=self.timeout)
+        with self.tracer.span('plugins', cat = 'manager',
+                              devices = len(iargs)):
+            try:
+                self.p.start()
+                # joined (up to the timeout) in a thread, the queue drained
+                # meanwhile: children blocked sending large records would
+                # otherwise never exit. Results are handled in completion
+                # order, while slower devices are running. The thread is
+                # started once all the children are forked (by start)
+                errors = []
+                joiner = threading.Thread(target = self._join,
+                                          args = (errors,),
+                                          name = 'pcall-join',
+                                          daemon = True)
+                joiner.start()
+                while joiner.is_alive():
+                    if not self.result_queue.empty():
+                        self.process_results(key, results,
+                                             self.result_queue.get())
+                    else:
+                        time.sleep(self.poll_interval)
+                if errors:
+                    raise errors[0]
+            except Exception as e:
+                logger.error(e)
+                self.terminate()
+
+            # results left in the queue, and results returned by the children
+            records = []
+            while not self.result_queue.empty():
+                records.append(self.result_queue.get())
+            records.extend(getattr(self.p, 'results', []) or [])
+            for record in records:
+                self.process_results(key, results, record)
+            self.result_queue = None
+
+        with self.tracer.span('wrap-up', cat = 'manager'):
+            # spilled results of this run are read before the spill file
+            # is cleared, decoded when read
+            if self.wire_blobs:
+                for devices in results.values():
+                    for entry in devices.values():
+                        if isinstance(entry, WireResult):
+                            entry.detach()
+                self.wire_blobs.clear()
+
+            # nothing recorded for this tag
+            if self.recorder and not results:
+                del self.results[key]
+
+            # results of this tag inserted within a single transaction
+            if self.store:
+                self.store.flush()
+
+            # older tags past retention
+            self.results.retain()
+
+            self.post_task(key)
+
+        self.stats.task(time.time() - started, len(iargs))
+        if self.exporter:
+            self.exporter.write()
+        self.tracer.complete('task', started, cat = 'manager', tag = str(key))
+
+    def process_results(self, key, results, record):
+        '''process_results
+
+        handles a record of results sent back by a child: statuses, follow-ups,
+        metrics, notifications, persistence and summary of each plugin on each
+        device, added to the results of the tag.
+        '''
+        if not isinstance(record, (dict, tuple)):
+            return
+
+        started = time.time()
+        executions = 0
+        for execution in decode_results(record, names = self.wire_names,
+                                        blobs = self.wire_blobs):
+            name, device_name = execution.plugin, execution.device
+            executions += 1
+
+            if execution.follow_up:
+                self.schedule_follow_up(device_name, name,
+                                        execution.follow_up)
+
+            for metric, value, timestamp in execution.metrics:
+                if self.metrics:
+                    self.metrics.record(device_name, metric, value,
+                                        timestamp)
+
+            status = execution.status
+            timeline = self.timelines.get(device_name, name)
+            changed = timeline is None or timeline.status != status
+            self.plugins.set_device_plugin_status(device_name,
+                                                  name,
+                                                  status)
+            self.timelines.record(device_name, name, status)
+            self.stats.result(name, status, execution.duration)
+            if self.board:
+                self.board.update(device_name, name, status,
+                                  duration = execution.duration)
+            # the result meta is only decoded when read (eg: notifications,
+            # liveview, journal, report)
+            if hasattr(self.instance, 'post_run'):
+                self.instance.post_run(device_name, name, execution)
+
+            # unchanged healthy results are only counted
+            if self.recorder and self.recorder.is_unchanged(
+                    device_name, name, status, execution.result):
                 continue
-            for name, devices in result.items():
-                if name not in printed_summary:
-                    printed_summary[name] = {}
-                for device_name, device in devices.items():
-                    status = device.get('status', OK)
-                    p_status = str(status).capitalize()
-                    p_result = ordered_yaml_dump(device.get('result', {}),
-                                                 default_flow_style=False)
-                    printed_summary[name][device_name] = {'status': p_status,\
-                        'result': p_result}
-
-                    self.plugins.set_device_plugin_status(device_name,
-                                                          name,
-                                                          status)
-                    if hasattr(self.instance, 'post_run'):
-                        self.instance.post_run(device_name, name, device)
-
-            recursive_update(results, result)
-
-        for task in printed_summary:
-            logger.info(banner("Summary for Telemetry task '{}'".format(task)))
-            for dev in printed_summary[task]:
-                logger.info(' - device ({})\n      - Status : {}\n'
-                            '      - Result : \n      {}'.format(
-                                dev, printed_summary[task][dev]['status'],
-                                printed_summary[task][dev]['result']))
+
+            if self.journal:
+                self.journal.write(key, name, device_name, status,
+                                   execution.result)
+            if self.store:
+                self.store.write(key, name, device_name, status,
+                                 execution.result)
+
+            plugin_results = results.setdefault(name, {})
+            previous = plugin_results.get(device_name)
+            if previous is None:
+                plugin_results[device_name] = execution
+            else:
+                if isinstance(previous, WireResult):
+                    previous = plugin_results[device_name] = previous.to_dict()
+                recursive_update(previous, execution.to_dict())
+
+            self.log_summary(name, device_name, status, execution, changed)
+
+        self.tracer.complete('process_results', started, cat = 'results',
+                             results = executions)
+
+    def log_summary(self, plugin, device, status, result, changed = True):
+        '''log_summary
+
+        logs the summary of a plugin result on a device, as per the summary
+        mode: all results (full), status changes only (changes), or none.
+        Formatting (and decoding of the WireResult given as result) is
+        deferred until a handler emits the record.
+        '''
+        if self.summary == 'none' or \
+           (self.summary == 'changes' and not changed):
+            return
+
+        logger.info('%s\n - device (%s)\n      - Status : %s\n'
+                    '      - Result : \n      %s',
+                    LazyStr(banner,
+                            "Summary for Telemetry task '{}'".format(plugin)),
+                    device, str(status).capitalize(),
+                    LazyStr(_result_yaml, result))
+
+    def schedule_follow_up(self, device, plugin, follow_up):
+        '''schedule_follow_up
+
+        schedules the follow-up execution requested by a plugin. Not supported
+        by default: plugins only request follow-ups when self.follow_ups is
+        set on them.
+        '''
+        logger.debug('Ignoring follow-up of {} on device {}'.format(plugin,
+                                                                    device))
 
     def call_plugin(self, device, plugins):
 
@@ -280,12 +589,20 @@ class Manager(object):
             execution = results.setdefault(plugin_name,
                                           {}).setdefault(device.name, {})
 
-            logger.info(banner("Starting Telemetry task '{}' on device '{}'".\
-                format(plugin_name, device.name)))
+            # per execution banners only in full summary mode
+            logger.log(logging.INFO if self.summary == 'full' else
+                       logging.DEBUG, '%s',
+                       LazyStr(banner, "Starting Telemetry task '{}' on "
+                                       "device '{}'".format(plugin_name,
+                                                            device.name)))
 
+            plugin._follow_up = None
+            plugin._samples = []
+            started = time.time()
             try:
 
-                call_result = plugin.execution(device)
+                with self.tracer.trace_device(device):
+                    call_result = plugin.execution(device)
 
             except Exception as e:
                 status = ERRORED
@@ -303,55 +620,148 @@ class Manager(object):
 
             execution['status'] = status
             execution['result'] = result
+            execution['duration'] = time.time() - started
+            self.tracer.complete(plugin_name, started, cat = 'plugin',
+                                 device = device.name, status = str(status))
+
+            # follow-up execution requested by the plugin
+            if getattr(plugin, '_follow_up', None):
+                execution['follow_up'] = plugin._follow_up
 
+            # numeric samples emitted by the plugin
+            if getattr(plugin, '_samples', None):
+                execution['metrics'] = plugin._samples
+
+            self.stream_results(results)
             recursive_update(plugin_result, results)
 
         return plugin_result
 
-    def _roll_up_status(self):
+    def wire_call_plugin(self, device, plugins):
+        '''wire_call_plugin
 
-        statuses = []
-        # rollup status
-        for name in self.devices.keys():
-            status = OK
-            for item in self.plugins.get_device_plugins_status(name).values():
-                if item is not None:
-                    status += item
-            statuses.append(status)
-        return statuses
+        calls the plugins on the device (see call_plugin) in a Pcall child.
+        Results are streamed to the parent as each plugin completes, or
+        returned as a compact wire record when not streamed.
+        '''
+        self._streamed = False
+        if self.log_pipeline:
+            self.log_pipeline.set_device(device.name)
+        self.tracer.name_process('device {}'.format(device.name))
+        try:
+            results = self.call_plugin(device, plugins)
+        finally:
+            # spans of the child written before it exits
+            self.tracer.flush()
+        if self._streamed:
+            return None
+        return encode_results(results, names = self.wire_names,
+                              blobs = self.wire_blobs)
+
+    def stream_results(self, results):
+        '''stream_results
+
+        sends the results of a plugin execution to the parent, as soon as the
+        plugin completes. Only in Pcall children of a run.
+        '''
+        if self.result_queue is None or not hasattr(self, '_streamed'):
+            return
+        self.result_queue.put(encode_results(results,
+                                             names = self.wire_names,
+                                             blobs = self.wire_blobs))
+        self._streamed = True
 
     @property
     def statuses(self):
 
         statuses = { k:0 for k in STATUS_KEYS }
-
-        for health_status in self._roll_up_status():
-            health_status = str(health_status).lower()
-
-            statuses[health_status] += 1
-
+        # device rollups, maintained as plugin statuses change
+        statuses.update(self.plugins.rollup.statuses)
         return statuses
 
     @property
     def status(self):
-        return sum([OK] + self._roll_up_status())
+        return self.plugins.rollup.status
+
+    def close(self):
+        '''close
+
+        completes the pending uploads, and closes the journal, store, status
+        board, logging pipeline and exporter of the run. Only once.
+        '''
+        if self._closed:
+            return
+        self._closed = True
+
+        if self.transfers:
+            self.transfers.stop()
+        if self.journal:
+            self.journal.close()
+        if self.store:
+            self.store.close()
+        if self.board:
+            self.board.close()
+        if self.log_pipeline:
+            self.log_pipeline.stop()
+        if self.exporter:
+            self.exporter.stop()
 
     def finalize_report(self, runinfo_dir=None):
-        for plugins in self.results.values():
-            for devices in plugins.values():
-                for device in devices.values():
-                    device['status'] = str(device.get('status',
-                                                      'OK')).capitalize()
+        '''finalize_report
+
+        writes the final report, and returns its text. The report is only
+        written once, further calls return the same text.
+        '''
+        if self._report is not None:
+            return self._report
+
+        self.close()
+
+        # outcome of the uploads
+        if self.transfers:
+            for name, status in self.transfers.statuses.items():
+                self.results.setdefault('transfers', {}).setdefault(
+                    'Transfer Queue', {})[name] = dict(status=status,
+                                                       result=status.meta)
+
+        # counters of the unchanged healthy results
+        if self.recorder:
+            unchanged = self.recorder.report()
+            if unchanged:
+                self.results[self.unchanged_tag] = unchanged
+
         runinfo_dir = runinfo_dir or self.runinfo_dir
+        report_file = None
+        started = time.time()
         if not runinfo_dir or not os.path.exists(runinfo_dir):
             logger.error('Unable to write yaml result to {}'.format(
                                                             self.report_file))
+            for plugins in self.results.values():
+                format_statuses(plugins)
         else:
             report_file = os.path.join(runinfo_dir, self.report_file)
-            with open(report_file, 'w') as yaml_file:
-                ordered_yaml_dump(self.results,
-                                  stream=yaml_file,
-                                  default_flow_style=False)
-
-        return ordered_yaml_dump(self.results,
-                                 default_flow_style=False, default_style='')
\ No newline at end of file
+            with ExitStack() as stack:
+                yaml_file = stack.enter_context(open(report_file, 'w'))
+                json_file = None
+                if self.report_json:
+                    json_file = stack.enter_context(open(os.path.join(
+                                    runinfo_dir, self.json_report_file), 'w'))
+
+                # single pass over the results, spilled tags included
+                self.results.dump(yaml_file, json_file)
+
+            # statistics of the metrics emitted by the plugins
+            summary = self.metrics.summary() if self.metrics else None
+            if summary:
+                metrics_file = os.path.join(runinfo_dir, self.metrics_file)
+                with open(metrics_file, 'w') as yaml_file:
+                    ordered_yaml_dump(summary,
+                                      stream=yaml_file,
+                                      default_flow_style=False)
+
+        self.tracer.complete('finalize_report', started, cat = 'report')
+        self.tracer.close()
+
+        # read back from the report file rather than serialized again
+        self._report = str(ReportText(self.results, report_file))
+        return self._report
\ No newline at end of file
@@ -17,6 +17,7 @@ from genie.telemetry.config import (
 from genie.telemetry.config.schema import testbed_schema
 from genie.telemetry.manager import Manager
 from genie.telemetry.status import CRITICAL
+from genie.telemetry.facts import get_facts
 from genie.telemetry.utils import get_plugin_name
 
 # declare module as infra
@@ -71,6 +72,17 @@ class TimedManager(Manager):
                          plugins=PluginManager,
                          **kwargs)
 
+        # time of the current tick (monotonic), and pending follow-up
+        # executions requested by the plugins:
+        #   (device name, plugin name) -> (due time (monotonic), context)
+        self._now = time.monotonic()
+        self._follow_ups = {}
+
+        # plugins re-check through follow-ups instead of waiting in-between
+        for name in self.devices:
+            for plugin in self.plugins.get_device_plugins(name).values():
+                plugin.follow_ups = True
+
 
     def load_testbed(self, testbed_file):
 
@@ -90,11 +102,20 @@ class TimedManager(Manager):
 
 
     def get_device_plugins(self, device, interval):
+        '''get_device_plugins
 
+        returns the plugins to be executed on the device at this interval, or
+        the plugins with a follow-up execution due when interval is None.
+        '''
         plugin_runs = {}
 
-        # get list of plugin to be executed at this interval
-        for plugin_name in self.plugins._plugin_interval[interval]:
+        if interval is None:
+            plugin_names = self.plugins._cache
+        else:
+            # get list of plugin to be executed at this interval
+            plugin_names = self.plugins._plugin_interval[interval]
+
+        for plugin_name in plugin_names:
             device_plugin = self.plugins._cache[plugin_name].get(device.name,
                                                                  {})
             if not device_plugin:
@@ -102,19 +123,47 @@ class TimedManager(Manager):
             plugin = device_plugin.get('instance', None)
             if not plugin:
                 continue
+
+            follow_up = self._follow_ups.get((device.name,
+                                              get_plugin_name(plugin)))
+            if interval is None:
+                if not follow_up or follow_up[0] > self._now:
+                    continue
+                del self._follow_ups[(device.name, get_plugin_name(plugin))]
+                plugin.context = follow_up[1]
+            elif follow_up:
+                # the plugin is in the middle of a check
+                continue
+            else:
+                plugin.context = None
+
             plugin_runs[plugin_name] = plugin
 
         return plugin_runs
 
+    def schedule_follow_up(self, device, plugin, follow_up):
+        '''schedule_follow_up
+
+        schedules the follow-up execution requested by a plugin, in place of
+        its regular executions until then.
+        '''
+        # in seconds, whatever the duration of the ticks
+        due = time.monotonic() + max(0, float(follow_up['delay']))
+        self._follow_ups[(device, plugin)] = (due, follow_up['context'])
+
     def start(self):
         try:
             interval = 0
+            scheduled = time.time()
             while True:
 
                 interval += 1
+                # delay past the schedule of the tick
+                self.stats.tick(time.time() - scheduled)
                 time_now = datetime.utcnow().strftime("%b %d %H:%M:%S UTC %Y")
                 self.run(time_now, interval)
                 time.sleep(1)
+                scheduled += 1
 
         except SystemExit:
             logger.warning('System Exit detected...')
@@ -143,27 +192,50 @@ class TimedManager(Manager):
 
         '''
 
-        for i in self.plugins._intervals:
+        self._now = time.monotonic()
 
-            # skip if not it's turn
-            if interval % i:
-                continue
+        ran = False
+        with self.tracer.span('tick', cat = 'manager', tick = interval):
+            for i in self.plugins._intervals:
+
+                # skip if not it's turn
+                if interval % i:
+                    continue
 
-            super().run('{} ({})'.format(tag, i), i)
+                super().run('{} ({})'.format(tag, i), i)
+                ran = True
+
+            # follow-up executions due
+            if any(due <= self._now for due, _ in
+                   self._follow_ups.values()):
+                super().run('{} (follow-up)'.format(tag), None)
+                ran = True
+
+            # once for all the tasks of the tick
+            if ran:
+                super().post_task(tag)
+
+    def post_task(self, tag):
+        # the tasks of a tick are posted together, see run()
+        pass
 
 
     def call_plugin(self, device, plugins):
 
         is_connected = self.is_connected(device.name, device)
-        if not is_connected:            
-            connection = self.connections.get(device.name, {})
-            timeout = connection.pop('timeout', self.connection_timeout)
+        if not is_connected:
+            # reconnect using the same connection profile as setup
+            connection = self.get_connection(device.name)
             logger.info('Lost Connection - Attempt to Recover Connection '
                         'with Device ({})'.format(device.name))
+            # device may have been reloaded, learned facts are no longer valid
+            get_facts(device).clear()
             # best effort, attempt to connect at least once.
+            self.stats.connection(device.name, 'reconnects')
             try:
-                device.connect(timeout=timeout,
-                               **connection)
+                with self.tracer.span('reconnect', cat = 'connection',
+                                      device = device.name):
+                    device.connect(**connection)
             except Exception as e:
                 connection_failed = ('Lost Connection, failed to '
                                      'recover. exception: ({})'.format(str(e)))
@@ -172,6 +244,8 @@ class TimedManager(Manager):
                 is_connected = self.is_connected(device.name, device)
                 logger.info('Connection Re-Established for '
                             'Device ({})'.format(device.name))
+            if not is_connected:
+                self.stats.connection(device.name, 'reconnect_failures')
 
         results = dict()
         for plugin in plugins:
@@ -190,10 +264,8 @@ class TimedManager(Manager):
                                         datetime.utcnow().isoformat():
                                         connection_failed
                                       }
+                self.stream_results(result)
 
             recursive_update(results, result)
 
-            if hasattr(self.instance, 'post_call_plugin'):
-                self.instance.post_call_plugin(device, result)
-
         return results
\ No newline at end of file
@@ -0,0 +1,255 @@
+'''Metrics
+
+Numeric samples emitted by the plugins (eg: five minutes CPU usage), kept per
+device and metric for trend data over the run.
+
+Samples are stored in fixed-size ring buffers backed by arrays, along with
+round-robin downsampling tiers (eg: one minute resolution over a day, one
+hour resolution over a month) keeping the minimum, maximum and average of the
+samples of each period. Memory used is bounded and known upfront, regardless
+of the duration of the run: older samples and periods are overwritten.
+'''
+
+import time
+import logging
+from array import array
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+# module logger
+logger = logging.getLogger(__name__)
+
+
+class RingBuffer(object):
+    '''RingBuffer class
+
+    fixed-size buffer of (timestamp, value) samples, the oldest samples are
+    overwritten once full.
+
+    Arguments
+    ---------
+        size (int): samples kept
+    '''
+
+    def __init__(self, size):
+        self.size = size
+        self.timestamps = array('d', [0.0]) * size
+        self.values = array('d', [0.0]) * size
+        # samples appended since creation
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def __iter__(self):
+        # oldest to newest
+        for n in range(self.count - len(self), self.count):
+            i = n % self.size
+            yield self.timestamps[i], self.values[i]
+
+    def append(self, timestamp, value):
+        i = self.count % self.size
+        self.timestamps[i] = timestamp
+        self.values[i] = value
+        self.count += 1
+
+    @property
+    def first(self):
+        '''timestamp of the oldest sample kept, None when empty'''
+        if not self.count:
+            return None
+        return self.timestamps[(self.count - len(self)) % self.size]
+
+    @property
+    def last(self):
+        '''newest (timestamp, value) sample, None when empty'''
+        if not self.count:
+            return None
+        i = (self.count - 1) % self.size
+        return self.timestamps[i], self.values[i]
+
+
+class Tier(object):
+    '''Tier class
+
+    fixed-size round-robin archive of consolidated periods: the minimum,
+    maximum, sum and count of the samples of each period.
+
+    Arguments
+    ---------
+        resolution (int): period length, in seconds
+        size (int): periods kept
+    '''
+
+    def __init__(self, resolution, size):
+        self.resolution = resolution
+        self.size = size
+        self.starts = array('d', [0.0]) * size
+        self.mins = array('d', [0.0]) * size
+        self.maxs = array('d', [0.0]) * size
+        self.sums = array('d', [0.0]) * size
+        self.counts = array('L', [0]) * size
+        # periods started since creation
+        self.count = 0
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def __iter__(self):
+        # oldest to newest: (start, min, max, avg, count)
+        for n in range(self.count - len(self), self.count):
+            i = n % self.size
+            yield (self.starts[i], self.mins[i], self.maxs[i],
+                   self.sums[i] / self.counts[i], self.counts[i])
+
+    def append(self, timestamp, value):
+        start = timestamp - timestamp % self.resolution
+        i = (self.count - 1) % self.size
+
+        # sample within the current period (late samples included)
+        if self.count and start <= self.starts[i]:
+            self.mins[i] = min(self.mins[i], value)
+            self.maxs[i] = max(self.maxs[i], value)
+            self.sums[i] += value
+            self.counts[i] += 1
+            return
+
+        i = self.count % self.size
+        self.starts[i] = start
+        self.mins[i] = self.maxs[i] = self.sums[i] = value
+        self.counts[i] = 1
+        self.count += 1
+
+    @property
+    def first(self):
+        '''start of the oldest period kept, None when empty'''
+        if not self.count:
+            return None
+        return self.starts[(self.count - len(self)) % self.size]
+
+
+class Metric(object):
+    '''Metric class
+
+    samples of a metric, along with their downsampling tiers.
+
+    Arguments
+    ---------
+        samples (int): raw samples kept
+        tiers (list): (resolution, size) of each downsampling tier
+    '''
+
+    def __init__(self, samples = 360, tiers = ()):
+        self.samples = RingBuffer(samples)
+        self.tiers = [Tier(resolution, size) for resolution, size in
+                      sorted(tiers)]
+
+    def add(self, timestamp, value):
+        self.samples.append(timestamp, value)
+        for tier in self.tiers:
+            tier.append(timestamp, value)
+
+    @property
+    def last(self):
+        return self.samples.last
+
+    def query(self, start = None, end = None):
+        '''query
+
+        returns the minimum, maximum, average and count of the samples between
+        start and end (timestamps), from the raw samples when they go back to
+        start, from the finest tier going back to start otherwise.
+        '''
+        if not self.samples.count:
+            return None
+
+        resolution, periods = self._periods(start)
+
+        minimum = maximum = None
+        total = count = 0
+        for ts, lo, hi, avg, n in periods:
+            if end is not None and ts > end:
+                break
+            # periods partially before start are included
+            if start is not None and ts + resolution < start:
+                continue
+            minimum = lo if minimum is None else min(minimum, lo)
+            maximum = hi if maximum is None else max(maximum, hi)
+            total += avg * n
+            count += n
+
+        if not count:
+            return None
+
+        return dict(min = minimum, max = maximum, avg = total / count,
+                    count = count)
+
+    def _periods(self, start):
+        # raw samples, as periods of a single sample
+        if start is None or self.samples.first <= start or not self.tiers:
+            return 0, ((ts, v, v, v, 1) for ts, v in self.samples)
+
+        for tier in self.tiers:
+            if tier.first <= start:
+                break
+        return tier.resolution, iter(tier)
+
+
+class MetricStore(object):
+    '''MetricStore class
+
+    metrics of the testbed devices, by device and metric name.
+
+    Arguments
+    ---------
+        samples (int): raw samples kept per metric
+        tiers (list): (resolution, size) of the downsampling tiers
+    '''
+
+    def __init__(self, samples = 360, tiers = ()):
+        self.samples = samples
+        self.tiers = [tuple(tier) for tier in tiers]
+        self._metrics = {}
+
+    def __iter__(self):
+        return iter(sorted(self._metrics))
+
+    def get(self, device, name):
+        return self._metrics.get((device, name))
+
+    def record(self, device, name, value, timestamp = None):
+        '''record
+
+        records a sample of the device metric, timestamp defaults to now.
+        '''
+        metric = self._metrics.get((device, name))
+        if metric is None:
+            metric = self._metrics[(device, name)] = Metric(self.samples,
+                                                            self.tiers)
+        metric.add(time.time() if timestamp is None else timestamp,
+                   float(value))
+
+    def query(self, device, name, start = None, end = None):
+        '''query
+
+        returns the minimum, maximum, average and count of the device metric
+        samples between start and end, None when there are none.
+        '''
+        metric = self._metrics.get((device, name))
+        if metric is None:
+            return None
+        return metric.query(start = start, end = end)
+
+    def summary(self):
+        '''summary
+
+        returns the statistics and last value of all metrics, by device.
+        '''
+        summary = {}
+        for device, name in self:
+            metric = self._metrics[(device, name)]
+            stats = metric.query()
+            stats['last'] = metric.last[1]
+            summary.setdefault(device, {})[name] = stats
+        return summary
@@ -1,3 +1,4 @@
+import time
 import logging
 
 from pyats.datastructures import classproperty
@@ -21,6 +22,19 @@ class BasePlugin(object):
         # stores the plugin's parsed argument results
         self.args = None
 
+        # directory plugins may keep state in across executions, provided by
+        # the manager (executions run in separate processes)
+        self.runinfo_dir = None
+
+        # whether the manager schedules follow-up executions, and the context
+        # handed over to the current follow-up execution (None otherwise)
+        self.follow_ups = False
+        self.context = None
+        self._follow_up = None
+
+        # numeric samples emitted by the current execution
+        self._samples = []
+
         self.interval = interval
 
     @property
@@ -82,5 +96,31 @@ class BasePlugin(object):
         self.args, _ = self.parser.parse_known_args(argv)
 
 
+    def follow_up(self, delay, context = None):
+        '''follow_up
+
+        requests another execution of the plugin on the current device after
+        delay (in seconds), instead of waiting within the current execution.
+        The context is handed over to that execution as self.context.
+
+        Only available when self.follow_ups is set by the manager.
+        '''
+        self._follow_up = dict(delay = delay, context = context)
+
+    def emit(self, name, value, timestamp = None):
+        '''emit
+
+        emits a numeric sample of a metric of the current device (eg: CPU
+        usage), kept by the manager for trend data over the run.
+
+        Arguments
+        ---------
+            name (str): metric name
+            value (int/float): sample value
+            timestamp (float): sample time (epoch), defaults to now
+        '''
+        self._samples.append((name, float(value),
+                              time.time() if timestamp is None else timestamp))
+
     def execution(self, device):
         raise NotImplementedError("To be implemented")
\ No newline at end of file
@@ -72,14 +72,18 @@ def genie_telemetry_processor(section):
         if telemetry_plugins:
             kwargs['plugins'] = telemetry_plugins
 
-        # temporary disable task log fork support
-        log.managed_handlers.tasklog.disableForked()
+        # temporary disable task log fork support, unless the records of the
+        # workers are written by this process
+        forked = not genie_telemetry.log_pipeline
+        if forked:
+            log.managed_handlers.tasklog.disableForked()
 
         # Run all plugins on the section (CS/Trigger/CC)
         genie_telemetry.run(uid, **kwargs)
 
         # restore task log fork support
-        log.managed_handlers.tasklog.enableForked()
+        if forked:
+            log.managed_handlers.tasklog.enableForked()
 
         # iterating over plugin, results
         results = genie_telemetry.results.get(uid, {})
@@ -0,0 +1,10 @@
+# expose internal modules
+from .retention import RetainedResults, format_statuses
+from .journal import ResultsJournal, load_journal, dump_journal
+from .store import ResultsStore, query_results
+from .timeline import StatusTimeline, StatusTimelines
+from .recorder import TransitionRecorder
+from .report import ReportText
+from .board import StatusBoard, read_board
+from .wire import (WireNames, WireBlobs, WireResult, encode_results,
+                   decode_results)
@@ -0,0 +1,161 @@
+'''Status Board
+
+Memory-mapped file of the current status of each plugin on each device, kept
+by the manager in the runinfo directory (telemetry.board) and updated in place
+as results come back. External dashboards and scripts read it at any rate,
+without going through the manager.
+
+The layout is fixed: a header followed by one row per device/plugin, assigned
+when the board is created.
+
+    header: magic, version, rows, created (timestamp)
+    row:    sequence, device, plugin, status code, since (timestamp of the
+            current status), updated (timestamp of the latest result),
+            duration (seconds of the latest execution)
+
+Rows are updated under a sequence number (seqlock): the writer makes it odd,
+writes the row, then makes it even again. Readers read the sequence, copy the
+row and read the sequence again, and retry rows whose sequence was odd or
+changed in the meantime.
+'''
+
+import os
+import mmap
+import time
+import struct
+import logging
+
+from genie.telemetry.status import HealthStatus
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+# module logger
+logger = logging.getLogger(__name__)
+
+BOARD_FILE = 'telemetry.board'
+
+MAGIC = b'GTSB'
+BOARD_VERSION = 1
+
+HEADER = struct.Struct('<4sHHId')
+SEQUENCE = struct.Struct('<I')
+FIELDS = struct.Struct('<64s128sBxxxddd')
+ROW = struct.Struct('<I64s128sBxxxddd')
+
+# status code of the plugins without results yet
+NO_STATUS = 255
+
+def _name(value, size):
+    return value.encode('utf-8')[:size]
+
+
+class StatusBoard(object):
+    '''StatusBoard class
+
+    Arguments
+    ---------
+        directory (str): directory of the board file
+        rows (list): (device, plugin) names of the rows
+    '''
+
+    def __init__(self, directory, rows):
+        self.path = os.path.join(directory, BOARD_FILE)
+        self.rows = {}
+
+        size = HEADER.size + ROW.size * max(len(rows), 1)
+        with open(self.path, 'wb') as f:
+            f.truncate(size)
+
+        self._file = open(self.path, 'r+b')
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+        HEADER.pack_into(self._map, 0, MAGIC, BOARD_VERSION, 0, len(rows),
+                         time.time())
+        for index, (device, plugin) in enumerate(rows):
+            self.rows[(device, plugin)] = index
+            ROW.pack_into(self._map, self._offset(index), 0,
+                          _name(device, 64), _name(plugin, 128), NO_STATUS,
+                          0, 0, 0)
+
+    def _offset(self, index):
+        return HEADER.size + index * ROW.size
+
+    def update(self, device, plugin, status, duration = None,
+               timestamp = None):
+        '''update
+
+        records the latest status of a plugin on a device, in place.
+        '''
+        index = self.rows.get((device, plugin))
+        if index is None or self._map is None:
+            logger.debug('No status board row for {} on device {}'.format(
+                                                            plugin, device))
+            return
+
+        code = int(status)
+        timestamp = time.time() if timestamp is None else timestamp
+        offset = self._offset(index)
+        seq, device_, plugin_, previous, since, _, _ = \
+                                        ROW.unpack_from(self._map, offset)
+        if previous != code:
+            since = timestamp
+
+        # odd sequence while the row is being written
+        SEQUENCE.pack_into(self._map, offset, seq + 1)
+        FIELDS.pack_into(self._map, offset + SEQUENCE.size, device_, plugin_,
+                         code, since, timestamp, duration or 0)
+        SEQUENCE.pack_into(self._map, offset, seq + 2)
+
+    def close(self):
+        if self._map is None:
+            return
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+        self._map = None
+
+
+def _read_row(data, offset, retries):
+    '''copy of a row, consistent with its sequence number'''
+    for _ in range(retries):
+        seq = SEQUENCE.unpack_from(data, offset)[0]
+        row = data[offset:offset + ROW.size]
+        if not seq % 2 and SEQUENCE.unpack_from(data, offset)[0] == seq:
+            return ROW.unpack(row)
+        # row being written, read it again
+        time.sleep(0.001)
+    raise RuntimeError('Status board row at offset {} is still being '
+                       'written'.format(offset))
+
+def read_board(path, retries = 10):
+    '''read_board
+
+    returns the rows of the status board at path (file or runinfo directory):
+    dicts of device, plugin, status, since, updated and duration. Status is
+    None for the plugins without results yet.
+    '''
+    if os.path.isdir(path):
+        path = os.path.join(path, BOARD_FILE)
+    if not os.path.isfile(path):
+        raise FileNotFoundError("No status board at '{}'".format(path))
+
+    with open(path, 'rb') as f, \
+            mmap.mmap(f.fileno(), 0, access = mmap.ACCESS_READ) as data:
+        magic, version, _, rows, _ = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != BOARD_VERSION:
+            raise ValueError("Unsupported status board '{}'".format(path))
+
+        board = []
+        for index in range(rows):
+            row = _read_row(data, HEADER.size + index * ROW.size, retries)
+            _, device, plugin, code, since, updated, duration = row
+            board.append(dict(
+                device = device.rstrip(b'\0').decode('utf-8', 'replace'),
+                plugin = plugin.rstrip(b'\0').decode('utf-8', 'replace'),
+                status = None if code == NO_STATUS else
+                         str(HealthStatus(code)).capitalize(),
+                since = since or None,
+                updated = updated or None,
+                duration = duration if updated else None))
+    return board
@@ -0,0 +1,170 @@
+'''Results Journal
+
+Append-only journal of the plugin results, written as they come back from the
+device executions: one JSON line per device/plugin result. Persistence costs
+the new results only on each tick, and results written before a crash are
+kept.
+
+The journal is flushed on each record and synced to disk periodically, and
+rotated into numbered segments (telemetry.journal.1, telemetry.journal.2, ...)
+once it reaches its maximum size. The reader rebuilds the results of the
+telemetry.yaml report from the segments, in order.
+'''
+
+import os
+import re
+import json
+import time
+import logging
+
+from pyats.datastructures import OrderableDict
+
+from genie.telemetry.utils import ordered_yaml_dump
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+# module logger
+logger = logging.getLogger(__name__)
+
+JOURNAL_FILE = 'telemetry.journal'
+
+class ResultsJournal(object):
+    '''ResultsJournal class
+
+    Arguments
+    ---------
+        directory (str): directory of the journal
+        fsync_interval (int): seconds between syncs to disk, on each record
+                              when 0
+        max_bytes (int): size of the journal segments, not rotated when 0
+    '''
+
+    def __init__(self, directory, fsync_interval = 5,
+                 max_bytes = 64 * 1024 * 1024):
+        self.path = os.path.join(directory, JOURNAL_FILE)
+        self.fsync_interval = fsync_interval
+        self.max_bytes = max_bytes
+
+        self._file = None
+        self._synced = 0
+        self._segments = len([s for s in journal_segments(self.path)
+                              if s != self.path])
+
+    def write(self, tag, plugin, device, status, result):
+        '''write
+
+        appends the result of a plugin on a device.
+        '''
+        record = json.dumps(dict(tag = tag,
+                                 plugin = plugin,
+                                 device = device,
+                                 status = str(status).capitalize(),
+                                 result = result),
+                            default = str)
+
+        if self._file is None:
+            self._file = open(self.path, 'a')
+
+        self._file.write(record + '\n')
+        self._file.flush()
+
+        now = time.time()
+        if now - self._synced >= self.fsync_interval:
+            os.fsync(self._file.fileno())
+            self._synced = now
+
+        if self.max_bytes and self._file.tell() >= self.max_bytes:
+            self.rotate()
+
+    def rotate(self):
+        '''rotate
+
+        closes the current segment, further records go to a new one.
+        '''
+        self.close()
+        if not os.path.exists(self.path):
+            return
+        self._segments += 1
+        os.rename(self.path, '{}.{}'.format(self.path, self._segments))
+
+    def close(self):
+        if self._file is None:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+
+
+def journal_segments(path):
+    '''journal_segments
+
+    returns the segments of the journal at path (file or directory), oldest
+    first.
+    '''
+    if os.path.isdir(path):
+        path = os.path.join(path, JOURNAL_FILE)
+
+    directory, name = os.path.split(path)
+    pattern = re.compile(r'^{}\.(\d+)$'.format(re.escape(name)))
+
+    numbered = []
+    for filename in os.listdir(directory or '.'):
+        m = pattern.match(filename)
+        if m:
+            numbered.append((int(m.group(1)),
+                             os.path.join(directory, filename)))
+
+    segments = [segment for _, segment in sorted(numbered)]
+    if os.path.exists(path):
+        segments.append(path)
+    return segments
+
+
+def read_journal(path):
+    '''read_journal
+
+    yields the records of the journal at path (file or directory), in order.
+    Records truncated by a crash are skipped.
+    '''
+    for segment in journal_segments(path):
+        with open(segment) as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    logger.warning('Skipping truncated record in {}'.format(
+                                                                    segment))
+
+
+def load_journal(path):
+    '''load_journal
+
+    rebuilds the results of the telemetry.yaml report from the journal at path
+    (file or directory): tag -> plugin -> device -> status and result.
+    '''
+    results = OrderableDict()
+    for record in read_journal(path):
+        device = results.setdefault(record['tag'], OrderableDict())\
+                        .setdefault(record['plugin'], OrderableDict())\
+                        .setdefault(record['device'], dict(result = {}))
+        device['status'] = record['status']
+        device['result'].update(record['result'] or {})
+    return results
+
+
+def dump_journal(path, stream = None):
+    '''dump_journal
+
+    rebuilds the telemetry.yaml report from the journal at path (file or
+    directory), into stream (returned as str when None).
+    '''
+    results = load_journal(path)
+
+    if stream is None:
+        return ordered_yaml_dump(results, default_flow_style = False)
+
+    for tag, plugins in results.items():
+        ordered_yaml_dump({tag: plugins}, stream = stream,
+                          default_flow_style = False)
@@ -0,0 +1,67 @@
+'''Transition Recorder
+
+On mostly healthy testbeds, most plugin results of a tick repeat the previous
+ones (eg: 'No cores found!'). In transitions recording mode, only the results
+changing the status or the messages of a plugin on a device are recorded:
+unchanged healthy results are counted along with the time they were last seen.
+Results which aren't OK are always recorded.
+'''
+
+from datetime import datetime
+
+from pyats.datastructures import OrderableDict
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+class TransitionRecorder(object):
+    '''TransitionRecorder class
+
+    tells unchanged healthy results apart, and counts them.
+    '''
+
+    def __init__(self):
+        # status code and messages of the last result, by device and plugin
+        self._last = {}
+        # unchanged healthy results, by device and plugin
+        self._unchanged = {}
+
+    def is_unchanged(self, device, plugin, status, result):
+        '''is_unchanged
+
+        returns whether the result is healthy and unchanged since the
+        previous one of the plugin on the device, counting it if so.
+        '''
+        result = result or {}
+        signature = (int(status),
+                     tuple(sorted(str(message) for message in result.values())))
+
+        previous = self._last.get((device, plugin))
+        self._last[(device, plugin)] = signature
+        if signature[0] != 0 or signature != previous:
+            return False
+
+        unchanged = self._unchanged.setdefault((device, plugin),
+                                               dict(count = 0))
+        unchanged['count'] += 1
+        unchanged['last_seen'] = max(result) if result else \
+                    datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%S.%fZ')
+        return True
+
+    def report(self):
+        '''report
+
+        returns the counters of the unchanged healthy results, in the shape of
+        the results of a tag: plugin -> device -> status and result.
+        '''
+        report = OrderableDict()
+        for device, plugin in sorted(self._unchanged):
+            unchanged = self._unchanged[(device, plugin)]
+            report.setdefault(plugin, OrderableDict())[device] = dict(
+                        status = 'Ok',
+                        result = {unchanged['last_seen']:
+                                  'Unchanged in {} more execution(s)'.format(
+                                                        unchanged['count'])},
+                        unchanged = unchanged['count'],
+                        last_seen = unchanged['last_seen'])
+        return report
@@ -0,0 +1,45 @@
+'''Report Text
+
+Text of the final report (eg: for the email report), only rendered when
+used: read back from the report file written, rather than serializing the
+results a second time. Spilled tags are included either way, the text
+matches the report file.
+'''
+
+import os
+from io import StringIO
+
+from genie.telemetry.utils import ordered_yaml_dump
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+class ReportText(object):
+    '''ReportText class
+
+    Arguments
+    ---------
+        results (RetainedResults): results of the report
+        path (str): report file written, None when not written
+    '''
+
+    def __init__(self, results, path = None):
+        self.results = results
+        self.path = path
+        self._text = None
+
+    def __str__(self):
+        if self._text is None:
+            if self.path and os.path.exists(self.path):
+                with open(self.path) as f:
+                    self._text = f.read()
+            elif hasattr(self.results, 'dump'):
+                # same stream as the report file, spilled tags included
+                stream = StringIO()
+                self.results.dump(stream)
+                self._text = stream.getvalue()
+            else:
+                self._text = ordered_yaml_dump(self.results,
+                                               default_flow_style = False,
+                                               default_style = '')
+        return self._text
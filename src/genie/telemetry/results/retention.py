@@ -0,0 +1,183 @@
+'''Results Retention
+
+Plugin results of the manager are kept by tag (eg: by tick of the timed
+manager), and grow along with the duration of the run. Only the last ticks
+(in number or in minutes) are retained in memory: older ticks are spilled to
+a gzip-compressed JSON lines file, and streamed back into the final report.
+'''
+
+import os
+import gzip
+import json
+import time
+import logging
+import tempfile
+
+from pyats.datastructures import OrderableDict
+
+from genie.telemetry.utils import ordered_yaml_dump
+
+from .wire import WireResult
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+# module logger
+logger = logging.getLogger(__name__)
+
+def format_statuses(plugins):
+    '''format_statuses
+
+    formats the statuses of the plugin results of a tag for the report, in
+    place.
+    '''
+    for devices in plugins.values():
+        for name, device in devices.items():
+            # results sent back by the children, decoded for the report
+            if isinstance(device, WireResult):
+                device = devices[name] = device.to_dict()
+            device['status'] = str(device.get('status', 'OK')).capitalize()
+    return plugins
+
+
+class RetainedResults(OrderableDict):
+    '''RetainedResults class
+
+    results by tag, retaining the last tags only in memory.
+
+    Arguments
+    ---------
+        retain_ticks (int): tags kept in memory, all when None
+        retain_minutes (int): minutes of tags kept in memory, all when None
+        spill (bool): spill older tags to disk, dropped otherwise
+        directory (str): directory of the spill file, a temporary file is
+                         used when None
+    '''
+
+    spill_file = 'telemetry_spill.jsonl.gz'
+
+    def __init__(self, retain_ticks = None, retain_minutes = None,
+                 spill = True, directory = None):
+        super().__init__()
+        self.retain_ticks = retain_ticks
+        self.retain_minutes = retain_minutes
+        self.spill = spill
+        self.directory = directory
+
+        # time each tag was added at
+        self._added = {}
+        self._path = None
+        # tags spilled to disk, or dropped
+        self.spilled = 0
+
+    def __setitem__(self, key, value):
+        if key not in self:
+            self._added[key] = time.time()
+        super().__setitem__(key, value)
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._added.pop(key, None)
+
+    def setdefault(self, key, default = None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    @property
+    def path(self):
+        '''path of the spill file, None until tags are spilled'''
+        return self._path
+
+    def retain(self):
+        '''retain
+
+        spills the tags beyond retention, keeping the newest tag in memory.
+        '''
+        expired = []
+        oldest = len(self) - (self.retain_ticks or len(self))
+        deadline = None
+        if self.retain_minutes is not None:
+            deadline = time.time() - self.retain_minutes * 60
+
+        for i, key in enumerate(list(self)[:-1]):
+            if i < oldest or (deadline is not None and
+                                 self._added[key] < deadline):
+                expired.append(key)
+            else:
+                break
+
+        if not expired:
+            return
+
+        if self.spill:
+            with gzip.open(self._open(), 'at') as f:
+                for key in expired:
+                    f.write(json.dumps([key, format_statuses(self[key])],
+                                       default = str) + '\n')
+
+        for key in expired:
+            del self[key]
+        self.spilled += len(expired)
+
+        logger.debug('{} result tag(s) {} from memory'.format(
+                    len(expired), 'spilled' if self.spill else 'dropped'))
+
+    def _open(self):
+        if self._path is None:
+            if self.directory:
+                self._path = os.path.join(self.directory, self.spill_file)
+            else:
+                fd, self._path = tempfile.mkstemp(prefix = 'telemetry_spill',
+                                                  suffix = '.jsonl.gz')
+                os.close(fd)
+            # fresh spill file for this run
+            open(self._path, 'wb').close()
+        return self._path
+
+    def dump(self, stream, json_stream = None):
+        '''dump
+
+        writes the spilled tags followed by the tags in memory as YAML to the
+        stream, and as JSON to json_stream when given, in a single pass (one
+        tag at a time).
+        '''
+        if json_stream:
+            json_stream.write('{')
+
+        for i, (key, plugins) in enumerate(self.tags()):
+            ordered_yaml_dump({key: plugins},
+                              stream = stream,
+                              default_flow_style = False)
+            if json_stream:
+                json_stream.write('{}\n{}: {}'.format(
+                                    ',' if i else '',
+                                    json.dumps(str(key)),
+                                    json.dumps(plugins, default = str)))
+
+        if json_stream:
+            json_stream.write('\n}\n')
+
+    def tags(self):
+        '''tags
+
+        yields the spilled tags followed by the tags in memory, along with
+        their results (statuses formatted for the report).
+        '''
+        if self._path and os.path.exists(self._path):
+            with gzip.open(self._path, 'rt') as f:
+                for line in f:
+                    key, plugins = json.loads(line)
+                    yield key, plugins
+
+        for key, plugins in self.items():
+            yield key, format_statuses(plugins)
+
+    def discard(self):
+        '''discard
+
+        removes the spill file.
+        '''
+        if self._path and os.path.exists(self._path):
+            os.remove(self._path)
+        self._path = None
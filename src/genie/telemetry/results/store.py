@@ -0,0 +1,194 @@
+'''Results Store
+
+Optional SQLite sink of the plugin results, indexed by device, plugin, time
+and status: questions such as "which devices went critical on the traceback
+check between 02:00 and 03:00" are answered without loading the whole report.
+
+Each timestamped result of a device/plugin execution is a row. Rows are
+inserted in batches, within a single transaction per batch.
+'''
+
+import os
+import time
+import sqlite3
+import logging
+from datetime import datetime, timezone
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+# module logger
+logger = logging.getLogger(__name__)
+
+STORE_FILE = 'telemetry.db'
+
+SCHEMA = (
+    'CREATE TABLE IF NOT EXISTS results ('
+    '    timestamp REAL NOT NULL,'
+    '    tag TEXT,'
+    '    plugin TEXT COLLATE NOCASE,'
+    '    device TEXT COLLATE NOCASE,'
+    '    status TEXT COLLATE NOCASE,'
+    '    message TEXT)',
+    'CREATE INDEX IF NOT EXISTS results_device '
+    '    ON results (device, plugin, timestamp)',
+    'CREATE INDEX IF NOT EXISTS results_plugin '
+    '    ON results (plugin, status, timestamp)',
+    'CREATE INDEX IF NOT EXISTS results_status '
+    '    ON results (status, timestamp)',
+    'CREATE INDEX IF NOT EXISTS results_timestamp '
+    '    ON results (timestamp)',
+)
+
+def to_timestamp(value):
+    '''to_timestamp
+
+    converts an ISO 8601 date and time (eg: result keys such as
+    2018-03-01T21:17:00.631819Z, UTC unless specified) into a timestamp.
+    '''
+    if isinstance(value, (int, float)):
+        return float(value)
+
+    value = str(value).strip()
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+
+    for fmt in ('%Y-%m-%dT%H:%M:%S.%f%z', '%Y-%m-%dT%H:%M:%S%z',
+                '%Y-%m-%dT%H:%M:%S.%f', '%Y-%m-%dT%H:%M:%S',
+                '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M', '%Y-%m-%d %H:%M',
+                '%Y-%m-%d'):
+        try:
+            # python 3.5/3.6 %z doesn't support colons
+            if fmt.endswith('%z') and value[-3:-2] == ':':
+                parsed = datetime.strptime(value[:-3] + value[-2:], fmt)
+            else:
+                parsed = datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo = timezone.utc)
+        return parsed.timestamp()
+
+    raise ValueError("Invalid date and time '{}'".format(value))
+
+
+class ResultsStore(object):
+    '''ResultsStore class
+
+    Arguments
+    ---------
+        path (str): database file, or directory of the telemetry.db file
+        batch_size (int): rows inserted per transaction
+    '''
+
+    def __init__(self, path, batch_size = 500):
+        if os.path.isdir(path):
+            path = os.path.join(path, STORE_FILE)
+        self.path = path
+        self.batch_size = batch_size
+
+        self._conn = None
+        self._pending = []
+
+    @property
+    def connection(self):
+        # (re)opened on demand, eg: results written past close()
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            with self._conn:
+                for statement in SCHEMA:
+                    self._conn.execute(statement)
+        return self._conn
+
+    def write(self, tag, plugin, device, status, result):
+        '''write
+
+        queues the timestamped results of a plugin on a device for insertion.
+        '''
+        status = str(status).capitalize()
+        for key, message in (result or {}).items():
+            try:
+                timestamp = to_timestamp(key)
+            except ValueError:
+                timestamp = time.time()
+            self._pending.append((timestamp, str(tag), plugin, device,
+                                  status, str(message)))
+
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        '''flush
+
+        inserts the queued rows, within a single transaction.
+        '''
+        if not self._pending:
+            return
+        with self.connection as conn:
+            conn.executemany('INSERT INTO results VALUES (?, ?, ?, ?, ?, ?)',
+                             self._pending)
+        self._pending = []
+
+    def close(self):
+        self.flush()
+        if self._conn is None:
+            return
+        self._conn.close()
+        self._conn = None
+
+
+def query_results(path, device = None, plugin = None, status = None,
+                  start = None, end = None, tag = None, limit = None):
+    '''query_results
+
+    returns the results of the store at path (file or directory) matching the
+    criteria, in chronological order.
+
+    Arguments
+    ---------
+        path (str): database file, or directory of the telemetry.db file
+        device (str): device name
+        plugin (str): plugin name, as reported
+        status (str): status (ok, warning, critical, errored, partial)
+        start (str/float): ISO 8601 date and time, or timestamp
+        end (str/float): ISO 8601 date and time, or timestamp
+        tag (str): tag (eg: section or tick)
+        limit (int): maximum number of results
+    '''
+    if os.path.isdir(path):
+        path = os.path.join(path, STORE_FILE)
+    if not os.path.isfile(path):
+        raise FileNotFoundError("No results store at '{}'".format(path))
+
+    clauses, params = [], []
+    for column, value in (('device', device), ('plugin', plugin),
+                          ('status', status), ('tag', tag)):
+        if value is not None:
+            clauses.append('{} = ?'.format(column))
+            params.append(value)
+    if start is not None:
+        clauses.append('timestamp >= ?')
+        params.append(to_timestamp(start))
+    if end is not None:
+        clauses.append('timestamp <= ?')
+        params.append(to_timestamp(end))
+
+    statement = 'SELECT timestamp, tag, plugin, device, status, message ' \
+                'FROM results'
+    if clauses:
+        statement += ' WHERE ' + ' AND '.join(clauses)
+    statement += ' ORDER BY timestamp'
+    if limit:
+        statement += ' LIMIT {:d}'.format(int(limit))
+
+    conn = sqlite3.connect(path)
+    try:
+        columns = ('timestamp', 'tag', 'plugin', 'device', 'status',
+                   'message')
+        return [dict(zip(columns, row))
+                for row in conn.execute(statement, params)]
+    finally:
+        conn.close()
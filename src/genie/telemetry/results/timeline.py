@@ -0,0 +1,160 @@
+'''Status Timeline
+
+Status history of each plugin on each device, run-length encoded: repeated
+statuses extend the current run instead of adding entries, so the history of a
+mostly healthy device costs a few runs regardless of the number of ticks.
+Runs are held in typed arrays (start time, status code, executions), without
+the result meta.
+'''
+
+import time
+from array import array
+
+from genie.telemetry.status import HealthStatus
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+OK_CODE = 0
+
+class StatusTimeline(object):
+    '''StatusTimeline class
+
+    run-length encoded statuses of a plugin on a device.
+    '''
+
+    def __init__(self):
+        # start time, status code and number of executions of each run
+        self.starts = array('d')
+        self.codes = array('B')
+        self.counts = array('L')
+        # time of the latest execution
+        self.last_seen = None
+
+    def __len__(self):
+        return len(self.codes)
+
+    def record(self, status, timestamp = None):
+        '''record
+
+        records the status of an execution, timestamp defaults to now.
+        '''
+        code = int(status)
+        timestamp = time.time() if timestamp is None else timestamp
+
+        if self.codes and self.codes[-1] == code:
+            self.counts[-1] += 1
+        else:
+            self.starts.append(timestamp)
+            self.codes.append(code)
+            self.counts.append(1)
+        self.last_seen = timestamp
+
+    @property
+    def status(self):
+        '''current status, None when nothing was recorded'''
+        if not self.codes:
+            return None
+        return HealthStatus(self.codes[-1])
+
+    def runs(self):
+        '''runs
+
+        yields the (start, end, status code, executions) of each run, oldest
+        first. Runs end when the next one starts, the last one when last seen.
+        '''
+        for i in range(len(self.codes)):
+            end = self.starts[i + 1] if i + 1 < len(self.codes) \
+                  else self.last_seen
+            yield self.starts[i], end, self.codes[i], self.counts[i]
+
+    def transitions(self, start = None, end = None):
+        '''transitions
+
+        returns the number of status changes, between start and end
+        (timestamps) when given.
+        '''
+        return len([ts for ts in self.starts[1:]
+                    if (start is None or ts >= start) and
+                       (end is None or ts <= end)])
+
+    def uptime(self, start = None, end = None):
+        '''uptime
+
+        returns the percentage of time the plugin was OK on the device, over
+        the recorded history or between start and end (timestamps). None when
+        nothing was recorded in that period.
+        '''
+        total = up = 0.0
+        last_code = None
+        for run_start, run_end, code, _ in self.runs():
+            if start is not None:
+                run_start = max(run_start, start)
+            if end is not None:
+                run_end = min(run_end, end)
+            if run_end < run_start:
+                continue
+            total += run_end - run_start
+            if code == OK_CODE:
+                up += run_end - run_start
+            last_code = code
+
+        if last_code is None:
+            return None
+        if not total:
+            # single point in time
+            return 100.0 if last_code == OK_CODE else 0.0
+        return up * 100 / total
+
+    def since_non_ok(self, now = None):
+        '''since_non_ok
+
+        returns the seconds since the plugin was last not OK on the device: 0
+        when currently not OK, None when it never was.
+        '''
+        for i in range(len(self.codes) - 1, -1, -1):
+            if self.codes[i] == OK_CODE:
+                continue
+            if i == len(self.codes) - 1:
+                return 0.0
+            now = time.time() if now is None else now
+            return max(0.0, now - self.starts[i + 1])
+        return None
+
+
+class StatusTimelines(object):
+    '''StatusTimelines class
+
+    status timelines of the plugins, by device and plugin name.
+    '''
+
+    def __init__(self):
+        self._timelines = {}
+
+    def __iter__(self):
+        return iter(sorted(self._timelines))
+
+    def get(self, device, plugin):
+        return self._timelines.get((device, plugin))
+
+    def record(self, device, plugin, status, timestamp = None):
+        timeline = self._timelines.get((device, plugin))
+        if timeline is None:
+            timeline = self._timelines[(device, plugin)] = StatusTimeline()
+        timeline.record(status, timestamp)
+
+    def summary(self, now = None):
+        '''summary
+
+        returns the current status, uptime percentage, transitions and
+        seconds since last not OK of the plugins, by device.
+        '''
+        summary = {}
+        for device, plugin in self:
+            timeline = self._timelines[(device, plugin)]
+            summary.setdefault(device, {})[plugin] = dict(
+                                status = str(timeline.status),
+                                uptime = timeline.uptime(),
+                                transitions = timeline.transitions(),
+                                since_non_ok = timeline.since_non_ok(now))
+        return summary
@@ -0,0 +1,292 @@
+'''Results Wire Format
+
+Compact record of the plugin results crossing the process boundary, from the
+Pcall children (one per device) to the parent process.
+
+Instead of nested dicts of HealthStatus objects, each child returns a
+versioned tuple of flat records:
+
+    (version, [(plugin, device, status code, payload, follow-up, metrics,
+                duration), ...])
+
+where plugin and device are ids interned by the parent before forking (names
+unknown to the parent are sent as is), and payload is the pickled result meta,
+compressed when large, or the location of the meta in the shared blob file
+when larger still. The parent decodes the meta of a record only when its
+result is accessed.
+'''
+
+import os
+import zlib
+import fcntl
+import pickle
+import logging
+
+from genie.telemetry.status import (HealthStatus, OK, WARNING, CRITICAL,
+                                    ERRORED, PARTIAL)
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+# module logger
+logger = logging.getLogger(__name__)
+
+WIRE_VERSION = 1
+BLOB_FILE = 'telemetry_wire.blobs'
+
+# payloads larger than this are compressed
+COMPRESS_BYTES = 1024
+
+# payload kinds
+COMPRESSED = 1
+SPILLED = 2
+
+STATUSES = {status.code: status
+            for status in (OK, WARNING, CRITICAL, ERRORED, PARTIAL)}
+
+
+class WireNames(object):
+    '''WireNames class
+
+    plugin and device names interned by the parent. Ids assigned before the
+    children are forked are known to both sides.
+    '''
+
+    def __init__(self):
+        self.names = []
+        self.ids = {}
+
+    def intern(self, name):
+        try:
+            return self.ids[name]
+        except KeyError:
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+            return self.ids[name]
+
+    def id(self, name):
+        '''id of the name, or the name itself when not interned'''
+        return self.ids.get(name, name)
+
+    def name(self, id_):
+        return self.names[id_] if isinstance(id_, int) else id_
+
+
+class WireBlobs(object):
+    '''WireBlobs class
+
+    blob file shared by the children, for the meta payloads too large to be
+    sent through the pipe.
+
+    Arguments
+    ---------
+        directory (str): directory of the blob file
+        spill_bytes (int): payloads larger than this are spilled to the file,
+                           never when 0
+    '''
+
+    def __init__(self, directory, spill_bytes = 65536):
+        self.path = os.path.join(directory, BLOB_FILE)
+        self.spill_bytes = spill_bytes
+
+    def write(self, data):
+        '''write
+
+        appends data to the blob file, returns its offset.
+        '''
+        with open(self.path, 'ab') as f:
+            # children append concurrently
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0, os.SEEK_END)
+                offset = f.tell()
+                f.write(data)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+        return offset
+
+    def read(self, offset, length):
+        with open(self.path, 'rb') as f:
+            f.seek(offset)
+            return f.read(length)
+
+    def clear(self):
+        '''clear
+
+        removes the blob file, once the records of a run are decoded.
+        '''
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def encode_payload(meta, blobs = None):
+    '''encode_payload
+
+    returns the wire payload of the result meta: None when empty, the pickled
+    meta, compressed when large, or its location in the blob file.
+    '''
+    if not meta:
+        return None
+
+    data = pickle.dumps(meta, protocol = pickle.HIGHEST_PROTOCOL)
+    if len(data) <= COMPRESS_BYTES:
+        return data
+
+    data = zlib.compress(data, 1)
+    if blobs is not None and blobs.spill_bytes and \
+       len(data) > blobs.spill_bytes:
+        return (SPILLED, blobs.write(data), len(data))
+    return (COMPRESSED, data)
+
+
+def decode_payload(payload, blobs = None):
+    '''decode_payload
+
+    returns the result meta of a wire payload.
+    '''
+    if payload is None:
+        return {}
+    if isinstance(payload, bytes):
+        return pickle.loads(payload)
+
+    kind = payload[0]
+    if kind == COMPRESSED:
+        return pickle.loads(zlib.decompress(payload[1]))
+    if kind == SPILLED:
+        if blobs is None:
+            raise ValueError('Spilled result without blob file')
+        return pickle.loads(zlib.decompress(blobs.read(*payload[1:])))
+    raise ValueError('Unknown result payload kind {}'.format(kind))
+
+
+def encode_results(results, names = None, blobs = None):
+    '''encode_results
+
+    returns the wire record of the results of a child:
+    plugin -> device -> status, result, follow_up and metrics.
+    '''
+    names = names or WireNames()
+    records = []
+    for plugin, devices in results.items():
+        for device, execution in devices.items():
+            status = execution.get('status', OK)
+            records.append((names.id(plugin),
+                            names.id(device),
+                            int(status),
+                            encode_payload(execution.get('result'), blobs),
+                            execution.get('follow_up'),
+                            execution.get('metrics'),
+                            execution.get('duration')))
+    return (WIRE_VERSION, records)
+
+
+# keys of the results entry of a plugin on a device
+ENTRY_KEYS = ('status', 'result')
+
+
+class WireResult(object):
+    '''WireResult class
+
+    result of a plugin on a device, decoded from a wire record. The meta is
+    decoded on first access. Kept as the results entry of the plugin on the
+    device, read like a dict of its status and result.
+    '''
+
+    __slots__ = ('plugin', 'device', 'code', 'follow_up', 'metrics',
+                 'duration', '_payload', '_blobs', '_status', '_result')
+
+    def __init__(self, plugin, device, code, payload, follow_up = None,
+                 metrics = None, duration = None, blobs = None):
+        self.plugin = plugin
+        self.device = device
+        self.code = code
+        self.follow_up = follow_up
+        self.metrics = metrics or []
+        self.duration = duration
+        self._payload = payload
+        self._blobs = blobs
+        self._status = None
+        self._result = None
+
+    @property
+    def status(self):
+        if self._status is not None:
+            return self._status
+        try:
+            return STATUSES[self.code]
+        except KeyError:
+            return HealthStatus(self.code)
+
+    @property
+    def result(self):
+        if self._result is None:
+            self._result = decode_payload(self._payload, self._blobs)
+            self._payload = None
+        return self._result
+
+    def to_dict(self):
+        '''results entry of the plugin on the device: status and result'''
+        return dict(status = self.status, result = self.result)
+
+    def detach(self):
+        '''detach
+
+        reads the meta spilled to the blob file (still encoded), before the
+        blob file is cleared.
+        '''
+        payload = self._payload
+        if isinstance(payload, tuple) and payload[0] == SPILLED:
+            self._payload = (COMPRESSED, self._blobs.read(*payload[1:]))
+        self._blobs = None
+
+    def __getitem__(self, key):
+        if key not in ENTRY_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key, default = None):
+        return getattr(self, key) if key in ENTRY_KEYS else default
+
+    def __contains__(self, key):
+        return key in ENTRY_KEYS
+
+    def __iter__(self):
+        return iter(ENTRY_KEYS)
+
+    def keys(self):
+        return list(ENTRY_KEYS)
+
+
+def decode_results(record, names = None, blobs = None):
+    '''decode_results
+
+    yields the WireResult of each plugin on each device of a child's return:
+    a wire record, or plain plugin -> device -> execution dicts.
+    '''
+    names = names or WireNames()
+
+    if isinstance(record, dict):
+        for plugin, devices in record.items():
+            for device, execution in devices.items():
+                result = WireResult(plugin, device,
+                                    int(execution.get('status', OK)), None,
+                                    follow_up = execution.get('follow_up'),
+                                    metrics = execution.get('metrics'),
+                                    duration = execution.get('duration'))
+                result._status = execution.get('status', OK)
+                result._result = execution.get('result') or {}
+                yield result
+        return
+
+    version, records = record
+    if version != WIRE_VERSION:
+        raise ValueError('Unsupported results wire version {}'.format(version))
+
+    for plugin, device, code, payload, follow_up, metrics, duration \
+                                                                in records:
+        yield WireResult(names.name(plugin), names.name(device), code,
+                         payload, follow_up = follow_up, metrics = metrics,
+                         duration = duration, blobs = blobs)
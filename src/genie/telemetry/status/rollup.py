@@ -0,0 +1,95 @@
+'''Status Rollup
+
+Rollup of the plugin statuses per device, and of the device statuses overall,
+maintained incrementally: each status change of a plugin on a device updates
+the counters of that device, and the overall counters when the rollup status
+of the device changes. Rollup statuses and counters are read in constant time.
+'''
+
+from .statuses import HealthStatus
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+OK_CODE = 0
+
+def roll_up(counts):
+    '''roll_up
+
+    returns the rollup status of statuses counted by code, from OK.
+    '''
+    status = HealthStatus(OK_CODE)
+    for code in sorted(counts):
+        if counts[code]:
+            status += HealthStatus(code)
+    return status
+
+
+class StatusRollup(object):
+    '''StatusRollup class
+
+    statuses of the plugins on each device, and their rollups.
+    '''
+
+    def __init__(self):
+        # status code of each plugin on each device
+        self._plugins = {}
+        # plugin status codes counted by device
+        self._counts = {}
+        # rollup status of each device
+        self._devices = {}
+        # device rollup statuses counted by name
+        self._statuses = {}
+
+    def add_device(self, device):
+        '''add_device
+
+        adds a device, OK until its plugins report otherwise.
+        '''
+        if device in self._devices:
+            return
+        self._counts[device] = {}
+        self._devices[device] = HealthStatus(OK_CODE)
+        self._statuses['ok'] = self._statuses.get('ok', 0) + 1
+
+    def update(self, device, plugin, status):
+        '''update
+
+        records the status of a plugin on a device, updating the rollups when
+        the status changed.
+        '''
+        code = int(status)
+        previous = self._plugins.get((device, plugin))
+        if previous == code:
+            return
+        self._plugins[(device, plugin)] = code
+
+        self.add_device(device)
+        counts = self._counts[device]
+        if previous is not None:
+            counts[previous] -= 1
+        counts[code] = counts.get(code, 0) + 1
+
+        rollup = roll_up(counts)
+        current = self._devices[device]
+        if rollup == current:
+            return
+        self._devices[device] = rollup
+        self._statuses[current.name] -= 1
+        self._statuses[rollup.name] = self._statuses.get(rollup.name, 0) + 1
+
+    def device_status(self, device):
+        '''rollup status of the plugins on the device'''
+        return self._devices.get(device, HealthStatus(OK_CODE))
+
+    @property
+    def statuses(self):
+        '''number of devices by rollup status name'''
+        return {name: count for name, count in self._statuses.items()
+                if count}
+
+    @property
+    def status(self):
+        '''rollup status of all devices'''
+        return roll_up({HealthStatus.__str_map__[name]: count
+                        for name, count in self._statuses.items()})
@@ -0,0 +1,58 @@
+'''Test Helpers
+
+Helpers shared by the test modules.
+'''
+
+# Python
+import os
+import time
+import unittest
+from shutil import rmtree
+from tempfile import mkdtemp
+from unittest.mock import Mock, patch
+
+# ATS
+from pyats.topology import loader
+
+# GenieTelemetry
+from genie.telemetry import Manager
+from genie.telemetry.tests.scripts import followupplugin
+
+# module of the follow-up plugin, also its name in the results
+FOLLOW_UP_PLUGIN = 'genie.telemetry.tests.scripts.followupplugin'
+
+SCRIPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                           'scripts')
+
+def load_testbed():
+    '''testbed of the tests (scripts/testbed.yaml), with mocked connections'''
+    return loader.load(os.path.join(SCRIPTS_DIR, 'testbed.yaml'))
+
+def follow_up_manager(testbed, cls=Manager, interval=5, config=None,
+                      **kwargs):
+    '''manager of the follow-up plugin (scripts/followupplugin) on the
+    testbed, with the given configuration sections, set up'''
+    config = dict(config or {})
+    config['plugins'] = {'followupplugin': {'interval': interval,
+                                            'module': FOLLOW_UP_PLUGIN}}
+    with patch('genie.telemetry.config.plugins.PluginManager.'
+               'load_plugin_cls', return_value=followupplugin.Plugin):
+        manager = cls(testbed=testbed, configuration=config, **kwargs)
+    manager.setup()
+    return manager
+
+def monotonic(now):
+    '''patches the monotonic clock of the timed manager, to now[0]'''
+    clock = Mock(wraps=time)
+    clock.monotonic.side_effect = lambda: now[0]
+    return patch('genie.telemetry.manager.timedmanager.time', clock)
+
+
+class RuninfoTestcase(unittest.TestCase):
+    '''test case with a scratch runinfo directory (self.directory)'''
+
+    def setUp(self):
+        self.directory = mkdtemp(prefix='runinfo_dir')
+
+    def tearDown(self):
+        rmtree(self.directory)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+# Python
+import unittest
+from unittest.mock import Mock
+
+# GenieTelemetry
+from genie.libs.telemetry.plugins.libs import upload
+from genie.libs.telemetry.plugins.libs.artifacts import KnownArtifacts
+from genie.libs.telemetry.plugins.libs.iosxe import utils as iosxe_utils
+from genie.telemetry.status import OK, CRITICAL, ERRORED
+from genie.telemetry.tests.common import RuninfoTestcase
+
+
+class KnownArtifactsTestcase(RuninfoTestcase):
+
+    listing = ('Directory of bootflash:/core/\n'
+               '7763  -rw-  107847329  Jul 5 2018 12:53:55 +00:00  '
+               'kernel.rp_RP-EDISON_0_20180705125020.core.flat.gz\n')
+
+    def setUp(self):
+        super().setUp()
+        self.device = Mock(spec=['name', 'execute'])
+        self.device.name = 'P1'
+        self.device.execute.side_effect = lambda commands, **kwargs: {
+            c: self.listing if c == 'dir bootflash:/core' else
+               '%Error opening {} (No such file or directory)'.format(c)
+            for c in commands}
+
+    def check_cores(self, known):
+        cores = []
+        status = iosxe_utils.check_cores(self.device, cores, [], timeout=10,
+                                         known=known)
+        known.update(cores)
+        return status, cores
+
+    def test_new_artifacts_only(self):
+        status, cores = self.check_cores(KnownArtifacts('P1', self.directory))
+        self.assertEqual(status, CRITICAL)
+        self.assertEqual(cores[0]['size'], '107847329')
+        self.assertEqual(cores[0]['timestamp'], 'Jul 5 2018 12:53:55 +00:00')
+
+        # the index survives across processes
+        status, cores = self.check_cores(KnownArtifacts('P1', self.directory))
+        self.assertEqual(status, OK)
+        self.assertEqual(cores, [])
+        self.assertIn('No new cores found at location: bootflash:/core (1 '
+                      'already reported)', status.meta.values())
+
+        # same core name with a different size is a new artifact
+        self.listing = self.listing.replace('107847329', '107847330')
+        status, cores = self.check_cores(KnownArtifacts('P1', self.directory))
+        self.assertEqual(status, CRITICAL)
+
+    def test_known_once_uploaded(self):
+        known = KnownArtifacts('P1')
+        cores = [dict(location='flash:/core', core='a.core.gz')]
+        uploads = [dict(source='flash:/core//a.core.gz',
+                        destination='ftp://server/cores/',
+                        message='a.core.gz')]
+        self.device = Mock(spec=['name', 'filetransfer'])
+
+        # failed uploads are attempted again on the next execution
+        self.device.filetransfer.copyfile.side_effect = Exception('failed')
+        status = upload.upload_files(self.device, uploads, 10, known=known,
+                                     artifacts=cores)
+        self.assertEqual(status, ERRORED)
+        self.assertFalse(known.is_known(cores[0]))
+
+        self.device.filetransfer.copyfile.side_effect = None
+        status = upload.upload_files(self.device, uploads, 10, known=known,
+                                     artifacts=cores)
+        self.assertEqual(status, OK)
+        self.assertTrue(known.is_known(cores[0]))
+
+    def test_clear_all_cores(self):
+        self.device.execute.side_effect = None
+        cores = [dict(location='flash:/core', core='a.core.gz'),
+                 dict(location='flash:/core', core='b.core.gz')]
+        iosxe_utils.clear_cores(self.device, cores, [])
+        self.assertEqual(self.device.execute.call_count, 2)
+
+if __name__ == '__main__':
+
+    unittest.main()
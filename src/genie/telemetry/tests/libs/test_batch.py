@@ -0,0 +1,55 @@
+#!/usr/bin/env python
+
+# Python
+import unittest
+from unittest.mock import Mock
+
+# GenieTelemetry
+from genie.libs.telemetry.plugins.libs import batch
+
+
+class BatchExecutionTestcase(unittest.TestCase):
+
+    def setUp(self):
+        self.device = Mock(spec=['name', 'execute'])
+        self.device.name = 'P1'
+
+    def test_single_dispatch(self):
+        self.device.execute.return_value = {
+                    'dir flash:': 'core.gz',
+                    'dir harddisk:': "% Invalid input detected at '^' marker."}
+        outputs = batch.execute_batch(self.device,
+                                      ['dir flash:', 'dir harddisk:'], 10)
+        self.device.execute.assert_called_once_with(
+                ['dir flash:', 'dir harddisk:'], timeout=10, error_pattern=[])
+        self.assertEqual(list(outputs), ['dir flash:', 'dir harddisk:'])
+        self.assertEqual(outputs['dir flash:'], 'core.gz')
+        self.assertNotIn('dir flash:', outputs.errors)
+        self.assertIn('Invalid input', outputs.errors['dir harddisk:'])
+
+    def test_one_command_at_a_time(self):
+        # connections not supporting batches return a single output
+        error = Exception('timeout')
+        self.device.execute.side_effect = ['MOCKED', 'core.gz', error]
+        outputs = batch.execute_batch(self.device,
+                                      ['dir flash:', 'dir harddisk:'], 10)
+        self.assertEqual(self.device.execute.call_count, 3)
+        self.assertEqual(outputs['dir flash:'], 'core.gz')
+        self.assertEqual(outputs['dir harddisk:'], '')
+        self.assertIs(outputs.errors['dir harddisk:'], error)
+
+    def test_single_command(self):
+        # unicon returns the output itself for a single command list
+        self.device.execute.side_effect = lambda commands, **kwargs: (
+            'MOCKED' if isinstance(commands, list) and len(commands) == 1 else
+            'No alignment data has been recorded.')
+        outputs = batch.execute_batch(self.device, ['show alignment'], 10)
+        self.device.execute.assert_called_once_with(
+                'show alignment', timeout=10, error_pattern=[])
+        self.assertEqual(outputs['show alignment'],
+                         'No alignment data has been recorded.')
+        self.assertEqual(outputs.errors, {})
+
+if __name__ == '__main__':
+
+    unittest.main()
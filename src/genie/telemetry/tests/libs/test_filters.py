@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+
+# Python
+import unittest
+from unittest.mock import Mock
+
+# GenieTelemetry
+from genie.libs.telemetry.plugins.libs import filters
+
+
+class DeviceFilterTestcase(unittest.TestCase):
+
+    def setUp(self):
+        self.device = Mock(spec=['name', 'execute'])
+        self.device.name = 'P1'
+        self.modifier = lambda k: '| include {}'.format('|'.join(k))
+
+    def test_filtered(self):
+        self.device.execute.return_value = 'Traceback'
+        output, filtered = filters.execute_filtered(self.device,
+                                                    'show logging',
+                                                    ['Traceback', 'CPUHOG'],
+                                                    self.modifier, 10)
+        self.assertTrue(filtered)
+        self.device.execute.assert_called_once_with(
+                    'show logging | include Traceback|CPUHOG', timeout=10)
+
+    def test_not_expressible(self):
+        self.device.execute.return_value = 'log'
+        output, filtered = filters.execute_filtered(self.device,
+                                                    'show logging',
+                                                    ['Trace.*back'],
+                                                    self.modifier, 10)
+        self.assertFalse(filtered)
+        self.device.execute.assert_called_once_with('show logging',
+                                                    timeout=10)
+
+    def test_modifier_rejected(self):
+        self.device.execute.side_effect = [
+                            "% Invalid input detected at '^' marker.", 'log']
+        output, filtered = filters.execute_filtered(self.device,
+                                                    'show logging',
+                                                    ['Traceback'],
+                                                    self.modifier, 10)
+        self.assertFalse(filtered)
+        self.assertEqual(output, 'log')
+
+        # the rejected modifier is not attempted anymore
+        self.device.execute.side_effect = None
+        self.device.execute.return_value = 'log'
+        filters.execute_filtered(self.device, 'show logging', ['Traceback'],
+                                 self.modifier, 10)
+        self.device.execute.assert_called_with('show logging', timeout=10)
+        self.assertEqual(self.device.execute.call_count, 3)
+
+    def test_no_output(self):
+        # connections returning None for commands without output
+        self.device.execute.return_value = None
+        output, filtered = filters.execute_filtered(self.device,
+                                                    'show logging',
+                                                    ['Traceback'],
+                                                    self.modifier, 10)
+        self.assertEqual(output, '')
+        self.assertTrue(filtered)
+
+        output, filtered = filters.execute_filtered(self.device,
+                                                    'show logging',
+                                                    ['Trace.*back'],
+                                                    self.modifier, 10)
+        self.assertEqual(output, '')
+        self.assertFalse(filtered)
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python
+
+# Python
+import os
+import re
+import unittest
+
+# GenieTelemetry
+from genie.libs.telemetry.plugins.libs import listing
+from genie.telemetry.tests.common import SCRIPTS_DIR
+
+
+class ListingTestcase(unittest.TestCase):
+
+    def load(self, name):
+        path = os.path.join(SCRIPTS_DIR, 'listings', name)
+        with open(path) as f:
+            return f.read()
+
+    def test_iosxe(self):
+        cores, crashinfos = listing.parse_cores(self.load('iosxe_dir.txt'),
+                                                'bootflash:/core', 'iosxe')
+        self.assertEqual([c['name'] for c in cores], [
+            'PE1_RP_0_x86_64_crb_linux_iosd-universalk9-ms_15866_20171016'
+            '-155604-PDT.core.gz',
+            'kernel.rp_RP-EDISON_0_20180705125020.core.flat.gz',
+            'kernel.rp_RP-EDISON_0_20180705125020.txt'])
+        self.assertEqual(crashinfos, [dict(
+                                name='crashinfo_RP_00_00_20160730-054724-UTC',
+                                size='125746',
+                                timestamp='Jul 30 2016 05:47:28 +00:00',
+                                location='bootflash:/core')])
+
+        # user provided crashinfo report names
+        _, crashinfos = listing.parse_cores(self.load('iosxe_dir.txt'),
+                                            'flash:tracelogs*', 'iosxe',
+                                            crash_name=re.compile('tracelogs*'))
+        self.assertEqual(crashinfos[-1]['name'], 'tracelogs.452.gz')
+
+    def test_iosxr(self):
+        output = self.load('iosxr_dir.txt')
+        self.assertEqual(len(listing.parse_dir(output, 'disk0:', 'iosxr')), 5)
+
+        cores, _ = listing.parse_cores(output, 'disk0:', 'iosxr')
+        self.assertEqual([(c['size'], c['timestamp']) for c in cores],
+                         [('23596201', 'Tue Oct 31 05:16:50 2017'),
+                          ('18225345', 'Oct 23 05:15')])
+
+    def test_nxos(self):
+        entries = listing.parse_show_cores(self.load('nxos_show_cores.txt'))
+        self.assertEqual([(e['name'], e['module'], e['pid'], e['timestamp'])
+                          for e in entries],
+                         [('bgp-65000', '5', '1233', '2018-01-02 03:04:05'),
+                          ('ospf-1', '27', '4321', '2018-02-03 04:05:06')])
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,40 @@
+#!/usr/bin/env python
+
+# Python
+import unittest
+from unittest.mock import Mock
+
+# GenieTelemetry
+from genie.telemetry.status import OK, CRITICAL
+from genie.libs.telemetry.plugins.alignmentcheck.iosxe.plugin import Plugin
+
+
+class AlignmentCheckTestcase(unittest.TestCase):
+
+    def setUp(self):
+        self.plugin = Plugin()
+        self.plugin.parse_args([])
+        self.device = Mock(spec=['name', 'execute'])
+        self.device.name = 'P1'
+
+    def test_no_alignment_error(self):
+        self.device.execute.return_value = 'No alignment data recorded.'
+        self.assertEqual(self.plugin.execution(self.device), OK)
+        self.device.execute.assert_called_once_with('show alignment',
+                                                    timeout=300,
+                                                    error_pattern=[])
+
+    def test_failing_command(self):
+        # rejected or failing command is critical, on every execution
+        self.device.execute.return_value = (
+                        "% Invalid input detected at '^' marker.")
+        self.assertEqual(self.plugin.execution(self.device), CRITICAL)
+        self.assertEqual(self.plugin.execution(self.device), CRITICAL)
+        self.assertEqual(self.device.execute.call_count, 2)
+
+        self.device.execute.side_effect = Exception('timeout')
+        self.assertEqual(self.plugin.execution(self.device), CRITICAL)
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,43 @@
+#!/usr/bin/env python
+
+# Python
+import unittest
+from unittest.mock import Mock
+
+# GenieTelemetry
+from genie.libs.telemetry.plugins.crashdumps.plugin import Plugin
+from genie.telemetry.tests.common import RuninfoTestcase
+
+
+class CrashdumpsKnownArtifactsTestcase(RuninfoTestcase):
+
+    def setUp(self):
+        super().setUp()
+        self.device = Mock(spec=['name'])
+        self.device.name = 'P1'
+        self.core = dict(location='flash:/core', core='a.core.gz')
+
+    def plugin(self, runinfo_dir):
+        plugin = Plugin()
+        plugin.parse_args([])
+        plugin.runinfo_dir = runinfo_dir
+        return plugin
+
+    def test_tracked_in_runinfo(self):
+        self.plugin(self.directory).known_artifacts(self.device).update(
+                                                                [self.core])
+
+        # plugins of the next executions (new worker processes) know it
+        known = self.plugin(self.directory).known_artifacts(self.device)
+        self.assertTrue(known.is_known(self.core))
+
+    def test_not_tracked_without_runinfo(self):
+        plugin = self.plugin(None)
+        self.assertTrue(plugin.args.crashdumps_track_known)
+        with self.assertLogs('genie.libs.telemetry.plugins.crashdumps',
+                             'WARNING'):
+            self.assertIsNone(plugin.known_artifacts(self.device))
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python
+
+# Python
+import json
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# ATS
+from pyats.cli.__main__ import CLI
+
+# GenieTelemetry
+from genie.telemetry.commands import TelemetryCommand
+from genie.telemetry.results import StatusBoard, read_board
+from genie.telemetry.results.board import HEADER
+from genie.telemetry.status import OK, CRITICAL
+from genie.telemetry.tests.common import RuninfoTestcase
+
+
+class StatusBoardTestcase(RuninfoTestcase):
+
+    def test_board(self):
+        board = StatusBoard(self.directory, [('P1', 'crashdumps'),
+                                             ('P2', 'crashdumps')])
+        board.update('P1', 'crashdumps', OK, duration=1.5, timestamp=100)
+        board.update('P1', 'crashdumps', CRITICAL, duration=2, timestamp=160)
+        board.update('P1', 'crashdumps', CRITICAL, duration=2, timestamp=220)
+        # no row for plugins unknown to the board
+        board.update('P3', 'crashdumps', OK)
+
+        # read while the board is open, without the manager
+        rows = read_board(self.directory)
+        self.assertEqual(rows[0], dict(device='P1', plugin='crashdumps',
+                                       status='Critical', since=160.0,
+                                       updated=220.0, duration=2.0))
+        self.assertIsNone(rows[1]['status'])
+
+        # rows left in the middle of an update are not returned
+        board._map[HEADER.size] = 1
+        with self.assertRaises(RuntimeError):
+            read_board(self.directory, retries=2)
+        board._map[HEADER.size] = 2
+        board.close()
+
+        cli = CLI(prog='genie', commands=[TelemetryCommand])
+        with patch('sys.stdout', new_callable=StringIO) as stdout:
+            cli.main(['telemetry', 'status', self.directory, '--device', 'P1',
+                      '--format', 'json'])
+        rows = json.loads(stdout.getvalue())
+        self.assertEqual(rows[0]['since'], '1970-01-01T00:02:40Z')
+
+if __name__ == '__main__':
+
+    unittest.main()
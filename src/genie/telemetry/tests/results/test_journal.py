@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+
+# Python
+import os
+import yaml
+import unittest
+
+# GenieTelemetry
+from genie.telemetry.results import ResultsJournal, load_journal, dump_journal
+from genie.telemetry.status import OK, CRITICAL
+from genie.telemetry.tests.common import RuninfoTestcase
+
+
+class ResultsJournalTestcase(RuninfoTestcase):
+
+    def test_journal(self):
+        journal = ResultsJournal(self.directory, max_bytes=200)
+        for i in range(4):
+            for device in ('P1', 'P2'):
+                journal.write('tick {}'.format(i), 'crashdumps', device,
+                              CRITICAL if i == 3 else OK,
+                              {'2018-01-01T00:00:0{}Z'.format(i): 'msg'})
+        journal.close()
+
+        # rotated into numbered segments
+        files = sorted(os.listdir(self.directory))
+        self.assertIn('telemetry.journal.1', files)
+        self.assertGreater(len(files), 2)
+
+        # record truncated by a crash
+        with open(os.path.join(self.directory, 'telemetry.journal'), 'a') as f:
+            f.write('{"tag": "tick 4", "plu')
+
+        results = load_journal(self.directory)
+        self.assertEqual(list(results), ['tick {}'.format(i) for i in range(4)])
+        self.assertEqual(results['tick 3']['crashdumps']['P2'],
+                         {'status': 'Critical',
+                          'result': {'2018-01-01T00:00:03Z': 'msg'}})
+
+        content = yaml.safe_load(dump_journal(self.directory))
+        self.assertEqual(content['tick 0']['crashdumps']['P1']['status'], 'Ok')
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python
+
+# Python
+import yaml
+import unittest
+from io import StringIO
+
+# GenieTelemetry
+from genie.telemetry.results import RetainedResults, ReportText
+from genie.telemetry.status import OK
+from genie.telemetry.tests.common import RuninfoTestcase
+
+
+class RetainedResultsTestcase(RuninfoTestcase):
+
+    def add(self, results, tag):
+        results.setdefault(tag, {})['crashdumps'] = {
+                                        'P1': {'status': OK, 'result': {}}}
+        results.retain()
+
+    def test_retain_ticks(self):
+        results = RetainedResults(retain_ticks=2, directory=self.directory)
+        for i in range(5):
+            self.add(results, 'tick {}'.format(i))
+
+        self.assertEqual(list(results), ['tick 3', 'tick 4'])
+        self.assertEqual(results.spilled, 3)
+        self.assertTrue(results.path.startswith(self.directory))
+
+        # spilled ticks are streamed back, in order
+        stream = StringIO()
+        results.dump(stream)
+        content = yaml.safe_load(stream.getvalue())
+        self.assertEqual(list(content), ['tick {}'.format(i) for i in range(5)])
+        self.assertEqual(content['tick 0']['crashdumps']['P1']['status'],
+                         'Ok')
+
+    def test_retain_minutes(self):
+        results = RetainedResults(retain_minutes=10, spill=False)
+        self.add(results, 'old')
+        results._added['old'] -= 3600
+        self.add(results, 'new')
+
+        self.assertEqual(list(results), ['new'])
+        self.assertIsNone(results.path)
+
+        # the newest tick is always kept
+        results._added['new'] -= 3600
+        results.retain()
+        self.assertEqual(list(results), ['new'])
+
+    def test_report_text(self):
+        results = RetainedResults(retain_ticks=1, directory=self.directory)
+        self.add(results, 'tick 0')
+        self.add(results, 'tick 1')
+
+        # report file not written, spilled ticks rendered as well
+        content = yaml.safe_load(str(ReportText(results)))
+        self.assertEqual(list(content), ['tick 0', 'tick 1'])
+
+if __name__ == '__main__':
+
+    unittest.main()
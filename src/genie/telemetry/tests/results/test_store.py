@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+
+# Python
+import os
+import json
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+# ATS
+from pyats.cli.__main__ import CLI
+
+# GenieTelemetry
+from genie.telemetry.commands import TelemetryCommand
+from genie.telemetry.results import ResultsStore, query_results
+from genie.telemetry.status import OK, CRITICAL
+from genie.telemetry.tests.common import RuninfoTestcase
+
+
+class ResultsStoreTestcase(RuninfoTestcase):
+
+    def setUp(self):
+        super().setUp()
+        store = ResultsStore(self.directory, batch_size=2)
+        store.write('tick 1', 'Traceback Check Plugin', 'P1', CRITICAL,
+                    {'2018-03-01T02:30:00.000000Z': 'Traceback found'})
+        store.write('tick 1', 'Traceback Check Plugin', 'P2', OK,
+                    {'2018-03-01T02:30:01.000000Z': 'No patterns matched'})
+        store.write('tick 2', 'Crash Dumps Plugin', 'P1', CRITICAL,
+                    {'2018-03-01T03:30:00Z': 'Core dump generated'})
+        store.close()
+
+    def test_query(self):
+        rows = query_results(self.directory, status='critical',
+                             start='2018-03-01T02:00', end='2018-03-01T03:00')
+        self.assertEqual([(r['device'], r['plugin']) for r in rows],
+                         [('P1', 'Traceback Check Plugin')])
+
+        rows = query_results(self.directory, device='P1')
+        self.assertEqual([r['tag'] for r in rows], ['tick 1', 'tick 2'])
+
+        # time zones
+        rows = query_results(self.directory, end='2018-03-01T02:00:00-01:00')
+        self.assertEqual(len(rows), 2)
+
+        with self.assertRaises(FileNotFoundError):
+            query_results(os.path.join(self.directory, 'unknown.db'))
+
+    def test_command(self):
+        cli = CLI(prog='genie', commands=[TelemetryCommand])
+        with patch('sys.stdout', new_callable=StringIO) as stdout:
+            cli.main(['telemetry', 'query', self.directory,
+                      '--plugin', 'crash dumps plugin', '--format', 'json'])
+        rows = json.loads(stdout.getvalue())
+        self.assertEqual(rows[0]['timestamp'], '2018-03-01T03:30:00.000000Z')
+        self.assertEqual(rows[0]['message'], 'Core dump generated')
+
+if __name__ == '__main__':
+
+    unittest.main()
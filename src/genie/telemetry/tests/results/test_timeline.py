@@ -0,0 +1,39 @@
+#!/usr/bin/env python
+
+# Python
+import unittest
+
+# GenieTelemetry
+from genie.telemetry.results import StatusTimeline
+from genie.telemetry.status import OK, CRITICAL, ERRORED
+
+
+class StatusTimelineTestcase(unittest.TestCase):
+
+    def test_timeline(self):
+        timeline = StatusTimeline()
+        self.assertIsNone(timeline.uptime())
+        self.assertIsNone(timeline.since_non_ok())
+
+        # ok for 70s, critical for 30s, errored for 10s, then ok for 40s
+        statuses = [OK] * 7 + [CRITICAL] * 3 + [ERRORED] + [OK] * 5
+        for i, status in enumerate(statuses):
+            timeline.record(status, 1000 + i * 10)
+
+        # repeated statuses are run-length encoded
+        self.assertEqual(len(timeline), 4)
+        self.assertEqual(list(timeline.counts), [7, 3, 1, 5])
+        self.assertEqual(timeline.status, OK)
+
+        self.assertEqual(timeline.transitions(), 3)
+        self.assertEqual(timeline.transitions(start=1075), 2)
+        self.assertAlmostEqual(timeline.uptime(), 110 * 100 / 150.0)
+        self.assertEqual(timeline.uptime(start=1070, end=1100), 0.0)
+        self.assertEqual(timeline.since_non_ok(now=1200), 90.0)
+
+        timeline.record(CRITICAL, 1160)
+        self.assertEqual(timeline.since_non_ok(), 0.0)
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+
+# Python
+import os
+import unittest
+
+# GenieTelemetry
+from genie.telemetry.results import (WireNames, WireBlobs, encode_results,
+                                     decode_results, format_statuses)
+from genie.telemetry.status import OK, CRITICAL
+from genie.telemetry.tests.common import RuninfoTestcase
+
+
+class WireResultsTestcase(RuninfoTestcase):
+
+    def test_round_trip(self):
+        names = WireNames()
+        for name in ('crashdumps', 'P1'):
+            names.intern(name)
+        blobs = WireBlobs(self.directory, spill_bytes=2048)
+
+        small = {'2018-01-01T00:00:00Z': 'No cores found!'}
+        large = {'2018-01-01T00:00:00Z': os.urandom(4096).hex()}
+        results = {'crashdumps': {'P1': {'status': OK, 'result': small},
+                                  'P2': {'status': CRITICAL,
+                                         'result': large,
+                                         'metrics': [('cores', 1, 0.0)]}}}
+
+        version, records = encode_results(results, names, blobs)
+        # interned names are sent as ids, large meta spilled to the blob file
+        self.assertEqual(records[0][:3], (0, 1, 0))
+        self.assertEqual(records[1][:3], (0, 'P2', 2))
+        self.assertTrue(os.path.isfile(blobs.path))
+
+        decoded = list(decode_results((version, records), names, blobs))
+        self.assertEqual([(r.plugin, r.device, r.status) for r in decoded],
+                         [('crashdumps', 'P1', OK), ('crashdumps', 'P2',
+                                                     CRITICAL)])
+        self.assertEqual(decoded[0].result, small)
+        self.assertEqual(decoded[1].result, large)
+        self.assertEqual(decoded[1].metrics, [('cores', 1, 0.0)])
+
+        with self.assertRaises(ValueError):
+            list(decode_results((version + 1, records), names, blobs))
+
+    def test_decoded_when_read(self):
+        names = WireNames()
+        blobs = WireBlobs(self.directory, spill_bytes=2048)
+        large = {'2018-01-01T00:00:00Z': os.urandom(4096).hex()}
+        records = encode_results({'crashdumps': {'P1': {'status': CRITICAL,
+                                                        'result': large}}},
+                                 names, blobs)
+
+        entry, = decode_results(records, names, blobs)
+        # kept as the results entry, spilled meta read before the blob file
+        # is cleared, decoded only when read
+        entry.detach()
+        blobs.clear()
+        self.assertIsNone(entry._result)
+        self.assertEqual(entry['status'], CRITICAL)
+        self.assertEqual(entry.get('status'), CRITICAL)
+
+        plugins = format_statuses({'crashdumps': {'P1': entry}})
+        self.assertEqual(plugins, {'crashdumps': {'P1': {'status': 'Critical',
+                                                         'result': large}}})
+
+if __name__ == '__main__':
+
+    unittest.main()
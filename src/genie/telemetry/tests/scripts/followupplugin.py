@@ -0,0 +1,22 @@
+
+from genie.telemetry import BasePlugin
+from genie.telemetry.status import OK, WARNING
+
+class Plugin(BasePlugin):
+
+    parser = None
+    def parse_args(self, *args, **kwargs):
+        return
+
+    def execution(self, device):
+        if not self.follow_ups:
+            return OK('no follow-ups')
+
+        self.emit('samples', self.context['samples'] if self.context else 0)
+
+        if self.context is None:
+            self.follow_up(2, {'samples': 1})
+            return WARNING('provisional result')
+
+        return OK('final result after {} sample(s)'.format(
+                                                    self.context['samples']))
@@ -0,0 +1,35 @@
+#!/usr/bin/env python
+
+# Python
+import unittest
+
+# GenieTelemetry
+from genie.telemetry.status import OK, WARNING, CRITICAL, PARTIAL
+from genie.telemetry.status.rollup import StatusRollup
+
+
+class StatusRollupTestcase(unittest.TestCase):
+
+    def test_rollup(self):
+        rollup = StatusRollup()
+        for device in ('P1', 'P2', 'P3'):
+            rollup.add_device(device)
+        self.assertEqual(rollup.statuses, {'ok': 3})
+
+        rollup.update('P1', 'crashdumps', PARTIAL)
+        rollup.update('P1', 'tracebackcheck', WARNING)
+        rollup.update('P2', 'crashdumps', CRITICAL)
+        self.assertEqual(rollup.device_status('P1'), PARTIAL + WARNING)
+        self.assertEqual(rollup.statuses, {'ok': 1, 'warning': 1,
+                                           'critical': 1})
+        self.assertEqual(rollup.status, CRITICAL)
+
+        # recovered
+        rollup.update('P2', 'crashdumps', OK)
+        rollup.update('P1', 'tracebackcheck', OK)
+        self.assertEqual(rollup.statuses, {'ok': 2, 'partial': 1})
+        self.assertEqual(rollup.status, PARTIAL)
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+# Python
+import os
+import socket
+import unittest
+from multiprocessing import Process
+from urllib.request import urlopen
+
+# GenieTelemetry
+from genie.telemetry.tests.common import (FOLLOW_UP_PLUGIN, RuninfoTestcase,
+                                          follow_up_manager, load_testbed)
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def _stop_from_worker(exporter):
+    exporter.stop()
+
+class MetricsExporterTestcase(RuninfoTestcase):
+
+    def setUp(self):
+        super().setUp()
+        self.testbed = load_testbed()
+
+    def test_exporter(self):
+        manager = follow_up_manager(self.testbed, runinfo_dir=self.directory,
+                                    config={'exporter': {'textfile': True,
+                                                         'port': free_port()}})
+        server = manager.exporter._server
+        manager.stats.connection('P1', 'reconnects')
+        manager.run('t1')
+        manager.run('t2')
+        # served once for the whole run
+        self.assertIs(manager.exporter._server, server)
+
+        # served over HTTP as well, as rendered after the latest task
+        host, port = server.server_address[:2]
+        with urlopen('http://{}:{}/metrics'.format(host, port)) as response:
+            served = response.read().decode()
+        manager.takedown()
+
+        with open(os.path.join(self.directory, 'telemetry.prom')) as f:
+            content = f.read()
+        self.assertEqual(served, content)
+        plugin = FOLLOW_UP_PLUGIN
+        self.assertIn('genietelemetry_plugin_status{device="P1",plugin="%s"} '
+                      '0' % plugin, content)
+        self.assertIn('genietelemetry_plugin_duration_seconds_count'
+                      '{plugin="%s"} 2' % plugin, content)
+        self.assertIn('genietelemetry_connections_total{device="P1",'
+                      'event="reconnects"} 1', content)
+        self.assertIn('genietelemetry_workers_started_total 2', content)
+
+    def test_fork(self):
+        manager = follow_up_manager(self.testbed,
+                                    config={'exporter': {'port': free_port()}})
+        self.addCleanup(manager.takedown)
+
+        # the worker doesn't serve, nor stops the server of the manager
+        worker = Process(target=_stop_from_worker, args=(manager.exporter,))
+        worker.start()
+        worker.join(5)
+        self.addCleanup(worker.terminate)
+        self.assertEqual(worker.exitcode, 0)
+
+        host, port = manager.exporter._server.server_address[:2]
+        with urlopen('http://{}:{}/metrics'.format(host, port)) as response:
+            self.assertEqual(response.status, 200)
+
+if __name__ == '__main__':
+
+    unittest.main()
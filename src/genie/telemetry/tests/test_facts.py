@@ -0,0 +1,45 @@
+#!/usr/bin/env python
+
+# Python
+import os
+import unittest
+from unittest.mock import Mock
+
+# GenieTelemetry
+from genie.telemetry.facts import DeviceFacts, get_facts
+from genie.telemetry.tests.common import RuninfoTestcase
+
+
+class DeviceFactsTestcase(RuninfoTestcase):
+
+    def test_shared_facts(self):
+        facts = DeviceFacts('P1', directory=self.directory)
+        self.assertIsNone(facts.get('vdc_id'))
+        facts.set('vdc_id', '2')
+        facts.set_unsupported('show alignment')
+        facts.add('missing_locations', 'harddisk:/core')
+        facts.add('missing_locations', 'harddisk:/core')
+
+        # another process sees the same facts
+        other = DeviceFacts('P1', directory=self.directory)
+        self.assertEqual(other.get('vdc_id'), '2')
+        self.assertTrue(other.is_unsupported('show alignment'))
+        self.assertEqual(other.get('missing_locations'), ['harddisk:/core'])
+
+        # clearing invalidates the facts everywhere
+        other.clear()
+        self.assertNotIn('vdc_id', facts)
+        self.assertFalse(facts.is_unsupported('show alignment'))
+
+    def test_memory_facts(self):
+        device = Mock(spec=['name'])
+        device.name = 'P1'
+        facts = get_facts(device)
+        facts.set('vdc_id', '1')
+        self.assertIs(get_facts(device), facts)
+        self.assertEqual(get_facts(device).get('vdc_id'), '1')
+        self.assertEqual(os.listdir(self.directory), [])
+
+if __name__ == '__main__':
+
+    unittest.main()
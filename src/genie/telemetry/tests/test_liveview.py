@@ -0,0 +1,146 @@
+#!/usr/bin/env python
+
+# Python
+import unittest
+from multiprocessing import Process, Queue
+from unittest.mock import Mock, call, patch
+
+# GenieTelemetry
+from genie.telemetry.main import GenieTelemetry
+from genie.telemetry.liveview import LiveviewPublisher, ResultDeltas
+from genie.telemetry.status import OK, CRITICAL
+from genie.telemetry.utils import escape
+
+
+def _publish_from_worker(publisher, count):
+    for i in range(count):
+        publisher.put(dict(stream='line {}'.format(i)))
+
+class LiveviewPublisherTestcase(unittest.TestCase):
+
+    def test_batches(self):
+        feed = Mock()
+        publisher = LiveviewPublisher(feed, batch_interval=60, batch_size=5,
+                                      max_pending=3)
+        # queued without blocking, oldest dropped past max_pending
+        for i in range(4):
+            publisher.put(dict(stream='line {}'.format(i)))
+        publisher.put(dict(results=[]))
+        self.assertEqual(publisher.dropped, 2)
+        publisher.stop()
+
+        # one message per stream write by default
+        self.assertEqual(feed.put_nowait.call_args_list,
+                         [call(dict(stream='line 2')),
+                          call(dict(stream='line 3')),
+                          call(dict(results=[]))])
+
+    def test_coalesce(self):
+        feed = Mock()
+        publisher = LiveviewPublisher(feed, batch_interval=60, batch_size=5)
+        publisher.configure(coalesce=True)
+        for i in range(3):
+            publisher.put(dict(stream='line {}'.format(i)))
+        publisher.put(dict(results=[]))
+        publisher.stop()
+
+        # consecutive streams coalesced
+        self.assertEqual(feed.put_nowait.call_args_list,
+                         [call(dict(stream='line 0\nline 1\nline 2')),
+                          call(dict(results=[]))])
+
+    def test_worker(self):
+        feed = Queue()
+        publisher = LiveviewPublisher(feed, batch_interval=60, batch_size=50,
+                                      coalesce=True)
+
+        # batched by the worker, the rest forwarded when it exits
+        worker = Process(target=_publish_from_worker, args=(publisher, 100))
+        worker.start()
+        worker.join()
+        publisher.stop()
+
+        messages = []
+        while len(messages) < 2:
+            messages.append(feed.get(timeout=5))
+        self.assertTrue(feed.empty())
+        self.assertEqual('\n'.join(m['stream'] for m in messages),
+                         '\n'.join('line {}'.format(i) for i in range(100)))
+
+    def test_fork(self):
+        feed = Queue()
+        publisher = LiveviewPublisher(feed, batch_interval=60, batch_size=50)
+        publisher.put(dict(stream='parent'))
+
+        # condition held by the forwarding thread when the worker is forked
+        with publisher._ready:
+            worker = Process(target=_publish_from_worker,
+                             args=(publisher, 1))
+            worker.start()
+        worker.join(5)
+        self.addCleanup(worker.terminate)
+        self.assertEqual(worker.exitcode, 0)
+        self.assertEqual(feed.get(timeout=5), dict(stream='line 0'))
+        publisher.stop()
+        self.assertEqual(feed.get(timeout=5), dict(stream='parent'))
+
+    def test_deltas(self):
+        deltas = ResultDeltas(snapshot_interval=2)
+        deltas.add('P1', 'crashdumps', OK, {'t1': 'No cores found!'})
+        deltas.add('P2', 'crashdumps', OK, {'t1': 'No cores found!'})
+        message, = deltas.flush()
+        self.assertEqual(len(message['results']), 2)
+
+        # unchanged results aren't sent again, new messages only
+        deltas.add('P1', 'crashdumps', OK, {'t2': 'No cores found!'})
+        deltas.add('P2', 'crashdumps', OK, {'t2': 'No cores found!',
+                                            't3': 'Cleared cores'})
+        message, snapshot = deltas.flush()
+        self.assertEqual([(r['device'], r['result'])
+                          for r in message['results']],
+                         [('P2', {'t3': 'Cleared cores'})])
+        self.assertEqual(snapshot, {'snapshot': [['P1', 'crashdumps', 0],
+                                                 ['P2', 'crashdumps', 0]]})
+
+        # status changes are sent in full
+        deltas.add('P1', 'crashdumps', CRITICAL, {'t4': 'No cores found!'})
+        message, = deltas.flush()
+        self.assertEqual(message['results'][0]['status'], 'CRITICAL')
+
+    def test_results(self):
+        with patch('sys.stdout'), patch('genie.telemetry.main.sig_handlers'):
+            telemetry = GenieTelemetry()
+        telemetry.liveview = Mock()
+        telemetry.publisher = Mock()
+        result = {'status': OK, 'result': {'t1': 'No cores found!'}}
+
+        # each result published in full as it comes in, by default
+        telemetry.post_run('P1', 'crashdumps', result)
+        telemetry.post_run('P1', 'crashdumps', result)
+        telemetry.post_task('t1')
+        messages = [c[0][0] for c in telemetry.publisher.put.call_args_list]
+        self.assertEqual(len(messages), 2)
+        entry, = messages[0]['results']
+        self.assertEqual((entry['device'], entry['plugin'], entry['status'],
+                          entry['value'], entry['result']),
+                         ('P1', 'crashdumps', 'OK', 0, result['result']))
+        self.assertNotIn('delta', messages[0])
+
+        # deltas published once the task is over, when enabled
+        telemetry.publisher.reset_mock()
+        telemetry.deltas = ResultDeltas()
+        telemetry.post_run('P1', 'crashdumps', result)
+        telemetry.post_run('P2', 'crashdumps', result)
+        telemetry.publisher.put.assert_not_called()
+        telemetry.post_task('t2')
+        message, = [c[0][0] for c in telemetry.publisher.put.call_args_list]
+        self.assertTrue(message['delta'])
+        self.assertEqual(len(message['results']), 2)
+
+    def test_escape(self):
+        self.assertEqual(escape('<a href="x">&</a>\n'),
+                         '&lt;a href=&quot;x&quot;&gt;&amp;&lt;/a&gt;\n')
+
+if __name__ == '__main__':
+
+    unittest.main()
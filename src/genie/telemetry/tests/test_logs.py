@@ -0,0 +1,118 @@
+#!/usr/bin/env python
+
+# Python
+import os
+import time
+import logging
+import unittest
+from io import StringIO
+from multiprocessing import Process
+from unittest.mock import Mock, patch
+
+# GenieTelemetry
+from genie.telemetry.logs import LogPipeline
+from genie.telemetry.utils import LazyStr
+from genie.telemetry.tests.common import RuninfoTestcase
+
+
+def _log_from_worker(pipeline, device, count):
+    pipeline.set_device(device)
+    for i in range(count):
+        logging.getLogger('genie.telemetry.pipeline').info(
+                                            '%s record %d', device, i)
+
+class LogPipelineTestcase(RuninfoTestcase):
+
+    def setUp(self):
+        super().setUp()
+        self.logger = logging.getLogger('genie.telemetry.pipeline')
+        self.logger.setLevel(logging.INFO)
+        self.stream = StringIO()
+        self.handler = logging.StreamHandler(self.stream)
+        self.logger.addHandler(self.handler)
+
+    def tearDown(self):
+        self.logger.removeHandler(self.handler)
+        super().tearDown()
+
+    def test_pipeline(self):
+        pipeline = LogPipeline(loggers=('genie.telemetry.pipeline', ),
+                               directory=self.directory, device_logs=True,
+                               max_bytes=200, backup_count=2)
+        pipeline.start()
+        self.assertEqual(self.logger.handlers, [pipeline._queue_handlers[
+                                                'genie.telemetry.pipeline']])
+
+        worker = Process(target=_log_from_worker, args=(pipeline, 'P1', 20))
+        worker.start()
+        worker.join()
+        self.logger.info('manager record')
+        pipeline.stop()
+
+        # handlers given back, records written by the pipeline
+        self.assertEqual(self.logger.handlers, [self.handler])
+        lines = self.stream.getvalue().splitlines()
+        self.assertEqual(len(lines), 21)
+        self.assertIn('P1 record 19', lines)
+
+        # records of the worker in its device log, rotated and compressed
+        files = sorted(os.listdir(os.path.join(self.directory, 'devices')))
+        self.assertEqual(files, ['P1.log', 'P1.log.1.gz', 'P1.log.2.gz'])
+        with open(os.path.join(self.directory, 'devices', 'P1.log')) as f:
+            self.assertIn('P1 record 19', f.read())
+
+    def test_unformatted(self):
+        self.handler.setLevel(logging.WARNING)
+        pipeline = LogPipeline(loggers=('genie.telemetry.pipeline', ))
+        pipeline.start()
+        handler = pipeline._queue_handlers['genie.telemetry.pipeline']
+
+        # sent unformatted, formatted by the writer thread
+        record = handler.prepare(logging.LogRecord(
+                    'genie.telemetry.pipeline', logging.WARNING, __file__, 1,
+                    '%s record %d', ('P1', 1), None))
+        self.assertEqual((record.msg, record.args), ('%s record %d',
+                                                     ('P1', 1)))
+
+        # levels no handler writes aren't formatted
+        dump = Mock(return_value='formatted')
+        with patch.object(self.logger, 'propagate', False):
+            self.logger.info('%s', LazyStr(dump))
+            self.assertFalse(dump.called)
+            self.logger.warning('%s', LazyStr(dump))
+        pipeline.stop()
+
+        self.assertEqual(dump.call_count, 1)
+        self.assertEqual(self.stream.getvalue().splitlines(), ['formatted'])
+
+    def test_fork(self):
+        pipeline = LogPipeline(loggers=('genie.telemetry.pipeline', ))
+        pipeline.start()
+
+        # queue lock held by a thread of the manager (eg: a transfer logging)
+        # when the worker is forked, as is (no multiprocessing reset)
+        with pipeline.queue._notempty:
+            pid = os.fork()
+            if not pid:
+                code = 1
+                try:
+                    _log_from_worker(pipeline, 'P1', 1)
+                    pipeline.queue.close()
+                    pipeline.queue.join_thread()
+                    code = 0
+                finally:
+                    os._exit(code)
+
+        deadline = time.time() + 5
+        while os.waitpid(pid, os.WNOHANG) == (0, 0):
+            if time.time() > deadline:
+                os.kill(pid, 9)
+                os.waitpid(pid, 0)
+                self.fail('worker deadlocked logging')
+            time.sleep(0.05)
+        pipeline.stop()
+        self.assertIn('P1 record 0', self.stream.getvalue())
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,47 @@
+#!/usr/bin/env python
+
+# Python
+import unittest
+
+# GenieTelemetry
+from genie.telemetry.metrics import RingBuffer, MetricStore
+
+
+class MetricsTestcase(unittest.TestCase):
+
+    def test_ring_buffer(self):
+        buffer = RingBuffer(3)
+        for i in range(5):
+            buffer.append(i, i * 10)
+        self.assertEqual(list(buffer), [(2, 20), (3, 30), (4, 40)])
+        self.assertEqual(buffer.first, 2)
+        self.assertEqual(buffer.last, (4, 40))
+
+    def test_downsampling(self):
+        store = MetricStore(samples=5, tiers=[[60, 3], [10, 4]])
+        # one sample every 5 seconds, for 4 minutes
+        for ts in range(0, 240, 5):
+            store.record('P1', 'five_min_cpu', ts % 60, ts)
+
+        metric = store.get('P1', 'five_min_cpu')
+        self.assertEqual([t.resolution for t in metric.tiers], [10, 60])
+        self.assertEqual(list(metric.tiers[1]),
+                         [(60, 0, 55, 27.5, 12), (120, 0, 55, 27.5, 12),
+                          (180, 0, 55, 27.5, 12)])
+
+        # raw samples
+        self.assertEqual(store.query('P1', 'five_min_cpu', start=220),
+                         dict(min=40, max=55, avg=47.5, count=4))
+        # finest tier going back to start
+        self.assertEqual(store.query('P1', 'five_min_cpu', start=200),
+                         dict(min=20, max=55, avg=37.5, count=8))
+        # coarsest tier
+        self.assertEqual(store.query('P1', 'five_min_cpu', start=0)['count'],
+                         36)
+        self.assertIsNone(store.query('P1', 'unknown'))
+
+        self.assertEqual(store.summary()['P1']['five_min_cpu']['last'], 55)
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -3,9 +3,11 @@
 # Python
 import os
 import sys
+import json
 import yaml
 import time
 import signal
+import logging
 import unittest
 from shutil import rmtree
 from tempfile import mkdtemp
@@ -26,12 +28,19 @@ from pyats.results import Passed, Passx
 from genie.telemetry.parser import Parser
 from genie.telemetry.main import GenieTelemetry
 from genie.telemetry import BasePlugin, Manager, TimedManager, processors
+from genie.telemetry.status import OK, WARNING
+from genie.telemetry.tests.common import (FOLLOW_UP_PLUGIN, follow_up_manager,
+                                          monotonic)
 
 
 class MockConnection(BaseConnection):
 
     connected = False
 
+    # outputs of the commands parsed through the genie parsers (device.parse
+    # executes the command rather than calling the connection parse)
+    outputs = {'show vdc current-vdc': 'Current vdc is 1 - P1'}
+
     def connect(self):
         self.connected = True
 
@@ -47,7 +56,9 @@ class MockConnection(BaseConnection):
     def learn(self, *args, **kwargs):
         pass
 
-    def execute(self, *args, **kwargs):
+    def execute(self, command=None, *args, **kwargs):
+        if isinstance(command, str) and command in self.outputs:
+            return self.outputs[command]
         return 'MOCKED_EXECUTION'
 
     def __init__(self, device, alias=None, via=None, **kwargs):
@@ -194,6 +205,189 @@ class GenieTelemetryTestcase(unittest.TestCase):
             self.assertTrue(section.result)
             self.assertIsNone(section.message)
 
+    def test_connection_profile(self):
+        config = {'connections': {'defaults': {'profile': 'lean'},
+                                  'P1': {'via': 'a'},
+                                  'P2': {'profile': 'default'}}}
+        manager = Manager(testbed, configuration=config)
+
+        connection = manager.get_connection('P1')
+        self.assertEqual(connection['via'], 'a')
+        self.assertEqual(connection['timeout'], 10)
+        self.assertEqual(connection['init_config_commands'], [])
+        self.assertTrue(connection['log_buffer'])
+
+        connection = manager.get_connection('P2')
+        self.assertEqual(connection, {'timeout': 10})
+
+        # connection settings are left untouched
+        manager.get_connection('P1')['via'] = 'b'
+        self.assertEqual(manager.get_connection('P1')['via'], 'a')
+
+        with self.assertRaises(Exception):
+            Manager(testbed, configuration={'connections': {
+                                            'P1': {'profile': 'unknown'}}})
+
+    def test_follow_up(self):
+        manager = follow_up_manager(testbed, TimedManager, config={
+                                            'metrics': {'enabled': True}})
+        plugin = FOLLOW_UP_PLUGIN
+
+        # follow-ups are due after their delay (2 seconds), in wall-clock time
+        now = [100.0]
+        with monotonic(now):
+            manager.run('t5', 5)
+            status = manager.results['t5 (5)'][plugin]['P1']['status']
+            self.assertEqual(status, WARNING)
+            self.assertNotIn('follow_up',
+                             manager.results['t5 (5)'][plugin]['P1'])
+
+            # follow-up not due yet, whatever the number of ticks
+            now[0] = 101.5
+            manager.run('t6', 6)
+            manager.run('t7', 7)
+            self.assertNotIn('t6 (follow-up)', manager.results)
+            self.assertNotIn('t7 (follow-up)', manager.results)
+
+            now[0] = 102.0
+            manager.run('t8', 8)
+        result = manager.results['t8 (follow-up)'][plugin]['P1']
+        self.assertEqual(result['status'], OK)
+        self.assertIn('final result after 1 sample(s)',
+                      list(result['result'].values()))
+        self.assertEqual(manager._follow_ups, {})
+
+        # status history
+        self.assertEqual(manager.timelines.get('P1', plugin).transitions(), 1)
+
+        # samples emitted by the executions
+        metric = manager.metrics.get('P1', 'samples')
+        self.assertEqual(list(v for _, v in metric.samples), [0.0, 1.0])
+
+        # without follow-ups support, plugins are executed as before
+        manager = follow_up_manager(testbed)
+        manager.run('t')
+        self.assertEqual(manager.results['t'][plugin]['P1']['status'], OK)
+
+        # results were streamed back by the children as plugins completed
+        self.assertEqual(set(manager.p.results), {None})
+        self.assertIsNone(manager.result_queue)
+
+    def test_post_task(self):
+        instance = Mock(spec=['post_task'])
+        manager = follow_up_manager(testbed, TimedManager, interval=1,
+                                    instance=instance)
+
+        now = [100.0]
+        with monotonic(now):
+            manager.run('t1', 1)
+            # regular and follow-up tasks of a tick, posted once
+            now[0] = 102.0
+            manager.run('t2', 1)
+        self.assertIn('t2 (follow-up)', manager.results)
+        self.assertEqual(instance.post_task.call_args_list,
+                         [call('t1'), call('t2')])
+
+    def test_metrics_configuration(self):
+        config = {'metrics': {'enabled': True, 'samples': 10,
+                              'tiers': [[60, 5]]}}
+        manager = Manager(testbed, configuration=config)
+        manager.metrics.record('P1', 'five_min_cpu', 12, 0)
+        metric = manager.metrics.get('P1', 'five_min_cpu')
+        self.assertEqual(metric.samples.size, 10)
+        self.assertEqual([t.resolution for t in metric.tiers], [60])
+
+        # opt-in
+        manager = Manager(testbed, configuration={'metrics': {}})
+        self.assertIsNone(manager.metrics)
+
+    def test_results_configuration(self):
+        manager = Manager(testbed, runinfo_dir=runinfo_dir,
+                          configuration={'results': {'retain_ticks': 2,
+                                                     'journal': True}})
+        self.assertEqual(manager.results.retain_ticks, 2)
+        self.assertEqual(manager.results.directory, runinfo_dir)
+        self.assertIsNotNone(manager.journal)
+
+        # opt-in, and no journal without a runinfo directory
+        manager = Manager(testbed, runinfo_dir=runinfo_dir,
+                          configuration={'results': {}})
+        self.assertIsNone(manager.journal)
+        manager = Manager(testbed, configuration={'results': {
+                                                        'journal': True}})
+        self.assertIsNone(manager.journal)
+
+        with self.assertRaises(Exception):
+            Manager(testbed, configuration={'results': {'retain_ticks': 0}})
+
+    def test_record_transitions(self):
+        manager = follow_up_manager(testbed, runinfo_dir=runinfo_dir, config={
+                                    'results': {'record': 'transitions'},
+                                    'logs': {'queue': True}})
+
+        for tag in ('t1', 't2', 't3'):
+            manager.run(tag)
+
+        # only the first healthy result is recorded
+        self.assertEqual(list(manager.results), ['t1'])
+        self.assertEqual(manager.status, OK)
+
+        manager.finalize_report()
+        # handlers given back to the loggers
+        self.assertFalse(manager.log_pipeline.started)
+        unchanged = manager.results['unchanged results']
+        unchanged = unchanged[FOLLOW_UP_PLUGIN]['P1']
+        self.assertEqual(unchanged['unchanged'], 2)
+        self.assertEqual(unchanged['status'], 'Ok')
+
+        with self.assertRaises(Exception):
+            Manager(testbed, configuration={'results': {'record': 'some'}})
+
+    def test_summary_modes(self):
+        manager = follow_up_manager(testbed, config={
+                                            'results': {'summary': 'changes'}})
+
+        # status changes only
+        for tag in ('t1', 't2'):
+            with self.assertLogs('genie.telemetry.manager', 'INFO') as cm:
+                manager.run(tag)
+            summaries = [o for o in cm.output if 'Summary for Telemetry' in o]
+            self.assertEqual(len(summaries), 1 if tag == 't1' else 0)
+
+        # results aren't formatted unless the summary is emitted
+        manager.summary = 'full'
+        with patch('genie.telemetry.manager.manager.ordered_yaml_dump') as dump:
+            with self.assertLogs('genie.telemetry.manager', 'WARNING'):
+                manager.log_summary('plugin', 'P1', WARNING, {})
+                logging.getLogger('genie.telemetry.manager').warning('-')
+        dump.assert_not_called()
+
+        with self.assertRaises(Exception):
+            Manager(testbed, configuration={'results': {'summary': 'some'}})
+
+    def test_finalize_report(self):
+        manager = follow_up_manager(testbed, runinfo_dir=runinfo_dir, config={
+                        'results': {'report_json': True, 'retain_ticks': 1}})
+        manager.run('t1')
+        manager.run('t2')
+
+        report = manager.finalize_report()
+        with open(os.path.join(runinfo_dir, 'telemetry.yaml')) as f:
+            content = yaml.safe_load(f)
+        with open(os.path.join(runinfo_dir, 'telemetry.json')) as f:
+            self.assertEqual(json.load(f), content)
+        self.assertEqual(list(content), ['t1', 't2'])
+
+        # report text of the spilled ticks as well, as written
+        self.assertIsInstance(report, str)
+        self.assertEqual(yaml.safe_load(report), content)
+
+        # finalized once, eg: summary read again after the takedown
+        manager.takedown()
+        with patch.object(manager.results, 'dump') as dump:
+            self.assertEqual(manager.finalize_report(), report)
+        dump.assert_not_called()
+
     def _test_main(self):
         sys.argv = ['genietelemetry', testbed_file,
                     '-configuration', config_file2,
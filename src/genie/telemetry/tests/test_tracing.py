@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+# Python
+import os
+import json
+import unittest
+
+# GenieTelemetry
+from genie.telemetry.tracing import Tracer
+from genie.telemetry.tests.common import (FOLLOW_UP_PLUGIN, RuninfoTestcase,
+                                          follow_up_manager, load_testbed)
+
+
+class TracerTestcase(RuninfoTestcase):
+
+    def setUp(self):
+        super().setUp()
+        self.testbed = load_testbed()
+
+    def test_tracing(self):
+        manager = follow_up_manager(self.testbed, runinfo_dir=self.directory,
+                                    config={'tracing': {'enabled': True}})
+        manager.run('t1')
+        manager.finalize_report()
+
+        with open(os.path.join(self.directory, 'telemetry.trace.json')) as f:
+            events = json.load(f)
+        spans = {e['name']: e for e in events if e['ph'] == 'X'}
+        for name in ('task', 'plugins', 'process_results', 'wrap-up',
+                     'finalize_report'):
+            self.assertEqual(spans[name]['pid'], os.getpid())
+
+        # plugin executed in the worker process of the device
+        plugin = spans[FOLLOW_UP_PLUGIN]
+        self.assertNotEqual(plugin['pid'], os.getpid())
+        self.assertEqual(plugin['args'], {'device': 'P1', 'status': 'ok'})
+        self.assertIn({'name': 'process_name', 'ph': 'M',
+                       'pid': plugin['pid'], 'tid': 0,
+                       'args': {'name': 'device P1'}}, events)
+        self.assertLessEqual(spans['plugins']['ts'], plugin['ts'])
+
+        # device commands traced, the device methods put back
+        device = self.testbed.devices['P1']
+        tracer = Tracer(self.directory)
+        with tracer.trace_device(device):
+            self.assertEqual(device.execute(['show version', 'show  clock']),
+                             'MOCKED_EXECUTION')
+        self.assertNotIn('execute', vars(device))
+        self.assertEqual(tracer._events[-1]['name'],
+                         'show version; show clock')
+        self.assertEqual(tracer._events[-1]['args'],
+                         {'device': 'P1', 'method': 'execute'})
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+
+# Python
+import unittest
+from multiprocessing import Process
+from unittest.mock import Mock, patch
+
+# GenieTelemetry
+from genie.telemetry.transfer import TransferQueue
+from genie.telemetry.status import OK
+
+
+def delete_cores(device, *args):
+    # transfer callbacks are sent through the queue, hence module-level
+    TransferQueueTestcase.cleaned.append(args)
+    return OK
+
+def _lock_from_worker(queue):
+    queue._get_device_lock('P1')
+
+class TransferQueueTestcase(unittest.TestCase):
+
+    cleaned = []
+
+    def setUp(self):
+        self.devices = {}
+        for name in ('P1', 'PE1'):
+            device = Mock()
+            device.name = name
+            device.is_connected.return_value = False
+            self.devices[name] = device
+
+        self.queue = TransferQueue(self.devices, retries=1, backoff=0)
+
+        patcher = patch('genie.telemetry.transfer.FileUtils')
+        self.fileutils = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.futils = self.fileutils.from_device.return_value
+        # destination file system can't be queried
+        self.fileutils.return_value.__enter__.return_value.stat.side_effect = \
+                                                                    Exception
+
+    def upload(self, name, size=None):
+        return dict(source='flash:/{}'.format(name),
+                    destination='tftp://10.1.1.1/cores/{}'.format(name),
+                    size=size, message=name)
+
+    def test_transfers(self):
+        self.queue.start()
+        self.queue.submit(self.devices['P1'],
+                          [self.upload('a.core.gz'), self.upload('b.core.gz')],
+                          callback=delete_cores, args=('cores',))
+        self.queue.submit(self.devices['PE1'], [self.upload('c.core.gz')])
+        self.queue.stop()
+
+        self.assertEqual(self.futils.copyfile.call_count, 3)
+        self.assertEqual(self.queue.progress['transferred'], 3)
+        # transfers use the dedicated connection
+        self.devices['P1'].connect.assert_called_once_with(alias='transfer')
+        # clean up once all files of the job were transferred
+        self.assertEqual(self.cleaned, [('cores',)])
+        self.assertEqual(self.queue.statuses['P1'], OK)
+
+    def test_retry_and_skip(self):
+        stat = self.fileutils.return_value.__enter__.return_value.stat
+        stat.side_effect = None
+        stat.return_value.st_size = 100
+        self.futils.copyfile.side_effect = [Exception('timeout'), None]
+
+        self.queue.start()
+        self.queue.submit(self.devices['P1'], [self.upload('a.core.gz', 100),
+                                               self.upload('b.core.gz', 200)])
+        self.queue.stop()
+
+        self.assertEqual(self.futils.copyfile.call_count, 2)
+        self.assertEqual(self.queue.progress['skipped'], 1)
+        self.assertEqual(self.queue.progress['transferred'], 1)
+        self.assertEqual(self.queue.statuses['P1'], OK)
+
+    def test_backoff_releases_server(self):
+        queue = TransferQueue(self.devices, retries=1, backoff=1,
+                              max_per_server=1, via='mgmt')
+        self.futils.copyfile.side_effect = [Exception('timeout'), None]
+        semaphore = queue._get_server_semaphore('tftp://10.1.1.1/cores/')
+        lock = queue._get_device_lock('P1')
+
+        def sleep(seconds):
+            # server and device connection free for other transfers
+            self.assertTrue(semaphore.acquire(blocking=False))
+            semaphore.release()
+            self.assertTrue(lock.acquire(blocking=False))
+            lock.release()
+
+        queue.start()
+        with patch('genie.telemetry.transfer.time.sleep',
+                   side_effect=sleep) as mock_sleep:
+            queue.submit(self.devices['P1'], [self.upload('a.core.gz')])
+            queue.stop()
+
+        mock_sleep.assert_called_once_with(1)
+        self.assertEqual(queue.progress['transferred'], 1)
+        self.devices['P1'].connect.assert_called_once_with(alias='transfer',
+                                                           via='mgmt')
+
+    def test_fork(self):
+        # lock held by a thread of the manager when the worker is forked
+        with self.queue._lock:
+            worker = Process(target=_lock_from_worker, args=(self.queue,))
+            worker.start()
+            worker.join(5)
+        self.addCleanup(worker.terminate)
+        self.assertEqual(worker.exitcode, 0)
+
+if __name__ == '__main__':
+
+    unittest.main()
@@ -0,0 +1,285 @@
+'''Execution Tracing
+
+Spans around the phases of a genie telemetry run, written into the runinfo
+directory as Chrome trace events (telemetry.trace.json), to be loaded into a
+trace viewer (eg: chrome://tracing, ui.perfetto.dev):
+
+    - tasks (eg: ticks), and their phases in the manager: plugin executions,
+      result merging, wrap-up
+    - device connections and reconnections
+    - plugin executions in the worker processes, one process per device
+    - device commands (execute, parse) of the plugins
+    - report generation
+
+Worker processes buffer their spans and append them to the trace file once
+their plugins completed, under a file lock. The trace file is a JSON array,
+closed by the manager along with the report (trace viewers load it unclosed as
+well, eg: when the run was interrupted).
+'''
+
+import os
+import json
+import time
+import fcntl
+import logging
+import threading
+from functools import wraps
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+# module logger
+logger = logging.getLogger(__name__)
+
+TRACE_FILE = 'telemetry.trace.json'
+
+# device methods traced during the plugin executions
+DEVICE_METHODS = ('execute', 'parse')
+
+# characters of the commands kept in the span names
+COMMAND_LENGTH = 80
+
+def _command(args):
+    if not args:
+        return ''
+    command = args[0]
+    if isinstance(command, (list, tuple)):
+        command = '; '.join(str(c) for c in command)
+    command = ' '.join(str(command).split())
+    if len(command) > COMMAND_LENGTH:
+        command = command[:COMMAND_LENGTH - 3] + '...'
+    return command
+
+
+class _NullSpan(object):
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def set(self, **args):
+        pass
+
+_NULL_SPAN = _NullSpan()
+
+# device methods not set on the device itself
+_MISSING = object()
+
+
+class Span(object):
+    '''Span class
+
+    complete (ph X) trace event, from entering to exiting the span. Arguments
+    may be added while in the span, see set().
+    '''
+
+    __slots__ = ('tracer', 'name', 'cat', 'args', 'start')
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+        self.start = None
+
+    def set(self, **args):
+        self.args.update(args)
+
+    def __enter__(self):
+        self.start = time.time()
+        return self
+
+    def __exit__(self, exc_type, exc_value, tb):
+        if exc_type is not None:
+            self.args['error'] = '{}: {}'.format(exc_type.__name__, exc_value)
+        self.tracer.complete(self.name, self.start, cat = self.cat,
+                             **self.args)
+        return False
+
+
+class Tracer(object):
+    '''Tracer class
+
+    Arguments
+    ---------
+        directory (str): directory of the trace file, not traced when None
+        commands (bool): trace the device commands of the plugins
+        buffer_size (int): events buffered before written to the file
+    '''
+
+    def __init__(self, directory = None, commands = True, buffer_size = 1000):
+        self.path = os.path.join(directory, TRACE_FILE) if directory else None
+        self.commands = commands
+        self.buffer_size = buffer_size
+
+        # process of the manager, and current process
+        self._owner = self._pid = os.getpid()
+        self._events = []
+        self._threads = {}
+        self._lock = threading.Lock()
+
+        if self.path:
+            with open(self.path, 'w') as f:
+                f.write('[')
+                f.write(json.dumps(self._metadata('process_name',
+                                                  'genietelemetry')))
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def _metadata(self, name, value, tid = 0):
+        return dict(name = name, ph = 'M', pid = os.getpid(), tid = tid,
+                    args = dict(name = value))
+
+    def _tid(self):
+        '''small id of the current thread, named on first use'''
+        ident = threading.get_ident()
+        tid = self._threads.get(ident)
+        if tid is None:
+            tid = self._threads[ident] = len(self._threads) + 1
+            self._events.append(self._metadata(
+                                        'thread_name',
+                                        threading.current_thread().name,
+                                        tid = tid))
+        return tid
+
+    def _forked(self):
+        '''events of the parent are not carried over into forked children'''
+        if os.getpid() != self._pid:
+            self._pid = os.getpid()
+            self._events = []
+            self._threads = {}
+            self._lock = threading.Lock()
+
+    def span(self, name, cat = 'telemetry', **args):
+        '''span
+
+        returns a span (context manager) of the given name and category, with
+        arguments shown by the trace viewers.
+        '''
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, cat, args)
+
+    def complete(self, name, start, end = None, cat = 'telemetry', **args):
+        '''complete
+
+        records a span from start to end (timestamps, now when end is None).
+        '''
+        if not self.enabled:
+            return
+        end = time.time() if end is None else end
+        self._forked()
+        with self._lock:
+            # trace event timestamps are in microseconds
+            self._events.append(dict(name = name, cat = cat, ph = 'X',
+                                     ts = start * 1000000,
+                                     dur = max(0, end - start) * 1000000,
+                                     pid = self._pid, tid = self._tid(),
+                                     args = args))
+            full = len(self._events) >= self.buffer_size
+        if full:
+            self.flush()
+
+    def name_process(self, name):
+        '''name_process
+
+        names the current (worker) process in the trace viewers.
+        '''
+        if not self.enabled:
+            return
+        self._forked()
+        with self._lock:
+            self._events.append(self._metadata('process_name', name))
+
+    def trace_device(self, device):
+        '''trace_device
+
+        returns a context manager tracing the commands (execute, parse) of the
+        device while in it.
+        '''
+        if not self.enabled or not self.commands:
+            return _NULL_SPAN
+        return _DeviceCommands(self, device)
+
+    def flush(self):
+        '''flush
+
+        appends the buffered events to the trace file (from any process).
+        '''
+        if not self.enabled:
+            return
+        self._forked()
+        with self._lock:
+            events, self._events = self._events, []
+        if not events:
+            return
+        data = ''.join(',\n' + json.dumps(event, default = str)
+                       for event in events)
+        with open(self.path, 'a') as f:
+            # workers append concurrently
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(data)
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def close(self):
+        '''close
+
+        writes the buffered events, and closes the trace file. Only in the
+        process that created it.
+        '''
+        if not self.enabled or os.getpid() != self._owner:
+            return
+        self.flush()
+        with open(self.path, 'a') as f:
+            f.write('\n]\n')
+        logger.info('Execution trace written to {}'.format(self.path))
+        self.path = None
+
+
+class _DeviceCommands(object):
+    '''traces the device commands, wrapping the device methods in place'''
+
+    def __init__(self, tracer, device):
+        self.tracer = tracer
+        self.device = device
+        self.wrapped = []
+
+    def _wrap(self, method, func):
+        tracer, device = self.tracer, self.device.name
+
+        @wraps(func)
+        def traced(*args, **kwargs):
+            with tracer.span(_command(args) or method, cat = 'device',
+                             device = device, method = method):
+                return func(*args, **kwargs)
+        return traced
+
+    def __enter__(self):
+        for method in DEVICE_METHODS:
+            try:
+                func = getattr(self.device, method)
+            except Exception:
+                continue
+            if not callable(func):
+                continue
+            # methods set on the device itself are put back on exit
+            own = vars(self.device).get(method, _MISSING)
+            setattr(self.device, method, self._wrap(method, func))
+            self.wrapped.append((method, own))
+        return self
+
+    def __exit__(self, *exc_info):
+        for method, own in self.wrapped:
+            if own is _MISSING:
+                delattr(self.device, method)
+            else:
+                setattr(self.device, method, own)
+        self.wrapped = []
+        return False
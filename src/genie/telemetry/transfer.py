@@ -0,0 +1,311 @@
+'''Transfer Queue
+
+Uploads files from devices to file servers (eg: core dumps) in the background,
+so plugins hand their uploads over instead of blocking the device executions
+for the duration of the transfers.
+
+Plugins are executed in worker processes: uploads are submitted through a
+process-safe queue created before the workers are forked, and carried out by
+threads of the main process over a dedicated connection to each device (the
+plugin connection keeps serving the plugins in the meantime).
+
+Transfers are bounded in concurrency, both overall and per file server, so a
+crash storm across the testbed doesn't flood the file servers. Failed
+transfers are retried with an exponential backoff, and files already present
+on the file server with the same size are not transferred again.
+'''
+
+import time
+import logging
+import threading
+from multiprocessing import SimpleQueue
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor
+
+from pyats.utils.fileutils import FileUtils
+
+from genie.telemetry.status import OK, ERRORED
+from genie.telemetry.utils import at_fork_reinit
+
+# declare module as infra
+__genietelemetry_infra__ = True
+
+# module logger
+logger = logging.getLogger(__name__)
+
+def get_transfer_queue(device):
+    '''get_transfer_queue
+
+    returns the transfer queue uploads from the device are handed over to,
+    None when uploads are to be carried out in place.
+    '''
+    return getattr(device, 'telemetry_transfers', None)
+
+
+class DeviceConnection(object):
+    '''DeviceConnection class
+
+    Device proxy executing commands over one of the device connections, to
+    use existing device-level utilities (eg: FileUtils) over that connection.
+    '''
+
+    def __init__(self, device, connection):
+        self.device = device
+        self.connection = connection
+
+    def execute(self, *args, **kwargs):
+        return self.connection.execute(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self.device, attr)
+
+
+class TransferQueue(object):
+    '''TransferQueue class
+
+    Arguments
+    ---------
+        devices (dict): testbed devices, by name
+        connection (callable): returns the connection arguments of a device
+        max_transfers (int): concurrent transfers, all servers included
+        max_per_server (int): concurrent transfers to a single server
+        retries (int): retries of a failed transfer
+        backoff (int): seconds before the first retry, doubled on each retry
+        alias (str): alias of the dedicated device connections
+        via (str): testbed connection of the dedicated device connections,
+                   same as the plugin connections when None
+    '''
+
+    def __init__(self, devices, connection = None,
+                 max_transfers = 4, max_per_server = 2, retries = 3,
+                 backoff = 5, alias = 'transfer', via = None):
+        self.devices = devices
+        self.connection = connection or (lambda name: {})
+        self.max_transfers = max_transfers
+        self.max_per_server = max_per_server
+        self.retries = retries
+        self.backoff = backoff
+        self.alias = alias
+        self.via = via
+
+        # created before the plugin workers are forked
+        self._queue = SimpleQueue()
+
+        self._lock = threading.Lock()
+        self._servers = {}
+        self._devices = {}
+        self._dispatcher = None
+        self._executor = None
+
+        self.progress = dict(queued = 0, transferred = 0, skipped = 0,
+                             failed = 0)
+        # status of the transfers, per device
+        self.statuses = {}
+
+        # the dispatcher and transfer threads are started before the workers
+        # are forked, and may hold the locks then
+        at_fork_reinit(self._after_fork)
+
+    def _after_fork(self):
+        '''the threads of the queue only run in the process which started
+        them, not in the forked workers (which only submit uploads)'''
+        self._lock = threading.Lock()
+        self._servers = {}
+        self._devices = {}
+        self._dispatcher = None
+        self._executor = None
+
+    def submit(self, device, transfers, timeout = 300, callback = None,
+               args = ()):
+        '''submit
+
+        hands uploads over to the queue (from any process).
+
+        Arguments
+        ---------
+            device (Device): device to upload files from
+            transfers (list): dicts of 'source' and 'destination' urls, and
+                              optionally the 'size' of the file
+            timeout (int): timeout of each transfer
+            callback (function): module-level function called with the device
+                                 and args once all files were transferred
+                                 (eg: to delete them from the device)
+            args (tuple): callback arguments
+        '''
+        self._queue.put(dict(device = device.name,
+                             transfers = list(transfers),
+                             timeout = timeout,
+                             callback = callback,
+                             args = args))
+
+        meta_info = '{} upload(s) from device {} queued'.format(
+                                                len(transfers), device.name)
+        logger.info(meta_info)
+        return OK(meta_info)
+
+    def start(self):
+        if self._dispatcher:
+            return
+
+        self._executor = ThreadPoolExecutor(max_workers = self.max_transfers)
+        self._dispatcher = threading.Thread(target = self._dispatch,
+                                            name = 'TransferQueue',
+                                            daemon = True)
+        self._dispatcher.start()
+
+    def stop(self, timeout = None):
+        '''stop
+
+        waits for the queued transfers to complete, and stops the queue.
+        '''
+        if not self._dispatcher:
+            return
+
+        # sentinel, all jobs queued before it get dispatched
+        self._queue.put(None)
+        self._dispatcher.join(timeout)
+        self._executor.shutdown(wait = True)
+        self._dispatcher = self._executor = None
+
+        logger.info('Transfers: {queued} queued, {transferred} transferred, '
+                    '{skipped} skipped, {failed} failed'.format(
+                                                            **self.progress))
+
+        for name in self._devices:
+            device = self.devices[name]
+            try:
+                if device.is_connected(alias = self.alias):
+                    device.disconnect(alias = self.alias)
+            except Exception as e:
+                logger.warning('failed to disconnect transfer connection from '
+                               'device {}: {}'.format(name, e))
+        self._devices.clear()
+
+    def _dispatch(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+
+            with self._lock:
+                self.progress['queued'] += len(job['transfers'])
+            self._executor.submit(self._run, job)
+
+    def _get_device_lock(self, name):
+        # transfers of a device share its dedicated connection
+        with self._lock:
+            return self._devices.setdefault(name, threading.Lock())
+
+    def _get_server_semaphore(self, url):
+        server = urlparse(url).hostname
+        with self._lock:
+            return self._servers.setdefault(server,
+                            threading.BoundedSemaphore(self.max_per_server))
+
+    def _connect(self, device):
+        if not device.is_connected(alias = self.alias):
+            connection = dict(self.connection(device.name))
+            connection['alias'] = self.alias
+            if self.via:
+                connection['via'] = self.via
+            device.connect(**connection)
+
+        return DeviceConnection(device, getattr(device, self.alias))
+
+    def _run(self, job):
+        name = job['device']
+        device = self.devices[name]
+        status = OK
+
+        # held while the dedicated connection is in use only, not in-between
+        # retries
+        lock = self._get_device_lock(name)
+        try:
+            with lock:
+                connection = self._connect(device)
+                futils = FileUtils.from_device(connection)
+        except Exception as e:
+            meta_info = 'Unable to connect to device {} to transfer ' \
+                        'files: {}'.format(name, e)
+            logger.error(meta_info)
+            status += ERRORED(meta_info)
+            with self._lock:
+                self.progress['failed'] += len(job['transfers'])
+        else:
+            for transfer in job['transfers']:
+                status += self._transfer(connection, futils, transfer,
+                                         job['timeout'], lock)
+
+            if job['callback'] and status == OK:
+                try:
+                    with lock:
+                        status += job['callback'](connection, *job['args'])
+                except Exception as e:
+                    logger.warning(e)
+                    status += ERRORED(str(e))
+
+        with self._lock:
+            self.statuses[name] = self.statuses.get(name, OK) + status
+
+    def _transfer(self, device, futils, transfer, timeout, lock):
+        source = transfer['source']
+        destination = transfer['destination']
+
+        if self._is_transferred(device, transfer, timeout):
+            return self._done('skipped', 'Already uploaded {} to {}'.format(
+                                                        source, destination))
+
+        semaphore = self._get_server_semaphore(destination)
+        for attempt in range(self.retries + 1):
+            if attempt:
+                # other transfers proceed in the meantime
+                time.sleep(self.backoff * 2 ** (attempt - 1))
+            try:
+                with semaphore, lock:
+                    futils.copyfile(source = source,
+                                    destination = destination,
+                                    device = device,
+                                    timeout_seconds = timeout)
+            except Exception as e:
+                logger.warning('Upload attempt {} of {} to {} failed: '
+                               '{}'.format(attempt + 1, source,
+                                           destination, e))
+            else:
+                return self._done('transferred', 'Uploaded {} to {}'\
+                                            .format(source, destination))
+
+        return self._done('failed', 'Unable to upload {} to {}'.format(
+                                                        source, destination))
+
+    def _is_transferred(self, device, transfer, timeout):
+        '''_is_transferred
+
+        checks whether the file is on the server already with the same size,
+        when the server file system can be queried.
+        '''
+        if transfer.get('size') is None:
+            return False
+
+        try:
+            with FileUtils(testbed = device.testbed) as futils:
+                stat = futils.stat(transfer.get('target',
+                                                transfer['destination']),
+                                   timeout_seconds = timeout)
+        except Exception:
+            return False
+
+        return str(stat.st_size) == str(transfer['size'])
+
+    def _done(self, outcome, meta_info):
+        with self._lock:
+            self.progress[outcome] += 1
+            done = sum(v for k, v in self.progress.items() if k != 'queued')
+            queued = self.progress['queued']
+
+        meta_info = '{} ({}/{})'.format(meta_info, done, queued)
+        if outcome == 'failed':
+            logger.error(meta_info)
+            return ERRORED(meta_info)
+
+        logger.info(meta_info)
+        return OK(meta_info)
@@ -1,4 +1,6 @@
+import os
 import yaml
+import weakref
 import traceback
 from pyats.datastructures import OrderableDict
 
@@ -11,12 +13,12 @@ ESCAPE_STD = (("&", "&amp;"),
               ("\"", "&quot;"),
               ("\n", "\u000A"))
 
+# single pass translation table of the escapes
+ESCAPE_TABLE = str.maketrans(dict(ESCAPE_STD))
+
 def escape(stdinput):
     # liveview stream character escape
-    for esc in ESCAPE_STD:
-        stdinput = stdinput.replace(*esc)
-
-    return stdinput
+    return stdinput.translate(ESCAPE_TABLE)
 
 
 def filter_exception(exc_type, exc_value, tb):
@@ -44,24 +46,88 @@ def filter_exception(exc_type, exc_value, tb):
     # return the formatted exception
     return ''.join(traceback.format_exception(exc_type, exc_value, tb)).strip()
 
+# libyaml based dumper when available
+SafeDumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+def _dict_representer(dumper, data):
+    return dumper.represent_mapping(
+                    yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
+                    data.items())
+
+# dumpers representing OrderableDict in order, by base dumper
+_ordered_dumpers = {}
+
+def get_ordered_dumper(Dumper=SafeDumper):
+    '''get_ordered_dumper
+
+    returns the dumper class based on Dumper representing OrderableDict in
+    order (created once).
+    '''
+    if Dumper not in _ordered_dumpers:
+        OrderedYamlDumper = type('OrderedYamlDumper', (Dumper, ), {})
+        OrderedYamlDumper.add_multi_representer(OrderableDict,
+                                                _dict_representer)
+        _ordered_dumpers[Dumper] = OrderedYamlDumper
+    return _ordered_dumpers[Dumper]
+
 def ordered_yaml_dump(data,
                       stream=None,
-                      Dumper=yaml.SafeDumper,
+                      Dumper=SafeDumper,
                       **kwds):
 
-    class OrderedYamlDumper(Dumper):
-        pass
+    return yaml.dump(data, stream, get_ordered_dumper(Dumper), **kwds)
+
+class LazyStr(object):
+    '''LazyStr
+
+    str of func(*args, **kwargs), computed when first converted: eg: by the
+    logging handlers emitting a record, so records filtered out by level cost
+    no formatting.
+    '''
 
-    def _dict_representer(dumper, data):
-        return dumper.represent_mapping(
-                        yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
-                        data.items())
+    __slots__ = ('func', 'args', 'kwargs', '_value')
 
-    OrderedYamlDumper.add_representer(OrderableDict, _dict_representer)
+    def __init__(self, func, *args, **kwargs):
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self._value = None
 
-    return yaml.dump(data, stream, OrderedYamlDumper, **kwds)
+    def __str__(self):
+        if self._value is None:
+            self._value = str(self.func(*self.args, **self.kwargs))
+        return self._value
 
 def get_plugin_name(plugin):
     return getattr(plugin, 'name', getattr(plugin, '__plugin_name__',
                                    getattr(plugin, '__module__',
-                                   type(plugin).__name__)))
\ No newline at end of file
+                                   type(plugin).__name__)))
+
+def str_to_bool(value):
+    '''str_to_bool
+
+    argparse type converting boolean-like command-line/yaml values.
+    '''
+    if isinstance(value, bool):
+        return value
+    return str(value).strip().lower() in ('true', 'yes', 'y', 'on', '1')
+
+def at_fork_reinit(method):
+    '''at_fork_reinit
+
+    calls the (bound) method in the children forked by this process (eg: the
+    plugin workers) for as long as its object is alive, to re-create the
+    locks that threads of this process may hold at the time of the fork.
+    Nothing on platforms without os.register_at_fork (python < 3.7).
+    '''
+    if not hasattr(os, 'register_at_fork'):
+        return
+
+    method = weakref.WeakMethod(method)
+
+    def reinit():
+        bound = method()
+        if bound is not None:
+            bound()
+
+    os.register_at_fork(after_in_child = reinit)